@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+=============================================================================
+Benchmarks for migration_validator_stdlib.py — no Oracle required
+=============================================================================
+Times the validator's own hot paths on synthetic data from fake_sqlplus.py:
+
+  parse     parse_sqlplus_output() on COLSEP and MARKUP CSV text
+  compare   ResultSide feed + compare_results() with key-aware diffs
+  html      generate_html_report() over a set of mismatching checks
+  diffcsv   export_diff_csv() in long and wide layout
+  e2e       a full --level 1 run with SQLPLUS_BIN pointing at the fake
+
+Usage:
+  python bench/bench_migration_validator.py                     # all scenarios
+  python bench/bench_migration_validator.py --rows 500000 --diff 0.05 parse compare
+  python bench/bench_migration_validator.py --json bench_output.json
+
+Each scenario reports the best of --repeat runs. Compare figures across
+commits on the same machine; absolute numbers mean little.
+=============================================================================
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from io import StringIO
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.dirname(HERE))
+
+import fake_sqlplus                          # noqa: E402
+import migration_validator_stdlib as mv      # noqa: E402
+
+SCENARIOS = ("parse", "compare", "html", "diffcsv", "e2e")
+
+
+def best_of(repeat: int, fn) -> float:
+    """Fastest of `repeat` calls to fn(), in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def side_rows(args, target: bool) -> list:
+    return list(fake_sqlplus.synthetic_rows(1, args.rows, args.cols, args.diff, target))
+
+
+def sample_results(args, checks: int = 20) -> dict:
+    """all_results as _run_validation builds them: `checks` mismatching checks."""
+    src, tgt = side_rows(args, False), side_rows(args, True)
+    results  = {}
+    for i in range(checks):
+        cmp = mv.compare_results(mv.ResultSide.from_rows(src), mv.ResultSide.from_rows(tgt),
+                                 keys=["KEY_COL"])
+        results[f"BENCH_{i:02d}"] = {"level": 2, "desc": "synthetic", "schema": mv.SCHEMA_NAME,
+                                     "check": f"BENCH_{i:02d}", "cmp": cmp, "error": False,
+                                     "err_msg": "", "cached": False}
+    return results
+
+
+def bench_parse(args) -> list:
+    out = []
+    for fmt in ("colsep", "csv"):
+        raw = "".join(fake_sqlplus.render(side_rows(args, False), fmt, mv.COL_SEP))
+        secs = best_of(args.repeat, lambda: mv.parse_sqlplus_output(raw, fmt=fmt))
+        out.append({"scenario": f"parse[{fmt}]", "rows": args.rows, "seconds": secs,
+                    "bytes": len(raw)})
+    return out
+
+
+def bench_compare(args) -> list:
+    src, tgt = side_rows(args, False), side_rows(args, True)
+    out = []
+    for label, keys in (("keyed", ["KEY_COL"]), ("set", None)):
+        secs = best_of(args.repeat, lambda: mv.compare_results(
+            mv.ResultSide.from_rows(src), mv.ResultSide.from_rows(tgt), keys=keys))
+        out.append({"scenario": f"compare[{label}]", "rows": 2 * args.rows, "seconds": secs})
+    return out
+
+
+def bench_html(args) -> list:
+    results = sample_results(args)
+    html    = []
+    secs    = best_of(args.repeat, lambda: html.append(mv.generate_html_report(results)))
+    return [{"scenario": "html", "rows": len(results), "seconds": secs,
+             "bytes": len(html[-1].encode("utf-8"))}]
+
+
+def bench_diffcsv(args) -> list:
+    results = sample_results(args, checks=5)
+    out     = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt in ("long", "wide"):
+            path = os.path.join(tmp, f"diff_{fmt}.csv")
+            secs = best_of(args.repeat, lambda: _quiet(mv.export_diff_csv, results, path, fmt))
+            out.append({"scenario": f"diffcsv[{fmt}]", "rows": len(results), "seconds": secs,
+                        "bytes": os.path.getsize(path)})
+    return out
+
+
+def bench_e2e(args) -> list:
+    env = dict(os.environ, SQLPLUS_BIN=os.path.join(HERE, "fake_sqlplus.py"),
+               FAKE_ROWS=str(min(args.rows, 5000)), FAKE_COLS=str(args.cols),
+               FAKE_DIFF=str(args.diff))
+    script = os.path.join(os.path.dirname(HERE), "migration_validator_stdlib.py")
+    with tempfile.TemporaryDirectory() as tmp:
+        secs = best_of(args.repeat, lambda: subprocess.run(
+            [sys.executable, script, "--level", "1", "--no-cache", "--no-snapshot"],
+            cwd=tmp, env=env, stdout=subprocess.DEVNULL, check=True))
+    return [{"scenario": "e2e[level1]", "rows": len([q for q in mv.QUERIES.values()
+                                                     if q["level"] == 1]), "seconds": secs}]
+
+
+def _quiet(fn, *args):
+    stdout, sys.stdout = sys.stdout, StringIO()
+    try:
+        return fn(*args)
+    finally:
+        sys.stdout = stdout
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the migration validator pipeline")
+    parser.add_argument("scenarios", nargs="*", metavar="SCENARIO",
+                        help=f"Scenarios to run (default: all of {', '.join(SCENARIOS)})")
+    parser.add_argument("--rows", type=int, default=100000, help="Rows per side (default 100000)")
+    parser.add_argument("--cols", type=int, default=8, help="Columns per row (default 8)")
+    parser.add_argument("--diff", type=float, default=0.01,
+                        help="Fraction of target rows that differ (default 0.01)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per scenario, best kept")
+    parser.add_argument("--json", metavar="PATH", help="Also write the results as JSON")
+    args = parser.parse_args()
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(sorted(unknown))}")
+
+    results = []
+    print(f"  rows={args.rows} cols={args.cols} diff={args.diff} repeat={args.repeat}\n")
+    print(f"  {'scenario':<18}{'seconds':>10}{'items/s':>14}{'MB':>10}")
+    for name in args.scenarios or SCENARIOS:
+        for r in globals()[f"bench_{name}"](args):
+            results.append(r)
+            rate = r["rows"] / r["seconds"] if r["seconds"] else 0
+            mb   = f"{r['bytes'] / 1e6:.1f}" if "bytes" in r else ""
+            print(f"  {r['scenario']:<18}{r['seconds']:>10.3f}{rate:>14,.0f}{mb:>10}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+=============================================================================
+Fake sqlplus — stand-in for benchmarking migration_validator_stdlib.py
+=============================================================================
+Speaks just enough of `sqlplus -S [-L] user/pass@host:port/service` for the
+validator: reads the script from stdin, honours SET COLSEP / SET MARKUP CSV /
+PROMPT / EXIT, answers `-V`, and prints synthetic rows for every statement.
+
+Point the validator at it:
+  SQLPLUS_BIN=bench/fake_sqlplus.py python migration_validator_stdlib.py
+
+Knobs (environment):
+  FAKE_ROWS     rows per statement                       (default 1000)
+  FAKE_COLS     columns per row, key column included     (default 8)
+  FAKE_DIFF     fraction of target rows that differ      (default 0.01)
+  FAKE_DELAY    seconds of "server time" per statement   (default 0)
+  FAKE_VERSION  version reported by -V                   (default 19.0)
+  FAKE_TARGET   substring of the connect string that marks the target
+                database (default "rds", matching DB_CONFIG)
+
+Output is deterministic per statement text, so source and target agree on
+every row except the FAKE_DIFF share: half of those have a changed last
+column, a quarter are missing on the target and a quarter are extra.
+=============================================================================
+"""
+
+import os
+import sys
+import time
+import zlib
+
+ROWS    = int(os.environ.get("FAKE_ROWS", "1000"))
+COLS    = max(1, int(os.environ.get("FAKE_COLS", "8")))
+DIFF    = float(os.environ.get("FAKE_DIFF", "0.01"))
+DELAY   = float(os.environ.get("FAKE_DELAY", "0"))
+VERSION = os.environ.get("FAKE_VERSION", "19.0")
+TARGET  = os.environ.get("FAKE_TARGET", "rds")
+
+CELL_WIDTH = 24          # COLSEP mode pads every cell like a VARCHAR2 column
+
+
+def synthetic_rows(seed: int, rows: int = ROWS, cols: int = COLS,
+                   diff: float = DIFF, target: bool = False):
+    """
+    Header plus `rows` data rows for one statement. With target=True the
+    FAKE_DIFF share of rows is changed, dropped or added as described above.
+    """
+    yield ["KEY_COL"] + [f"COL_{c}" for c in range(1, cols)]
+    every = int(1 / diff) if diff > 0 else 0
+    for r in range(rows):
+        row = [f"K{seed % 1000:03d}_{r:08d}"] + [f"v{(r * 31 + c * 7) % 9973}_{c}"
+                                                 for c in range(1, cols)]
+        kind = (r // every) % 4 if every and r % every == 0 else None
+        if target and kind in (0, 1):
+            row[-1] = "CHANGED_" + row[-1]
+        elif target and kind == 2:
+            continue
+        yield row
+        if target and kind == 3:
+            yield [row[0] + "_X"] + row[1:]
+
+
+def render(rows, fmt: str = "colsep", col_sep: str = "~|~"):
+    """Lines as sqlplus prints them in COLSEP or MARKUP CSV mode."""
+    rows = iter(rows)
+    header = next(rows)
+    if fmt == "csv":
+        yield ",".join(f'"{h}"' for h in header) + "\n"
+        for row in rows:
+            yield ",".join(f'"{v}"' for v in row) + "\n"
+        return
+    yield col_sep.join(h.ljust(CELL_WIDTH) for h in header) + "\n"
+    yield col_sep.join("-" * CELL_WIDTH for _ in header) + "\n"
+    for row in rows:
+        yield col_sep.join(v.ljust(CELL_WIDTH) for v in row) + "\n"
+
+
+def main(argv: list):
+    if "-V" in argv:
+        print(f"\nSQL*Plus: Release {VERSION}.0.0.0 - Production\nVersion {VERSION}.0.0.0\n")
+        return 0
+    target  = TARGET in (argv[-1] if argv else "")
+    fmt     = "colsep"
+    col_sep = "~|~"
+    out     = sys.stdout
+    stmt    = []
+    for line in sys.stdin:
+        text  = line.strip()
+        upper = text.upper()
+        if not stmt:
+            if not text:
+                continue
+            if upper.startswith("SET MARKUP CSV ON"):
+                fmt = "csv"
+                continue
+            if upper.startswith("SET COLSEP"):
+                col_sep = text.split("'")[1] if "'" in text else col_sep
+                continue
+            if upper.startswith(("SET ", "WHENEVER", "ALTER ")):
+                continue
+            if upper.startswith("PROMPT"):
+                out.write(text[6:].strip() + "\n")
+                out.flush()
+                continue
+            if upper.rstrip(";") in ("EXIT", "QUIT"):
+                return 0
+        stmt.append(line)
+        if text.endswith(";"):
+            if DELAY:
+                time.sleep(DELAY)
+            seed = zlib.crc32("".join(stmt).encode("utf-8"))
+            out.writelines(render(synthetic_rows(seed, target=target), fmt, col_sep))
+            out.write("\n")
+            out.flush()
+            stmt = []
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -11,15 +11,33 @@ Requirements:
   - sqlplus      (already installed with Oracle Client)
 
 Usage:
-  python migration_validator.py                  # Run all checks
+  python migration_validator.py                  # Run Level 1 + 2 checks
   python migration_validator.py --level 1        # Level 1 only
   python migration_validator.py --level 2        # Level 2 only
+  python migration_validator.py --level 3        # Level 3 table-content checksums only
+  python migration_validator.py --schema APP1,APP2 --schema-like 'HR%'   # Several schemas
+  python migration_validator.py --jobs 8         # Up to 8 concurrent sqlplus calls
+  python migration_validator.py --session-pool   # Reuse long-lived sqlplus sessions
+  python migration_validator.py --batch          # Level 1 checks in one sqlplus call per side
+  python migration_validator.py --output-format colsep   # Force COLSEP text output (default: auto)
+  python migration_validator.py --diff-format wide --gzip-diff   # One diff row per record, .csv.gz
+  python migration_validator.py --no-snapshot    # Do not keep the raw per-check rows
+  python migration_validator.py --replay validation_reports/snapshot_<ts>   # Re-report offline
+  python migration_validator.py --refresh-cache  # Ignore cached results from earlier runs
+  python migration_validator.py --timeout 600    # Fixed per-call timeout (default: learned)
+  python migration_validator.py --watch 60       # Revalidate every minute during a load
   python migration_validator.py --help
+  SQLPLUS_BIN=bench/fake_sqlplus.py python migration_validator.py   # Dry run without Oracle
+  python bench/bench_migration_validator.py      # Time parse / compare / report paths
 
 Output:
   ./validation_reports/migration_report_<timestamp>.html
+  ./validation_reports/migration_report_<timestamp>_files/   (full diffs for the HTML pager)
   ./validation_reports/migration_report_<timestamp>.csv
-  ./validation_reports/migration_report_<timestamp>_diff.csv
+  ./validation_reports/migration_report_<timestamp>_diff.csv[.gz]
+  ./validation_reports/snapshot_<timestamp>/      (raw rows per check and side + manifest.json)
+  ./validation_reports/migration_metrics_<timestamp>.json   (per-check timings, bytes, rows)
+  ./validation_reports/watch_<timestamp>.jsonl / .html      (--watch: per-cycle deltas, live page)
 =============================================================================
 """
 
@@ -27,8 +45,23 @@ import subprocess
 import os
 import sys
 import csv
+import json
+import shutil
+import hashlib
+import sqlite3
+import zlib
+import gzip
+import struct
 import argparse
 import re
+import tempfile
+import queue
+import time
+import uuid
+import threading
+from array import array
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import deque
 from datetime import datetime
 from html import escape
 from io import StringIO
@@ -55,15 +88,118 @@ DB_CONFIG = {
     }
 }
 
-SCHEMA_NAME  = "DVM"
-SQLPLUS_BIN  = "sqlplus"          # Full path if not on PATH e.g. /u01/app/oracle/product/19c/bin/sqlplus
+SCHEMA_NAME  = "DVM"              # Default schema; override with --schema / --schema-like
+SQLPLUS_BIN  = os.environ.get("SQLPLUS_BIN", "sqlplus")   # Full path if not on PATH e.g. /u01/app/oracle/product/19c/bin/sqlplus
 REPORT_DIR   = "./validation_reports"
 RUN_TS       = datetime.now().strftime("%Y%m%d_%H%M%S")
 COL_SEP      = "~|~"              # Unlikely to appear in data
+OUTPUT_FORMAT = "auto"            # auto | csv (SET MARKUP CSV, sqlplus 12.2+) | colsep
+CSV_MARKUP_MIN_VERSION = (12, 2)
+SQLPLUS_TIMEOUT = 300             # Seconds per sqlplus call for checks with no history (--timeout)
+
+# Concurrency: total sqlplus calls in flight (--jobs) and optional per-database
+# caps (--source-jobs / --target-jobs). None = same as --jobs.
+DEFAULT_JOBS = 4
+DB_MAX_JOBS  = {"source": None, "target": None}
+
+# Session pool (--session-pool): errors that mean the connection is gone and
+# the session must be restarted, and idle seconds before a health-check ping.
+SESSION_RECONNECT_ERRORS = ("ORA-03113", "ORA-03114", "ORA-03135",
+                            "ORA-12537", "ORA-12547", "ORA-02396", "SP2-0640")
+SESSION_PING_AFTER       = 60
+
+# Adaptive timeouts: every check's duration per database is kept for the
+# last CHECK_HISTORY_RUNS runs (in CACHE_FILE). A check's sqlplus calls time
+# out after TIMEOUT_FACTOR x its slowest recorded duration, within
+# [TIMEOUT_MIN, TIMEOUT_MAX]; checks with no history get SQLPLUS_TIMEOUT.
+# The historically slowest checks are started first.
+CHECK_HISTORY_RUNS = 10
+TIMEOUT_FACTOR     = 4
+TIMEOUT_MIN        = 30
+TIMEOUT_MAX        = 3600
+
+# Retries: a call failing with one of these (in its error or first output
+# line) is retried up to RETRY_ATTEMPTS times after RETRY_BACKOFF, then 2x,
+# 4x... seconds. A timed-out call is retried with twice the timeout.
+RETRY_ATTEMPTS = 2
+RETRY_BACKOFF  = 5
+RETRY_ERRORS   = SESSION_RECONNECT_ERRORS + ("ORA-00060", "ORA-01555", "ORA-04021",
+                                             "ORA-12170", "ORA-12541", "ORA-12571",
+                                             "timed out")
+
+# Batch mode (--batch): plain Level 1 checks share one sqlplus script per
+# side; each result set is preceded by a PROMPT line starting with this.
+BATCH_MARKER = "@@MV_CHECK"
+
+# Comparison engine: distinct rows per side held in memory before hash
+# partitions are spilled to temp files, and rows per side kept for the report.
+COMPARE_MEM_ROWS   = 200000
+COMPARE_PARTITIONS = 64
+REPORT_MAX_ROWS    = 200
+
+# HTML diff viewer: full diffs go to <report>_files/ as script chunks of this
+# many rows (a multiple of REPORT_MAX_ROWS), paged and filtered in the page.
+REPORT_CHUNK_ROWS  = 5000
+
+# Diff CSV: "long" = one line per (row, column) value, "wide" = one line per
+# differing record under a per-check header line. DIFF_GZIP writes .csv.gz.
+DIFF_FORMAT = "long"
+DIFF_GZIP   = False
+
+# Snapshots (REPORT_DIR/snapshot_<timestamp>/): every check's raw source and
+# target rows in a compact binary file, for diffing runs offline. Strings
+# past SNAPSHOT_DICT_MAX distinct values per file are stored inline again.
+SNAPSHOT          = True
+SNAPSHOT_DICT_MAX = 1 << 20
+
+# Watch mode (--watch SECONDS): target load rates and catch-up rates (how
+# fast a table's missing rows shrink, in rows per minute) are taken over the
+# last WATCH_RATE_WINDOW cycles.
+WATCH_RATE_WINDOW = 5
+
+# Row-count engine (L2_01): tables per UNION ALL batch, and segment size in
+# blocks above which a table is counted on its own with a PARALLEL hint.
+ROWCOUNT_BATCH_SIZE      = 50
+ROWCOUNT_PARALLEL_BLOCKS = 131072     # ~1 GB at 8 KB blocks
+ROWCOUNT_PARALLEL_DEGREE = 4
+
+# Checksum engine (L3): hash buckets per drill-down level, bucket size at
+# which differing rows are fetched individually, drill-down depth, and the
+# most mismatched buckets drilled into per table before reporting buckets.
+CHECKSUM_BUCKETS    = 64
+CHECKSUM_LEAF_ROWS  = 200
+CHECKSUM_MAX_LEVELS = 6
+CHECKSUM_MAX_DRILL  = 32
+
+# Result cache (under REPORT_DIR): checks whose schema has had no DDL since
+# the last run reuse that run's rows. Results larger than CACHE_MAX_ROWS
+# are never cached.
+CACHE_FILE     = "validation_cache.sqlite"
+CACHE_MAX_ROWS = 50000
+CACHE_PROBE_SQL = """
+SELECT TO_CHAR(MAX(last_ddl_time),'YYYYMMDDHH24MISS') AS last_ddl,
+       COUNT(*) AS objects,
+       SUM(CASE WHEN status='VALID' THEN 1 ELSE 0 END) AS valid_objects
+FROM   dba_objects
+WHERE  owner = '{schema}';"""
 
 # =============================================================================
 # ALL VALIDATION QUERIES
 # =============================================================================
+# "sql" and "desc" are templates: {schema} is filled in per validated schema
+# (see build_check_plan). "scope": "database" marks checks that do not depend
+# on the schema; they run once per invocation.
+# Optional "engine": name in CHECK_ENGINES (one database at a time) or
+# PAIRED_ENGINES (both databases together) that runs the check instead of
+# sending "sql" as-is (e.g. "row_counts" treats "sql" as the table list).
+# Optional "cache": False for checks whose result can change without any DDL
+# in the schema (row counts, statistics, database-wide objects); all other
+# checks may be answered from the local result cache (see ResultCache).
+# Optional "watch": True for cheap checks that --watch reruns every cycle
+# (the others only rerun when their schema's CACHE_PROBE_SQL result changes).
+# Optional "keys": columns that identify a row. When both sides return them,
+# rows present on both sides with the same key are reported as changed cells
+# instead of one SOURCE_ONLY row plus one TARGET_ONLY row.
 QUERIES = {
     # -------------------------------------------------------------------------
     # LEVEL 1 — Object & Role Presence Checks
@@ -71,13 +207,15 @@ QUERIES = {
     "L1_01_Object_Summary": {
         "level": 1,
         "desc":  "Object count by type — valid vs invalid",
-        "sql": f"""
+        "watch": True,
+        "keys":  ["object_type"],
+        "sql": """
 SELECT object_type,
        COUNT(*) AS total_objects,
        SUM(CASE WHEN status='VALID'   THEN 1 ELSE 0 END) AS valid_count,
        SUM(CASE WHEN status='INVALID' THEN 1 ELSE 0 END) AS invalid_count
 FROM   dba_objects
-WHERE  owner = '{SCHEMA_NAME}'
+WHERE  owner = '{schema}'
 GROUP  BY object_type
 ORDER  BY object_type;"""
     },
@@ -85,11 +223,13 @@ ORDER  BY object_type;"""
     "L1_02_Invalid_Objects": {
         "level": 1,
         "desc":  "INVALID objects — must be ZERO rows on target",
-        "sql": f"""
+        "watch": True,
+        "keys":  ["object_type", "object_name"],
+        "sql": """
 SELECT object_name, object_type, status,
        TO_CHAR(last_ddl_time,'YYYY-MM-DD HH24:MI:SS') AS last_ddl_time
 FROM   dba_objects
-WHERE  owner  = '{SCHEMA_NAME}'
+WHERE  owner  = '{schema}'
   AND  status = 'INVALID'
 ORDER  BY object_type, object_name;"""
     },
@@ -97,33 +237,37 @@ ORDER  BY object_type, object_name;"""
     "L1_03_Tables": {
         "level": 1,
         "desc":  "All tables with status and partitioning",
-        "sql": f"""
+        "cache": False,
+        "keys":  ["table_name"],
+        "sql": """
 SELECT table_name, num_rows, status, partitioned, iot_type, compression
 FROM   dba_tables
-WHERE  owner = '{SCHEMA_NAME}'
+WHERE  owner = '{schema}'
 ORDER  BY table_name;"""
     },
 
     "L1_04_Indexes": {
         "level": 1,
         "desc":  "All indexes with type and status",
-        "sql": f"""
+        "keys":  ["table_name", "index_name"],
+        "sql": """
 SELECT index_name, table_name, index_type, uniqueness, status, partitioned
 FROM   dba_indexes
-WHERE  table_owner = '{SCHEMA_NAME}'
+WHERE  table_owner = '{schema}'
 ORDER  BY table_name, index_name;"""
     },
 
     "L1_05_Constraints_Summary": {
         "level": 1,
         "desc":  "Constraint count per table by type",
-        "sql": f"""
+        "keys":  ["table_name", "constraint_type"],
+        "sql": """
 SELECT table_name, constraint_type,
        COUNT(*) AS constraint_count,
        SUM(CASE WHEN status='ENABLED'  THEN 1 ELSE 0 END) AS enabled_count,
        SUM(CASE WHEN status='DISABLED' THEN 1 ELSE 0 END) AS disabled_count
 FROM   dba_constraints
-WHERE  owner = '{SCHEMA_NAME}'
+WHERE  owner = '{schema}'
   AND  constraint_type IN ('P','U','R','C')
 GROUP  BY table_name, constraint_type
 ORDER  BY table_name, constraint_type;"""
@@ -132,11 +276,12 @@ ORDER  BY table_name, constraint_type;"""
     "L1_06_Stored_Code": {
         "level": 1,
         "desc":  "Procedures, Functions, Packages, Triggers",
-        "sql": f"""
+        "keys":  ["object_type", "object_name"],
+        "sql": """
 SELECT object_name, object_type, status,
        TO_CHAR(last_ddl_time,'YYYY-MM-DD') AS last_compiled
 FROM   dba_objects
-WHERE  owner = '{SCHEMA_NAME}'
+WHERE  owner = '{schema}'
   AND  object_type IN (
          'PROCEDURE','FUNCTION','PACKAGE','PACKAGE BODY',
          'TRIGGER','TYPE','TYPE BODY'
@@ -147,49 +292,58 @@ ORDER  BY object_type, object_name;"""
     "L1_07_Views": {
         "level": 1,
         "desc":  "All views with text length",
-        "sql": f"""
+        "keys":  ["view_name"],
+        "sql": """
 SELECT view_name, text_length, read_only
 FROM   dba_views
-WHERE  owner = '{SCHEMA_NAME}'
+WHERE  owner = '{schema}'
 ORDER  BY view_name;"""
     },
 
     "L1_08_Sequences": {
         "level": 1,
         "desc":  "Sequence definitions",
-        "sql": f"""
+        "cache": False,
+        "keys":  ["sequence_name"],
+        "sql": """
 SELECT sequence_name, min_value, max_value,
        increment_by, cycle_flag, cache_size, last_number
 FROM   dba_sequences
-WHERE  sequence_owner = '{SCHEMA_NAME}'
+WHERE  sequence_owner = '{schema}'
 ORDER  BY sequence_name;"""
     },
 
     "L1_09_Synonyms": {
         "level": 1,
         "desc":  "Private and public synonyms",
-        "sql": f"""
+        "cache": False,
+        "keys":  ["synonym_type", "synonym_name"],
+        "sql": """
 SELECT 'PRIVATE' AS synonym_type, synonym_name, table_owner, table_name, db_link
-FROM   dba_synonyms WHERE owner = '{SCHEMA_NAME}'
+FROM   dba_synonyms WHERE owner = '{schema}'
 UNION ALL
 SELECT 'PUBLIC', synonym_name, table_owner, table_name, db_link
-FROM   dba_synonyms WHERE owner='PUBLIC' AND table_owner='{SCHEMA_NAME}'
+FROM   dba_synonyms WHERE owner='PUBLIC' AND table_owner='{schema}'
 ORDER  BY 1, 2;"""
     },
 
     "L1_10_DB_Links": {
         "level": 1,
-        "desc":  "Database links from DVM schema",
-        "sql": f"""
+        "desc":  "Database links from {schema} schema",
+        "keys":  ["db_link"],
+        "sql": """
 SELECT db_link, username, host,
        TO_CHAR(created,'YYYY-MM-DD') AS created_date
 FROM   dba_db_links
-WHERE  owner = '{SCHEMA_NAME}';"""
+WHERE  owner = '{schema}';"""
     },
 
     "L1_11_Users": {
         "level": 1,
         "desc":  "Database user accounts with status",
+        "cache": False,
+        "scope": "database",
+        "keys":  ["username"],
         "sql": """
 SELECT username, account_status, default_tablespace,
        temporary_tablespace, profile,
@@ -206,6 +360,9 @@ ORDER  BY username;"""
     "L1_12_Roles": {
         "level": 1,
         "desc":  "Custom roles defined in DB",
+        "cache": False,
+        "scope": "database",
+        "keys":  ["role"],
         "sql": """
 SELECT role, password_required, authentication_type
 FROM   dba_roles
@@ -223,89 +380,102 @@ ORDER  BY role;"""
 
     "L1_13_Role_Grants": {
         "level": 1,
-        "desc":  "Roles granted to DVM user",
-        "sql": f"""
+        "desc":  "Roles granted to {schema} user",
+        "cache": False,
+        "keys":  ["granted_role"],
+        "sql": """
 SELECT grantee, granted_role, admin_option, default_role
 FROM   dba_role_privs
-WHERE  grantee = '{SCHEMA_NAME}'
+WHERE  grantee = '{schema}'
 ORDER  BY granted_role;"""
     },
 
     "L1_14_Sys_Privileges": {
         "level": 1,
-        "desc":  "System privileges granted to DVM",
-        "sql": f"""
+        "desc":  "System privileges granted to {schema}",
+        "cache": False,
+        "keys":  ["privilege"],
+        "sql": """
 SELECT grantee, privilege, admin_option
 FROM   dba_sys_privs
-WHERE  grantee = '{SCHEMA_NAME}'
+WHERE  grantee = '{schema}'
 ORDER  BY privilege;"""
     },
 
     "L1_15_Object_Privileges": {
         "level": 1,
-        "desc":  "Object-level grants on DVM objects",
-        "sql": f"""
+        "desc":  "Object-level grants on {schema} objects",
+        "keys":  ["table_name", "grantee", "privilege"],
+        "sql": """
 SELECT grantee, owner, table_name, privilege, grantable
 FROM   dba_tab_privs
-WHERE  owner = '{SCHEMA_NAME}'
+WHERE  owner = '{schema}'
 ORDER  BY table_name, grantee, privilege;"""
     },
 
     "L1_16_Tablespace_Quotas": {
         "level": 1,
-        "desc":  "Tablespace quotas for DVM user",
-        "sql": f"""
+        "desc":  "Tablespace quotas for {schema} user",
+        "cache": False,
+        "keys":  ["tablespace_name"],
+        "sql": """
 SELECT username, tablespace_name,
        ROUND(bytes/1024/1024,2) AS used_mb,
        CASE WHEN max_bytes=-1 THEN 'UNLIMITED'
             ELSE TO_CHAR(ROUND(max_bytes/1024/1024,2)) END AS max_mb
 FROM   dba_ts_quotas
-WHERE  username = '{SCHEMA_NAME}';"""
+WHERE  username = '{schema}';"""
     },
 
     "L1_17_Mat_Views": {
         "level": 1,
         "desc":  "Materialized views",
-        "sql": f"""
+        "cache": False,
+        "keys":  ["mview_name"],
+        "sql": """
 SELECT mview_name, refresh_mode, refresh_method,
        build_mode, staleness, compile_state
 FROM   dba_mviews
-WHERE  owner = '{SCHEMA_NAME}'
+WHERE  owner = '{schema}'
 ORDER  BY mview_name;"""
     },
 
     "L1_18_Scheduler_Jobs": {
         "level": 1,
         "desc":  "Scheduler jobs",
-        "sql": f"""
+        "cache": False,
+        "keys":  ["job_name"],
+        "sql": """
 SELECT job_name, job_type, state, enabled,
        TO_CHAR(last_start_date,'YYYY-MM-DD HH24:MI:SS') AS last_run,
        TO_CHAR(next_run_date,  'YYYY-MM-DD HH24:MI:SS') AS next_run
 FROM   dba_scheduler_jobs
-WHERE  owner = '{SCHEMA_NAME}'
+WHERE  owner = '{schema}'
 ORDER  BY job_name;"""
     },
 
     "L1_19_Grand_Scorecard": {
         "level": 1,
         "desc":  "Grand object count scorecard",
-        "sql": f"""
-SELECT 'TABLES'              AS category, COUNT(*) AS cnt FROM dba_tables    WHERE owner='{SCHEMA_NAME}'
-UNION ALL SELECT 'VIEWS',                 COUNT(*) FROM dba_views      WHERE owner='{SCHEMA_NAME}'
-UNION ALL SELECT 'INDEXES',              COUNT(*) FROM dba_indexes     WHERE table_owner='{SCHEMA_NAME}'
-UNION ALL SELECT 'PROCEDURES',           COUNT(*) FROM dba_objects     WHERE owner='{SCHEMA_NAME}' AND object_type='PROCEDURE'
-UNION ALL SELECT 'FUNCTIONS',            COUNT(*) FROM dba_objects     WHERE owner='{SCHEMA_NAME}' AND object_type='FUNCTION'
-UNION ALL SELECT 'PACKAGES',             COUNT(*) FROM dba_objects     WHERE owner='{SCHEMA_NAME}' AND object_type='PACKAGE'
-UNION ALL SELECT 'PACKAGE BODIES',       COUNT(*) FROM dba_objects     WHERE owner='{SCHEMA_NAME}' AND object_type='PACKAGE BODY'
-UNION ALL SELECT 'TRIGGERS',             COUNT(*) FROM dba_triggers    WHERE owner='{SCHEMA_NAME}'
-UNION ALL SELECT 'SEQUENCES',            COUNT(*) FROM dba_sequences   WHERE sequence_owner='{SCHEMA_NAME}'
-UNION ALL SELECT 'SYNONYMS',             COUNT(*) FROM dba_synonyms    WHERE owner='{SCHEMA_NAME}'
-UNION ALL SELECT 'TYPES',                COUNT(*) FROM dba_objects     WHERE owner='{SCHEMA_NAME}' AND object_type='TYPE'
-UNION ALL SELECT 'MAT VIEWS',            COUNT(*) FROM dba_mviews      WHERE owner='{SCHEMA_NAME}'
-UNION ALL SELECT 'INVALID OBJECTS',      COUNT(*) FROM dba_objects     WHERE owner='{SCHEMA_NAME}' AND status='INVALID'
-UNION ALL SELECT 'DISABLED CONSTRAINTS', COUNT(*) FROM dba_constraints WHERE owner='{SCHEMA_NAME}' AND status='DISABLED'
-UNION ALL SELECT 'UNUSABLE INDEXES',     COUNT(*) FROM dba_indexes     WHERE table_owner='{SCHEMA_NAME}' AND status='UNUSABLE'
-UNION ALL SELECT 'COMPILE ERRORS',       COUNT(*) FROM dba_errors      WHERE owner='{SCHEMA_NAME}'
+        "cache": False,
+        "keys":  ["category"],
+        "sql": """
+SELECT 'TABLES'              AS category, COUNT(*) AS cnt FROM dba_tables    WHERE owner='{schema}'
+UNION ALL SELECT 'VIEWS',                 COUNT(*) FROM dba_views      WHERE owner='{schema}'
+UNION ALL SELECT 'INDEXES',              COUNT(*) FROM dba_indexes     WHERE table_owner='{schema}'
+UNION ALL SELECT 'PROCEDURES',           COUNT(*) FROM dba_objects     WHERE owner='{schema}' AND object_type='PROCEDURE'
+UNION ALL SELECT 'FUNCTIONS',            COUNT(*) FROM dba_objects     WHERE owner='{schema}' AND object_type='FUNCTION'
+UNION ALL SELECT 'PACKAGES',             COUNT(*) FROM dba_objects     WHERE owner='{schema}' AND object_type='PACKAGE'
+UNION ALL SELECT 'PACKAGE BODIES',       COUNT(*) FROM dba_objects     WHERE owner='{schema}' AND object_type='PACKAGE BODY'
+UNION ALL SELECT 'TRIGGERS',             COUNT(*) FROM dba_triggers    WHERE owner='{schema}'
+UNION ALL SELECT 'SEQUENCES',            COUNT(*) FROM dba_sequences   WHERE sequence_owner='{schema}'
+UNION ALL SELECT 'SYNONYMS',             COUNT(*) FROM dba_synonyms    WHERE owner='{schema}'
+UNION ALL SELECT 'TYPES',                COUNT(*) FROM dba_objects     WHERE owner='{schema}' AND object_type='TYPE'
+UNION ALL SELECT 'MAT VIEWS',            COUNT(*) FROM dba_mviews      WHERE owner='{schema}'
+UNION ALL SELECT 'INVALID OBJECTS',      COUNT(*) FROM dba_objects     WHERE owner='{schema}' AND status='INVALID'
+UNION ALL SELECT 'DISABLED CONSTRAINTS', COUNT(*) FROM dba_constraints WHERE owner='{schema}' AND status='DISABLED'
+UNION ALL SELECT 'UNUSABLE INDEXES',     COUNT(*) FROM dba_indexes     WHERE table_owner='{schema}' AND status='UNUSABLE'
+UNION ALL SELECT 'COMPILE ERRORS',       COUNT(*) FROM dba_errors      WHERE owner='{schema}'
 ORDER  BY 1;"""
     },
 
@@ -313,45 +483,49 @@ ORDER  BY 1;"""
     # LEVEL 2 — Comprehensive Data Integrity & Count Checks
     # -------------------------------------------------------------------------
     "L2_01_Row_Counts": {
-        "level": 2,
-        "desc":  "Exact row count per table using dynamic SQL",
-        "sql": f"""
-SELECT t.table_name,
-       TO_NUMBER(
-           EXTRACTVALUE(
-               XMLTYPE(DBMS_XMLGEN.GETXML(
-                   'SELECT COUNT(*) c FROM {SCHEMA_NAME}.' || t.table_name
-               )), '//text()'
-           )
-       ) AS row_count
+        "level":  2,
+        "desc":   "Exact row count per table (batched, concurrent COUNT(*))",
+        "cache":  False,
+        "watch":  True,
+        "keys":   ["table_name"],
+        "engine": "row_counts",
+        # Table list for the row-count engine, largest segments first
+        "sql": """
+SELECT t.owner, t.table_name, NVL(SUM(s.blocks), 0) AS blocks
 FROM   dba_tables t
-WHERE  t.owner = '{SCHEMA_NAME}'
-ORDER  BY t.table_name;"""
+LEFT   JOIN dba_segments s
+       ON s.owner = t.owner AND s.segment_name = t.table_name
+      AND s.segment_type LIKE 'TABLE%'
+WHERE  t.owner = '{schema}'
+GROUP  BY t.owner, t.table_name
+ORDER  BY blocks DESC, t.table_name;"""
     },
 
     "L2_02_Column_Structure": {
         "level": 2,
         "desc":  "Column-level structure — type, length, nullability",
-        "sql": f"""
+        "keys":  ["table_name", "column_name"],
+        "sql": """
 SELECT table_name, column_id, column_name, data_type,
        data_length, data_precision, data_scale,
        nullable, virtual_column
 FROM   dba_tab_columns
-WHERE  owner = '{SCHEMA_NAME}'
+WHERE  owner = '{schema}'
 ORDER  BY table_name, column_id;"""
     },
 
     "L2_03_Column_Count_Per_Table": {
         "level": 2,
         "desc":  "Column count summary per table",
-        "sql": f"""
+        "keys":  ["table_name"],
+        "sql": """
 SELECT table_name,
        COUNT(*) AS total_columns,
        SUM(CASE WHEN nullable='N'         THEN 1 ELSE 0 END) AS not_null_cols,
        SUM(CASE WHEN virtual_column='YES' THEN 1 ELSE 0 END) AS virtual_cols,
        SUM(CASE WHEN data_default IS NOT NULL THEN 1 ELSE 0 END) AS default_cols
 FROM   dba_tab_columns
-WHERE  owner = '{SCHEMA_NAME}'
+WHERE  owner = '{schema}'
 GROUP  BY table_name
 ORDER  BY table_name;"""
     },
@@ -359,12 +533,13 @@ ORDER  BY table_name;"""
     "L2_04_PK_With_Columns": {
         "level": 2,
         "desc":  "Primary key constraints with column list",
-        "sql": f"""
+        "keys":  ["table_name"],
+        "sql": """
 SELECT c.table_name, c.constraint_name, c.status, c.validated,
        LISTAGG(cc.column_name,',') WITHIN GROUP (ORDER BY cc.position) AS pk_columns
 FROM   dba_constraints  c
 JOIN   dba_cons_columns cc ON cc.owner=c.owner AND cc.constraint_name=c.constraint_name
-WHERE  c.owner = '{SCHEMA_NAME}' AND c.constraint_type='P'
+WHERE  c.owner = '{schema}' AND c.constraint_type='P'
 GROUP  BY c.table_name, c.constraint_name, c.status, c.validated
 ORDER  BY c.table_name;"""
     },
@@ -372,22 +547,25 @@ ORDER  BY c.table_name;"""
     "L2_05_FK_With_Columns": {
         "level": 2,
         "desc":  "Foreign key constraints with parent table references",
-        "sql": f"""
+        "keys":  ["table_name", "constraint_name"],
+        "sql": """
 SELECT c.table_name, c.constraint_name, c.status,
        c.delete_rule, rc.table_name AS parent_table, c.validated
 FROM   dba_constraints c
 JOIN   dba_constraints rc ON rc.owner=c.r_owner AND rc.constraint_name=c.r_constraint_name
-WHERE  c.owner='{SCHEMA_NAME}' AND c.constraint_type='R'
+WHERE  c.owner='{schema}' AND c.constraint_type='R'
 ORDER  BY c.table_name;"""
     },
 
     "L2_06_Disabled_Constraints": {
         "level": 2,
         "desc":  "Disabled or not-validated constraints — investigate these",
-        "sql": f"""
+        "watch": True,
+        "keys":  ["table_name", "constraint_name"],
+        "sql": """
 SELECT table_name, constraint_name, constraint_type, status, validated
 FROM   dba_constraints
-WHERE  owner = '{SCHEMA_NAME}'
+WHERE  owner = '{schema}'
   AND  (status='DISABLED' OR validated='NOT VALIDATED')
 ORDER  BY table_name;"""
     },
@@ -395,13 +573,14 @@ ORDER  BY table_name;"""
     "L2_07_Index_With_Columns": {
         "level": 2,
         "desc":  "Index details with indexed column list",
-        "sql": f"""
+        "keys":  ["table_name", "index_name"],
+        "sql": """
 SELECT i.table_name, i.index_name, i.index_type, i.uniqueness,
        i.status, i.visibility,
        LISTAGG(ic.column_name,',') WITHIN GROUP (ORDER BY ic.column_position) AS indexed_cols
 FROM   dba_indexes     i
 JOIN   dba_ind_columns ic ON ic.index_owner=i.owner AND ic.index_name=i.index_name
-WHERE  i.table_owner = '{SCHEMA_NAME}'
+WHERE  i.table_owner = '{schema}'
 GROUP  BY i.table_name, i.index_name, i.index_type, i.uniqueness, i.status, i.visibility
 ORDER  BY i.table_name, i.index_name;"""
     },
@@ -409,20 +588,23 @@ ORDER  BY i.table_name, i.index_name;"""
     "L2_08_Unusable_Indexes": {
         "level": 2,
         "desc":  "Unusable indexes — must be ZERO rows",
-        "sql": f"""
+        "watch": True,
+        "keys":  ["index_name"],
+        "sql": """
 SELECT index_name, table_name, index_type, status
 FROM   dba_indexes
-WHERE  table_owner = '{SCHEMA_NAME}'
+WHERE  table_owner = '{schema}'
   AND  status      = 'UNUSABLE';"""
     },
 
     "L2_09_Code_Line_Counts": {
         "level": 2,
         "desc":  "Source code line counts per object",
-        "sql": f"""
+        "keys":  ["object_type", "object_name"],
+        "sql": """
 SELECT name AS object_name, type AS object_type, COUNT(*) AS source_lines
 FROM   dba_source
-WHERE  owner = '{SCHEMA_NAME}'
+WHERE  owner = '{schema}'
 GROUP  BY name, type
 ORDER  BY type, name;"""
     },
@@ -430,24 +612,25 @@ ORDER  BY type, name;"""
     "L2_10_Compilation_Errors": {
         "level": 2,
         "desc":  "Compilation errors — must be ZERO rows",
-        "sql": f"""
+        "sql": """
 SELECT name AS object_name, type AS object_type,
        line, position, text AS error_text, attribute
 FROM   dba_errors
-WHERE  owner = '{SCHEMA_NAME}'
+WHERE  owner = '{schema}'
 ORDER  BY name, line;"""
     },
 
     "L2_11_Package_Body_Mismatch": {
         "level": 2,
         "desc":  "Package spec without body or body without spec",
-        "sql": f"""
+        "keys":  ["package_name"],
+        "sql": """
 SELECT NVL(s.object_name, b.object_name) AS package_name,
        CASE WHEN s.object_type IS NOT NULL THEN 'EXISTS' ELSE 'MISSING' END AS spec_status,
        CASE WHEN b.object_type IS NOT NULL THEN 'EXISTS' ELSE 'MISSING' END AS body_status
-FROM   (SELECT object_name, object_type FROM dba_objects WHERE owner='{SCHEMA_NAME}' AND object_type='PACKAGE') s
+FROM   (SELECT object_name, object_type FROM dba_objects WHERE owner='{schema}' AND object_type='PACKAGE') s
 FULL OUTER JOIN
-       (SELECT object_name, object_type FROM dba_objects WHERE owner='{SCHEMA_NAME}' AND object_type='PACKAGE BODY') b
+       (SELECT object_name, object_type FROM dba_objects WHERE owner='{schema}' AND object_type='PACKAGE BODY') b
 ON     s.object_name = b.object_name
 WHERE  s.object_type IS NULL OR b.object_type IS NULL
 ORDER  BY 1;"""
@@ -456,14 +639,16 @@ ORDER  BY 1;"""
     "L2_12_Table_Segments": {
         "level": 2,
         "desc":  "Table segment sizes in MB",
-        "sql": f"""
+        "cache": False,
+        "keys":  ["table_name"],
+        "sql": """
 SELECT s.segment_name AS table_name,
        ROUND(s.bytes/1024/1024,3) AS size_mb,
        t.num_rows, t.blocks,
        TO_CHAR(t.last_analyzed,'YYYY-MM-DD') AS last_analyzed
 FROM   dba_segments s
 JOIN   dba_tables   t ON t.owner=s.owner AND t.table_name=s.segment_name
-WHERE  s.owner       = '{SCHEMA_NAME}'
+WHERE  s.owner       = '{schema}'
   AND  s.segment_type= 'TABLE'
 ORDER  BY s.bytes DESC;"""
     },
@@ -471,32 +656,34 @@ ORDER  BY s.bytes DESC;"""
     "L2_13_LOB_Columns": {
         "level": 2,
         "desc":  "LOB column definitions (CLOB, BLOB)",
-        "sql": f"""
+        "keys":  ["table_name", "column_name"],
+        "sql": """
 SELECT table_name, column_name, lob_name, chunk, cache, in_row
 FROM   dba_lobs
-WHERE  owner = '{SCHEMA_NAME}'
+WHERE  owner = '{schema}'
 ORDER  BY table_name, column_name;"""
     },
 
     "L2_14_Partitions": {
         "level": 2,
         "desc":  "Partition details per table",
-        "sql": f"""
+        "keys":  ["table_name"],
+        "sql": """
 SELECT pt.table_name, pt.partitioning_type,
        pt.partition_count, pt.subpartitioning_type
 FROM   dba_part_tables pt
-WHERE  pt.owner = '{SCHEMA_NAME}'
+WHERE  pt.owner = '{schema}'
 ORDER  BY pt.table_name;"""
     },
 
     "L2_15_Object_Dependencies": {
         "level": 2,
         "desc":  "Object dependency map (non-system refs)",
-        "sql": f"""
+        "sql": """
 SELECT d.name AS object_name, d.type AS object_type,
        d.referenced_name, d.referenced_type, d.referenced_owner
 FROM   dba_dependencies d
-WHERE  d.owner = '{SCHEMA_NAME}'
+WHERE  d.owner = '{schema}'
   AND  d.referenced_owner NOT IN ('SYS','SYSTEM','PUBLIC','WMSYS','XDB','MDSYS','CTXSYS')
 ORDER  BY d.type, d.name, d.referenced_name;"""
     },
@@ -504,12 +691,13 @@ ORDER  BY d.type, d.name, d.referenced_name;"""
     "L2_16_Broken_Dependencies": {
         "level": 2,
         "desc":  "Broken dependencies — objects referenced but missing",
-        "sql": f"""
+        "cache": False,
+        "sql": """
 SELECT DISTINCT d.name AS object_name, d.type,
        d.referenced_name AS missing_object,
        d.referenced_type, d.referenced_owner
 FROM   dba_dependencies d
-WHERE  d.owner = '{SCHEMA_NAME}'
+WHERE  d.owner = '{schema}'
   AND  d.referenced_owner NOT IN ('SYS','SYSTEM','PUBLIC')
   AND  NOT EXISTS (
          SELECT 1 FROM dba_objects o
@@ -521,50 +709,82 @@ ORDER  BY d.name;"""
     "L2_17_Statistics_Freshness": {
         "level": 2,
         "desc":  "Table statistics freshness (stale stats = bad query plans)",
-        "sql": f"""
+        "cache": False,
+        "sql": """
 SELECT table_name, num_rows, blocks,
        TO_CHAR(last_analyzed,'YYYY-MM-DD HH24:MI:SS') AS last_analyzed,
        stale_stats
 FROM   dba_tab_statistics
-WHERE  owner = '{SCHEMA_NAME}'
+WHERE  owner = '{schema}'
 ORDER  BY last_analyzed NULLS FIRST;"""
     },
 
     "L2_18_Triggers_Detail": {
         "level": 2,
         "desc":  "Trigger details with event and status",
-        "sql": f"""
+        "keys":  ["trigger_name"],
+        "sql": """
 SELECT trigger_name, trigger_type, triggering_event,
        table_name, status, action_type
 FROM   dba_triggers
-WHERE  owner = '{SCHEMA_NAME}'
+WHERE  owner = '{schema}'
 ORDER  BY table_name, trigger_name;"""
     },
 
     "L2_19_Column_Statistics": {
         "level": 2,
         "desc":  "Column statistics — distinct values, nulls, density",
-        "sql": f"""
+        "cache": False,
+        "keys":  ["table_name", "column_name"],
+        "sql": """
 SELECT table_name, column_name, num_distinct, num_nulls,
        ROUND(density,6) AS density, avg_col_len,
        TO_CHAR(last_analyzed,'YYYY-MM-DD') AS last_analyzed
 FROM   dba_tab_col_statistics
-WHERE  owner = '{SCHEMA_NAME}'
+WHERE  owner = '{schema}'
 ORDER  BY table_name, column_name;"""
     },
 
     "L2_20_Datatype_Distribution": {
         "level": 2,
         "desc":  "Data type distribution across all tables",
-        "sql": f"""
+        "keys":  ["data_type"],
+        "sql": """
 SELECT data_type,
        COUNT(*)                   AS column_count,
        COUNT(DISTINCT table_name) AS tables_using_type
 FROM   dba_tab_columns
-WHERE  owner = '{SCHEMA_NAME}'
+WHERE  owner = '{schema}'
 GROUP  BY data_type
 ORDER  BY column_count DESC;"""
     },
+
+    # -------------------------------------------------------------------------
+    # LEVEL 3 — Table Content Checksums (explicit --level 3 only)
+    # -------------------------------------------------------------------------
+    "L3_01_Table_Checksums": {
+        "level":  3,
+        "desc":   "Per-table ORA_HASH bucket checksums, drilled down to differing rows",
+        "cache":  False,
+        "keys":   ["table_name", "pk_value"],
+        "engine": "checksums",
+        # Column list for the checksum engine (PK position 0 = not in PK)
+        "sql": """
+SELECT c.owner, c.table_name, c.column_name, c.data_type,
+       NVL(p.position, 0) AS pk_position
+FROM   dba_tab_columns c
+JOIN   dba_tables t ON t.owner = c.owner AND t.table_name = c.table_name
+LEFT   JOIN (SELECT cc.owner, cc.table_name, cc.column_name, cc.position
+             FROM   dba_constraints k
+             JOIN   dba_cons_columns cc
+                    ON cc.owner = k.owner AND cc.constraint_name = k.constraint_name
+             WHERE  k.constraint_type = 'P') p
+       ON p.owner = c.owner AND p.table_name = c.table_name AND p.column_name = c.column_name
+WHERE  c.owner = '{schema}'
+  AND  t.temporary = 'N'
+  AND  t.nested = 'NO'
+ORDER  BY c.table_name, c.column_id;"""
+    },
 }
 
 
@@ -578,21 +798,32 @@ def build_connection_string(cfg: dict) -> str:
             f"@{cfg['host']}:{cfg['port']}/{cfg['service']}")
 
 
-def build_sqlplus_script(sql: str, col_sep: str) -> str:
-    """Wrap a query in sqlplus formatting directives for CSV-like output."""
+def build_sqlplus_settings(col_sep: str, on_error: str = "EXIT SQL.SQLCODE",
+                           fmt: str = "colsep") -> str:
+    """
+    sqlplus formatting directives for CSV-like output: padded COL_SEP
+    columns, or real quoted CSV (SET MARKUP CSV) when fmt is "csv".
+    """
+    if fmt == "csv":
+        layout = "SET MARKUP CSV ON DELIMITER , QUOTE ON"
+    else:
+        layout = f"SET LINESIZE 32767\nSET TRIMSPOOL ON\nSET COLSEP '{col_sep}'"
     return f"""
 SET PAGESIZE 50000
-SET LINESIZE 32767
 SET FEEDBACK OFF
 SET VERIFY OFF
 SET HEADING ON
 SET ECHO OFF
-SET TRIMSPOOL ON
-SET COLSEP '{col_sep}'
+{layout}
 SET NULL '__NULL__'
 SET TERMOUT OFF
-WHENEVER SQLERROR EXIT SQL.SQLCODE
+WHENEVER SQLERROR {on_error}
+"""
 
+
+def build_sqlplus_script(sql: str, col_sep: str, fmt: str = "colsep") -> str:
+    """Wrap a query in sqlplus formatting directives for CSV-like output."""
+    return f"""{build_sqlplus_settings(col_sep, fmt=fmt)}
 {sql}
 
 EXIT;
@@ -604,63 +835,1445 @@ def run_sqlplus(cfg: dict, sql: str) -> tuple:
     Execute SQL via sqlplus subprocess.
     Returns (rows: list[list[str]], error: str|None)
     """
-    script    = build_sqlplus_script(sql, COL_SEP)
-    conn_str  = build_connection_string(cfg)
+    return stream_sqlplus(cfg, sql, list)
+
 
+def sqlplus_version() -> tuple:
+    """(major, minor) from `sqlplus -V`, or None if it cannot be run."""
+    global _SQLPLUS_VERSION
+    if _SQLPLUS_VERSION is None:
+        try:
+            out = subprocess.run([SQLPLUS_BIN, "-V"], stdout=subprocess.PIPE,
+                                 stderr=subprocess.STDOUT, universal_newlines=True,
+                                 timeout=30).stdout
+            m = re.search(r"Release (\d+)\.(\d+)", out)
+            _SQLPLUS_VERSION = (int(m.group(1)), int(m.group(2))) if m else ()
+        except (OSError, subprocess.SubprocessError):
+            _SQLPLUS_VERSION = ()
+    return _SQLPLUS_VERSION or None
+
+
+_SQLPLUS_VERSION = None
+
+
+def resolve_output_format(fmt: str = OUTPUT_FORMAT) -> str:
+    """Turn "auto" into "csv" on 12.2+ clients, "colsep" otherwise."""
+    if fmt != "auto":
+        return fmt
+    version = sqlplus_version()
+    return "csv" if version and version >= CSV_MARKUP_MIN_VERSION else "colsep"
+
+
+class PhaseMetrics:
+    """
+    Per check and side: sqlplus calls, seconds spent starting sqlplus,
+    until its first output line and in total, output bytes, retried calls
+    and the seconds those failed attempts took (part of sqlplus_s).
+    Engines add to it from several threads.
+    """
+
+    FIELDS = ("calls", "spawn_s", "first_byte_s", "sqlplus_s", "bytes", "retries", "retried_s")
+
+    def __init__(self):
+        self.values = dict.fromkeys(self.FIELDS, 0)
+        self._lock  = threading.Lock()
+
+    def add_call(self, started: float, stats: dict):
+        """Account one sqlplus call that began at `started` (time.monotonic)."""
+        end = time.monotonic()
+        with self._lock:
+            v = self.values
+            v["calls"]        += 1
+            v["spawn_s"]      += (stats.get("spawned") or started) - started
+            v["first_byte_s"] += (stats.get("first") or end) - started
+            v["sqlplus_s"]    += end - started
+            v["bytes"]        += stats["bytes"]
+
+    def add_retry(self, seconds: float):
+        """Account one failed attempt, of `seconds`, that is being retried."""
+        with self._lock:
+            self.values["retries"]   += 1
+            self.values["retried_s"] += seconds
+
+
+def stream_sqlplus(cfg: dict, sql: str, consume=list, fmt: str = "colsep",
+                   metrics: PhaseMetrics = None, timeout: float = None) -> tuple:
+    """
+    Execute SQL via sqlplus subprocess, handing the parsed rows to
+    `consume` as they arrive on the pipe (nothing is buffered here).
+    Returns (consume(rows), error: str|None). On error, `consume` is
+    given an empty stream so callers always get the same result type.
+    The call is killed after `timeout` seconds (default SQLPLUS_TIMEOUT).
+    """
+    stats   = {"nonblank": False, "bytes": 0, "first": None, "spawned": None}
+    started = time.monotonic()
     try:
-        proc = subprocess.run(
-            [SQLPLUS_BIN, "-S", conn_str],
-            input=script,
-            capture_output=True,
-            text=True,
-            timeout=300           # 5 min max per query
-        )
+        return _stream_sqlplus(cfg, sql, consume, fmt, stats, timeout or SQLPLUS_TIMEOUT)
+    finally:
+        if metrics is not None:
+            metrics.add_call(started, stats)
 
-        stdout = proc.stdout
-        stderr = proc.stderr.strip()
 
-        if proc.returncode not in (0, None) and not stdout.strip():
-            return [], (stderr or f"sqlplus exited with code {proc.returncode}")
+def _stream_sqlplus(cfg: dict, sql: str, consume, fmt: str, stats: dict,
+                    timeout: float) -> tuple:
+    script   = build_sqlplus_script(sql, COL_SEP, fmt)
+    conn_str = build_connection_string(cfg)
+    expired  = threading.Event()
 
-        rows = parse_sqlplus_output(stdout)
-        return rows, None
+    try:
+        with tempfile.TemporaryFile(mode="w+", encoding="utf-8") as err_fh:
+            proc = subprocess.Popen(
+                [SQLPLUS_BIN, "-S", conn_str],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=err_fh,
+                text=True,
+            )
+            stats["spawned"] = time.monotonic()
+
+            def expire():
+                expired.set()
+                proc.kill()
+
+            timer = threading.Timer(timeout, expire)
+            timer.start()
+            # Feed the script from its own thread: a big script (--batch,
+            # row-count batches) must not fill the stdin pipe while sqlplus
+            # is blocked on a full stdout pipe that nobody reads yet.
+            feeder = threading.Thread(target=_feed_stdin, args=(proc.stdin, script),
+                                      name="mv-sqlplus-stdin", daemon=True)
+            feeder.start()
+            try:
+                result = consume(OUTPUT_READERS[fmt](_tap_lines(proc.stdout, stats)))
+                for _ in proc.stdout:      # drain if consume stopped early
+                    pass
+                proc.wait()
+            finally:
+                timer.cancel()
+                if proc.poll() is None:
+                    proc.kill()
+                    proc.wait()
+                feeder.join()
+                proc.stdout.close()
+
+            if expired.is_set():
+                return consume(iter(())), f"Query timed out after {timeout:g} seconds"
+            if proc.returncode not in (0, None) and not stats["nonblank"]:
+                err_fh.seek(0)
+                stderr = err_fh.read().strip()
+                return consume(iter(())), (stderr or f"sqlplus exited with code {proc.returncode}")
+            return result, None
 
     except FileNotFoundError:
-        return [], f"sqlplus not found at '{SQLPLUS_BIN}'. Update SQLPLUS_BIN in config."
-    except subprocess.TimeoutExpired:
-        return [], "Query timed out after 300 seconds"
+        return consume(iter(())), f"sqlplus not found at '{SQLPLUS_BIN}'. Update SQLPLUS_BIN in config."
     except Exception as e:
-        return [], str(e)
+        return consume(iter(())), str(e)
+
+
+def _feed_stdin(stdin, script: str):
+    """Write the whole script and close stdin; sqlplus exiting early is not an error here."""
+    try:
+        stdin.write(script)
+    except (BrokenPipeError, OSError):
+        pass
+    finally:
+        try:
+            stdin.close()
+        except (BrokenPipeError, OSError):
+            pass
 
 
-def parse_sqlplus_output(raw: str) -> list:
+def _tap_lines(lines, stats: dict):
     """
-    Parse the COL_SEP delimited sqlplus output into list of lists.
-    First row is treated as header.
+    Pass lines through, noting in `stats` whether any were non-blank, when
+    the first one arrived and how many bytes (characters) went by.
     """
-    lines  = raw.splitlines()
-    parsed = []
+    n = 0
+    try:
+        for line in lines:
+            if not n:
+                stats["first"] = time.monotonic()
+            n += len(line)
+            if not stats["nonblank"] and line.strip():
+                stats["nonblank"] = True
+            yield line
+    finally:
+        stats["bytes"] = stats.get("bytes", 0) + n
+
+
+def parse_sqlplus_output(raw: str, batch: bool = False, fmt: str = "colsep"):
+    """
+    Parse the COL_SEP delimited (or, with fmt="csv", MARKUP CSV) sqlplus
+    output into list of lists. First row is treated as header. With
+    batch=True the output of a build_batch_sql() script is split into
+    {check_name: rows}.
+    """
+    rows = OUTPUT_READERS[fmt](StringIO(raw))
+    return split_batch_rows(rows) if batch else list(rows)
+
+
+def iter_sqlplus_rows(lines):
+    """
+    Incremental form of parse_sqlplus_output(): consumes an iterable of
+    output lines (a pipe, a file, a list) and yields one list per row.
+    The first row yielded is the header; headings that sqlplus repeats at
+    every PAGESIZE page break (the heading line followed by its ----
+    underline) are dropped. A data row that merely equals the heading is kept.
+    """
+    header  = None
+    pending = None      # row equal to the header: a page-break heading if ---- follows
 
     for line in lines:
         line = line.strip()
         if not line:
             continue
-        # Skip separator lines like ---  ---  ---
-        if re.match(r'^[-\s]+$', line):
+        # Skip separator lines like ---  ---  --- (or ---~|~---)
+        if _SEPARATOR_LINE.match(line.replace(COL_SEP, " ")):
+            pending = None
+            continue
+        if pending is not None:
+            yield pending
+            pending = None
+        # Batch marker: the next row is a new result set's header
+        if line.startswith(BATCH_MARKER):
+            header = None
+            yield [line]
             continue
         # Skip Oracle banner / connection lines
-        if any(x in line for x in ["Connected to", "Oracle Database",
-                                    "Copyright", "Oracle Corporation",
-                                    "SQL>", "SP2-", "ORA-"]):
+        if any(x in line for x in _BANNER_MARKERS):
             # Capture ORA- errors
             if line.startswith("ORA-") or line.startswith("SP2-"):
-                parsed.append([line])
+                if header is None:
+                    header = [line]
+                yield [line]
             continue
         cols = [c.strip() for c in line.split(COL_SEP)]
-        if cols:
-            parsed.append(cols)
+        if header is None:
+            header = cols
+        elif cols == header:
+            pending = cols
+            continue
+        yield cols
+    if pending is not None:
+        yield pending
 
-    return parsed
+
+def iter_csv_rows(lines):
+    """
+    iter_sqlplus_rows() for SET MARKUP CSV output. Rows come from one
+    csv.reader, so quoted values may hold commas, quotes and newlines and
+    are returned exactly as stored. Batch markers and ORA-/SP2- lines are
+    only recognised between records (an even number of quotes so far).
+    A row equal to the header is a repeated page heading only right after
+    a blank line (a page break); anywhere else it is data.
+    """
+    header      = None
+    after_blank = False
+    for row in csv.reader(_csv_records(lines)):
+        if not row:
+            after_blank = True
+            continue
+        if len(row) == 1 and row[0].startswith(BATCH_MARKER):
+            header = None
+        elif header is None:
+            header = row
+        elif row == header and after_blank:
+            after_blank = False
+            continue
+        after_blank = False
+        yield row
+
+
+def _csv_records(lines):
+    """Feed csv.reader, re-quoting the non-CSV lines sqlplus mixes in."""
+    in_quotes = False
+    for line in lines:
+        if not in_quotes and line.startswith((BATCH_MARKER, "ORA-", "SP2-")):
+            line = '"' + line.strip().replace('"', '""') + '"\n'
+        elif line.count('"') % 2:
+            in_quotes = not in_quotes
+        yield line
+
+
+OUTPUT_READERS = {"colsep": iter_sqlplus_rows, "csv": iter_csv_rows}
+
+
+def build_batch_sql(checks: list) -> str:
+    """
+    One script for several (name, sql) checks. Errors no longer end the
+    script, so a failing check only affects its own result set.
+    """
+    parts = ["WHENEVER SQLERROR CONTINUE"]
+    for name, sql in checks:
+        parts.append(f"PROMPT {BATCH_MARKER} {name}")
+        parts.append(sql.strip())
+    return "\n".join(parts)
+
+
+def split_batch_rows(rows) -> dict:
+    """Split the rows of a build_batch_sql() run into {name: rows}."""
+    results = {}
+    current = None
+    for row in rows:
+        if len(row) == 1 and row[0].startswith(BATCH_MARKER):
+            current = results.setdefault(row[0][len(BATCH_MARKER):].strip(), [])
+        elif current is not None:
+            current.append(row)
+    return results
+
+
+_SEPARATOR_LINE = re.compile(r'^[-\s]+$')
+_BANNER_MARKERS = ("Connected to", "Oracle Database",
+                   "Copyright", "Oracle Corporation",
+                   "SQL>", "SP2-", "ORA-")
+
+
+# =============================================================================
+# SQLPLUS SESSION POOL
+# =============================================================================
+
+class SessionError(Exception):
+    """The sqlplus coprocess died or lost its connection."""
+
+
+class SessionTimeout(SessionError):
+    """A statement did not finish within its timeout (not retried by the session)."""
+
+
+class SqlplusSession:
+    """
+    One long-lived `sqlplus -S -L` coprocess.
+    Queries are written to stdin followed by `PROMPT <sentinel>`; the output
+    up to the sentinel line is that query's result set. A daemon thread
+    pumps stdout into a queue so reads can time out without blocking.
+    """
+
+    def __init__(self, cfg: dict, fmt: str = "colsep"):
+        self.cfg       = cfg
+        self.fmt       = fmt
+        self.spawn_s   = 0.0        # total seconds spent (re)starting sqlplus
+        self.proc      = None
+        self.last_used = 0.0
+        self._lines    = None
+
+    @property
+    def alive(self) -> bool:
+        return self.proc is not None and self.proc.poll() is None
+
+    def start(self):
+        self.close()
+        started = time.monotonic()
+        self.proc = subprocess.Popen(
+            [SQLPLUS_BIN, "-S", "-L", build_connection_string(self.cfg)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1,
+        )
+        self._lines = queue.Queue()
+        threading.Thread(target=self._pump, args=(self.proc.stdout, self._lines),
+                         daemon=True).start()
+        # Login failures print ORA- errors and exit (-L), which surfaces here
+        lines = self._roundtrip(build_sqlplus_settings(COL_SEP, on_error="CONTINUE",
+                                                       fmt=self.fmt), SQLPLUS_TIMEOUT)
+        self.spawn_s += time.monotonic() - started
+        errors = [l.strip() for l in lines if l.strip()]
+        if errors:
+            self.close()
+            raise SessionError(" ".join(errors))
+
+    @staticmethod
+    def _pump(stdout, lines: queue.Queue):
+        for line in stdout:
+            lines.put(line)
+        lines.put(None)  # EOF
+
+    def _send(self, text: str) -> str:
+        """Write text plus a PROMPT sentinel; return the sentinel to wait for."""
+        sentinel = f"__MV_END_{uuid.uuid4().hex}__"
+        try:
+            self.proc.stdin.write(f"{text}\nPROMPT {sentinel}\n")
+            self.proc.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            self.close()
+            raise SessionError(f"sqlplus session closed: {e}")
+        return sentinel
+
+    def _read_until(self, sentinel: str, timeout: float):
+        """Yield output lines until the sentinel comes back."""
+        deadline = time.monotonic() + timeout
+        tail = deque(maxlen=5)
+        while True:
+            try:
+                line = self._lines.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                self.close()
+                raise SessionTimeout(f"Query timed out after {timeout:g} seconds")
+            if line is None:
+                self.close()
+                raise SessionError("sqlplus session exited: " +
+                                   " ".join(l.strip() for l in tail if l.strip()))
+            if line.strip() == sentinel:
+                self.last_used = time.monotonic()
+                return
+            tail.append(line)
+            yield line
+
+    def _roundtrip(self, text: str, timeout: float) -> list:
+        return list(self._read_until(self._send(text), timeout))
+
+    def ping(self) -> bool:
+        try:
+            lines = self._roundtrip("SELECT 'MV_PING' AS ping FROM dual;", 30)
+        except SessionError:
+            return False
+        return any("MV_PING" in l for l in lines)
+
+    def query(self, sql: str, timeout: float = None):
+        """
+        Run one statement and yield its raw output lines as they arrive,
+        (re)connecting and health-checking as needed. It fails with
+        SessionTimeout after `timeout` seconds (default SQLPLUS_TIMEOUT). A lost connection is
+        retried once, decided on the first non-blank line so nothing has
+        been handed to the caller yet. If the caller stops reading early the
+        session is closed, since its pipe still holds unread output.
+        """
+        for attempt in (1, 2):
+            if not self.alive:
+                self.start()
+            elif time.monotonic() - self.last_used > SESSION_PING_AFTER and not self.ping():
+                self.start()
+            lines = self._read_until(self._send(sql), timeout or SQLPLUS_TIMEOUT)
+            head  = []
+            try:
+                for line in lines:
+                    head.append(line)
+                    if line.strip():
+                        break
+            except SessionTimeout:
+                raise
+            except SessionError:
+                if attempt == 2:
+                    raise
+                continue
+            if attempt == 1 and any(code in l for l in head for code in SESSION_RECONNECT_ERRORS):
+                self.close()
+                continue
+
+            finished = False
+            try:
+                yield from head
+                yield from lines
+                finished = True
+            finally:
+                if not finished:
+                    self.close()
+            return
+
+    def close(self):
+        if self.proc is None:
+            return
+        proc, self.proc = self.proc, None
+        try:
+            if proc.poll() is None:
+                proc.stdin.write("EXIT;\n")
+                proc.stdin.flush()
+                proc.wait(timeout=5)
+        except Exception:
+            pass
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+
+
+class SessionPool:
+    """Up to `size` SqlplusSession objects for one database, started lazily."""
+
+    def __init__(self, cfg: dict, size: int, fmt: str = "colsep"):
+        self.cfg   = cfg
+        self.fmt   = fmt
+        self._idle = queue.LifoQueue()     # most recently used first = warm
+        self._all  = []
+        self._lock = threading.Lock()
+        for _ in range(size):
+            self._idle.put(None)
+
+    def run(self, sql: str, consume=list, metrics: PhaseMetrics = None,
+            timeout: float = None) -> tuple:
+        """Same contract as stream_sqlplus(): (consume(rows), error)."""
+        session = self._idle.get()
+        stats   = {"nonblank": False, "bytes": 0, "first": None, "spawned": None}
+        started = time.monotonic()
+        try:
+            if session is None:
+                session = SqlplusSession(self.cfg, self.fmt)
+                with self._lock:
+                    self._all.append(session)
+            spawn_before = session.spawn_s
+            lines = _tap_lines(session.query(sql, timeout), stats)
+            try:
+                return consume(OUTPUT_READERS[self.fmt](lines)), None
+            finally:
+                stats["spawned"] = started + session.spawn_s - spawn_before
+        except FileNotFoundError:
+            return consume(iter(())), f"sqlplus not found at '{SQLPLUS_BIN}'. Update SQLPLUS_BIN in config."
+        except Exception as e:
+            return consume(iter(())), str(e)
+        finally:
+            self._idle.put(session)
+            if metrics is not None:
+                metrics.add_call(started, stats)
+
+    def close(self):
+        with self._lock:
+            sessions, self._all = self._all, []
+        for session in sessions:
+            session.close()
+
+
+# =============================================================================
+# PARALLEL EXECUTOR
+# =============================================================================
+
+class Database:
+    """
+    One side of the comparison (source or target).
+    Every sqlplus call acquires this database's slot and then a shared slot,
+    so --jobs bounds the total and --source-jobs/--target-jobs bound each side.
+    """
+
+    def __init__(self, side: str, cfg: dict, max_jobs: int,
+                 shared_slots: threading.BoundedSemaphore, session_pool: bool = False,
+                 output_format: str = "colsep"):
+        self.side     = side
+        self.cfg      = cfg
+        self.max_jobs = max_jobs
+        self.fmt      = output_format
+        self.pool     = SessionPool(cfg, max_jobs, output_format) if session_pool else None
+        self._slots   = threading.BoundedSemaphore(max_jobs)
+        self._shared  = shared_slots
+
+    def run(self, sql: str, consume=list, metrics: PhaseMetrics = None,
+            timeout: float = None) -> tuple:
+        """
+        Same contract as stream_sqlplus(): (consume(rows), error).
+        Transient failures (RETRY_ERRORS, as the error or as an ORA-/SP2-
+        line anywhere in the output) are retried with exponential backoff,
+        outside the slots; `consume` is then called again and only the last
+        attempt's result is returned, earlier ones being closed. If the last
+        attempt still fails that way, its ORA- line is returned as the error.
+        """
+        timeout = timeout or SQLPLUS_TIMEOUT
+        for attempt in range(RETRY_ATTEMPTS + 1):
+            found = []
+            result, err, seconds = self._run_once(
+                sql, lambda rows: consume(_watch_errors(rows, found)), metrics, timeout)
+            reason = err or (found[0] if found else "")
+            if not _transient(reason):
+                return result, err
+            if attempt == RETRY_ATTEMPTS:
+                # Out of retries: the output is partial at best, so fail the call
+                return result, reason
+            if hasattr(result, "close"):
+                result.close()
+            if metrics is not None:
+                metrics.add_retry(seconds)
+            if "timed out" in reason:
+                timeout = min(timeout * 2, max(timeout, TIMEOUT_MAX))
+            time.sleep(RETRY_BACKOFF * 2 ** attempt)
+
+    def _run_once(self, sql: str, consume, metrics: PhaseMetrics, timeout: float) -> tuple:
+        """One attempt: (consume(rows), error, seconds inside the slots)."""
+        with self._slots, self._shared:
+            started = time.monotonic()
+            if self.pool:
+                result, err = self.pool.run(sql, consume, metrics, timeout)
+            else:
+                result, err = stream_sqlplus(self.cfg, sql, consume, self.fmt, metrics, timeout)
+            return result, err, time.monotonic() - started
+
+    def metered(self, metrics: PhaseMetrics, timeout: float = None) -> "MeteredDatabase":
+        """This database with every run() accounted to `metrics` and limited to `timeout`."""
+        return MeteredDatabase(self, metrics, timeout)
+
+    def close(self):
+        if self.pool:
+            self.pool.close()
+
+
+class MeteredDatabase:
+    """
+    Database stand-in handed to engines so their sqlplus calls are metered
+    and use the check's own timeout.
+    """
+
+    def __init__(self, db: Database, metrics: PhaseMetrics, timeout: float = None):
+        self._db     = db
+        self.metrics = metrics
+        self.timeout = timeout
+
+    def __getattr__(self, name):
+        return getattr(self._db, name)
+
+    def run(self, sql: str, consume=list) -> tuple:
+        return self._db.run(sql, consume, self.metrics, self.timeout)
+
+
+def _watch_errors(rows, found: list):
+    """
+    Pass rows through, collecting transient sqlplus errors in `found`. They
+    can come anywhere: after "ERROR:" on a failed logon, or mid-fetch
+    (ORA-01555) after the header and some data.
+    """
+    for row in rows:
+        if len(row) == 1 and row[0][:4] in ("ORA-", "SP2-") and _transient(row[0]):
+            found.append(row[0])
+        yield row
+
+
+def _transient(reason: str) -> bool:
+    """Whether an error message or first output line is worth a retry."""
+    return bool(reason) and any(code in reason for code in RETRY_ERRORS)
+
+
+def open_databases(jobs: int, source_jobs: int = None, target_jobs: int = None,
+                   session_pool: bool = False, output_format: str = "colsep") -> dict:
+    """Build the source/target Database objects for one run."""
+    shared = threading.BoundedSemaphore(jobs)
+    given  = {"source": source_jobs, "target": target_jobs}
+    caps   = {side: given[side] if given[side] is not None else (DB_MAX_JOBS[side] or jobs)
+              for side in given}
+    return {side: Database(side, DB_CONFIG[side], min(caps[side], jobs), shared,
+                           session_pool=session_pool, output_format=output_format)
+            for side in ("source", "target")}
+
+
+def run_check_side(db: Database, qry: dict, consume=list) -> tuple:
+    """Run one check against one database: (consume(rows), error)."""
+    engine = qry.get("engine")
+    if engine:
+        return CHECK_ENGINES[engine](db, qry["sql"], consume)
+    return db.run(qry["sql"], consume)
+
+
+def _snap(snapshot: "SnapshotWriter", check_name: str, side: str, rows):
+    """Rows passed through the run's snapshot file for this check/side, if any."""
+    return snapshot.wrap(check_name, side, rows) if snapshot is not None else rows
+
+
+def _execute_side(db: Database, check_name: str, qry: dict,
+                  cache: "ResultCache" = None, probe: str = None,
+                  snapshot: "SnapshotWriter" = None, timeout: float = None) -> dict:
+    """
+    Worker task for one side of one check. Returns
+      {"result": ResultSide, "error": str|None, "cached": bool, "metrics": dict}
+    """
+    metrics   = PhaseMetrics()
+    cacheable = cache is not None and probe is not None and qry.get("cache", True)
+    if cacheable:
+        rows = cache.get(db, check_name, qry["sql"], probe)
+        if rows is not None:
+            return {"result": ResultSide.from_rows(_snap(snapshot, check_name, db.side, rows)),
+                    "error": None, "cached": True, "metrics": metrics.values}
+
+    capture = RowCapture(CACHE_MAX_ROWS if cacheable else 0)
+    result, err = run_check_side(db.metered(metrics, timeout), qry, lambda rows: ResultSide.from_rows(
+        capture.wrap(_snap(snapshot, check_name, db.side, rows))))
+    if cacheable and not err:
+        _cache_result(cache, db, check_name, qry, probe, capture.rows)
+    return {"result": result, "error": err, "cached": False,
+            "metrics": dict(metrics.values, timeout_s=timeout or SQLPLUS_TIMEOUT)}
+
+
+def _execute_batch(db: Database, checks: list, cache: "ResultCache" = None,
+                   probes: dict = None, snapshot: "SnapshotWriter" = None) -> dict:
+    """
+    Worker task running several plain checks against one database in a
+    single sqlplus call. `checks` is [(check_name, qry)]; returns
+    {check_name: _execute_side() dict}. Cache hits are left out of the script.
+    The metrics of the one sqlplus call are reported on every batched check.
+    """
+    out, todo = {}, []
+    for name, qry in checks:
+        probe = (probes or {}).get((db.side, qry.get("schema")))
+        if cache is not None and probe is not None and qry.get("cache", True):
+            rows = cache.get(db, name, qry["sql"], probe)
+            if rows is not None:
+                out[name] = {"result": ResultSide.from_rows(_snap(snapshot, name, db.side, rows)),
+                             "error": None, "cached": True, "metrics": PhaseMetrics().values}
+                continue
+        todo.append((name, qry, probe))
+    if not todo:
+        return out
+
+    metrics = PhaseMetrics()
+    results, err = db.run(build_batch_sql([(name, qry["sql"]) for name, qry, _ in todo]),
+                          split_batch_rows, metrics)
+    shared = dict(metrics.values, batched=len(todo))
+    for name, qry, probe in todo:
+        rows = results.get(name)
+        if err or rows is None:
+            out[name] = {"result": ResultSide.from_rows(_snap(snapshot, name, db.side, iter(()))),
+                         "cached": False, "error": err or "No output for this check in the batch",
+                         "metrics": shared}
+            continue
+        if cache is not None and probe is not None and qry.get("cache", True):
+            _cache_result(cache, db, name, qry, probe, rows)
+        out[name] = {"result": ResultSide.from_rows(_snap(snapshot, name, db.side, rows)),
+                     "error": None, "cached": False, "metrics": shared}
+    return out
+
+
+def _cache_result(cache: "ResultCache", db: Database, check_name: str, qry: dict,
+                  probe: str, rows: list):
+    """
+    Store a successful side's rows. Nothing is stored for output that
+    holds an ORA-/SP2- line anywhere (a failed or half-fetched query), nor
+    past CACHE_MAX_ROWS, so a fixed grant or a transient error is not
+    replayed from the cache on later runs.
+    """
+    if rows is None or len(rows) > CACHE_MAX_ROWS or _is_error_rows(rows):
+        return
+    cache.put(db, check_name, qry["sql"], probe, rows)
+
+
+def _batchable(qry: dict) -> bool:
+    """Checks eligible for --batch: plain Level 1 dictionary queries."""
+    return qry["level"] == 1 and not qry.get("engine")
+
+
+def _execute_pair(dbs: dict, check_name: str, qry: dict,
+                  snapshot: "SnapshotWriter" = None, timeouts: dict = None) -> tuple:
+    """Worker task for a PAIRED_ENGINES check: (source dict, target dict)."""
+    timeouts = timeouts or {}
+    metrics  = {side: PhaseMetrics() for side in dbs}
+    (src, src_err), (tgt, tgt_err) = PAIRED_ENGINES[qry["engine"]](
+        {side: db.metered(metrics[side], timeouts.get(side)) for side, db in dbs.items()},
+        qry["sql"], list)
+    return tuple({"result": ResultSide.from_rows(_snap(snapshot, check_name, side, rows)),
+                  "error": err, "cached": False,
+                  "metrics": dict(metrics[side].values,
+                                  timeout_s=timeouts.get(side) or SQLPLUS_TIMEOUT)}
+                 for side, rows, err in (("source", src, src_err), ("target", tgt, tgt_err)))
+
+
+def execute_checks(selected: dict, dbs: dict, cache: "ResultCache" = None,
+                   batch: bool = False, snapshot: "SnapshotWriter" = None,
+                   history: "CheckHistory" = None):
+    """
+    Run every planned check's (see build_check_plan) source and target query
+    concurrently and yield (check_name, qry, src, tgt) in plan order, where src/tgt are the
+    _execute_side() dicts holding ResultSide objects filled straight from
+    the sqlplus pipe (or from the result cache).
+    Work runs ahead in the background; results are handed back strictly in
+    the order of `selected`, so console output and reports stay deterministic.
+    With batch=True the Level 1 checks go to each database as one script.
+    Every side's rows are also written to `snapshot` when one is given.
+    With a `history`, each check gets its learned timeout, the checks that
+    took longest before are queued first, and new durations are recorded.
+    """
+    pools = {side: ThreadPoolExecutor(max_workers=db.max_jobs,
+                                      thread_name_prefix=f"mv-{side}")
+             for side, db in dbs.items()}
+    futures = {}
+    try:
+        probes = {}
+        if cache is not None:
+            schemas = sorted({qry["schema"] for qry in selected.values() if qry.get("schema")})
+            futs    = {(side, schema): pools[side].submit(cache.probe, db, schema)
+                       for side, db in dbs.items() for schema in schemas}
+            probes  = {key: fut.result() for key, fut in futs.items()}
+        batched = [(name, qry) for name, qry in selected.items() if batch and _batchable(qry)]
+        if batched:
+            batch_futs = {side: pools[side].submit(_execute_batch, db, batched, cache,
+                                                   probes, snapshot)
+                          for side, db in dbs.items()}
+        for name in schedule_checks(selected, history):
+            qry = selected[name]
+            if batch and _batchable(qry):
+                futures[name] = (batch_futs["source"], batch_futs["target"])
+                continue
+            timeouts = {side: history.timeout(side, name) if history else None for side in dbs}
+            if qry.get("engine") in PAIRED_ENGINES:
+                futures[name] = (pools["source"].submit(_execute_pair, dbs, name, qry,
+                                                        snapshot, timeouts), None)
+                continue
+            futures[name] = tuple(
+                pools[side].submit(_execute_side, dbs[side], name, qry, cache,
+                                   probes.get((side, qry.get("schema"))), snapshot,
+                                   timeouts[side])
+                for side in ("source", "target"))
+        for name, qry in selected.items():
+            src_fut, tgt_fut = futures[name]
+            if tgt_fut is None:
+                src, tgt = src_fut.result()
+            elif batch and _batchable(qry):
+                src, tgt = src_fut.result()[name], tgt_fut.result()[name]
+            else:
+                src, tgt = src_fut.result(), tgt_fut.result()
+            if history is not None:
+                for side, res in (("source", src), ("target", tgt)):
+                    metrics = res.get("metrics") or {}
+                    seconds = metrics.get("sqlplus_s", 0) - metrics.get("retried_s", 0)
+                    if (seconds > 0 and not metrics.get("batched")
+                            and not res["error"] and not res["cached"]):
+                        history.record(dbs[side], name, seconds)
+            yield name, qry, src, tgt
+    finally:
+        # Drop queued work if the caller stopped early (Ctrl-C, exception)
+        for src_fut, tgt_fut in futures.values():
+            src_fut.cancel()
+            if tgt_fut is not None:
+                tgt_fut.cancel()
+        for pool in pools.values():
+            pool.shutdown(wait=True)
+
+
+def schedule_checks(selected: dict, history: "CheckHistory" = None) -> list:
+    """
+    Check names in the order their work is queued: longest expected
+    duration (either side) first, so the slowest checks do not start last
+    and stretch the run. Checks with no history go first, as they may be
+    slow too; ties keep plan order.
+    """
+    if history is None:
+        return list(selected)
+
+    def expected(name):
+        runs = [history.expected(side, name) for side in ("source", "target")]
+        return float("inf") if None in runs else max(runs)
+
+    return sorted(selected, key=lambda name: -expected(name))
+
+
+# =============================================================================
+# RESULT CACHE
+# =============================================================================
+
+class RowCapture:
+    """Tee for a row stream that keeps a copy of up to `limit` rows."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.rows  = [] if limit > 0 else None
+
+    def wrap(self, rows):
+        self.rows = [] if self.limit > 0 else None    # a retried call starts over
+        for row in rows:
+            if self.rows is not None:
+                if len(self.rows) > self.limit:    # header + limit data rows
+                    self.rows = None
+                else:
+                    self.rows.append(row)
+            yield row
+
+
+class ResultCache:
+    """
+    SQLite file of per-check, per-database results from earlier runs.
+    An entry is reused only while the database's freshness probe (last DDL
+    time, object count and valid-object count for the schema; see
+    CACHE_PROBE_SQL), the check's SQL and the output format are unchanged
+    (colsep cells are stripped of padding, csv cells are not).
+    """
+
+    def __init__(self, path: str, refresh: bool = False):
+        self.path    = path
+        self.refresh = refresh        # ignore stored entries, still write new ones
+        self._lock   = threading.Lock()
+        self._conn   = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS check_results (
+                    db_id      TEXT NOT NULL,
+                    check_name TEXT NOT NULL,
+                    sql_hash   TEXT NOT NULL,
+                    probe      TEXT NOT NULL,
+                    digest     TEXT NOT NULL,
+                    row_count  INTEGER NOT NULL,
+                    rows_blob  BLOB NOT NULL,
+                    cached_at  TEXT NOT NULL,
+                    PRIMARY KEY (db_id, check_name)
+                )""")
+
+    @staticmethod
+    def db_id(db: Database) -> str:
+        cfg = db.cfg
+        return f"{cfg['user']}@{cfg['host']}:{cfg['port']}/{cfg['service']}".lower()
+
+    @staticmethod
+    def sql_key(db: Database, sql: str) -> str:
+        return _sha1(f"{db.fmt}\n{sql}")
+
+    @staticmethod
+    def probe(db: Database, schema: str) -> str:
+        """Cheap freshness token for one database, or None if it cannot be read."""
+        rows, err = db.run(CACHE_PROBE_SQL.format(schema=schema))
+        if err or len(rows) < 2 or len(rows[1]) < 3:
+            return None
+        return ":".join(rows[1][:3])
+
+    def get(self, db: Database, check_name: str, sql: str, probe: str):
+        if self.refresh:
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT sql_hash, probe, digest, rows_blob FROM check_results "
+                "WHERE db_id = ? AND check_name = ?",
+                (self.db_id(db), check_name)).fetchone()
+        if not row or row[0] != self.sql_key(db, sql) or row[1] != probe:
+            return None
+        blob = zlib.decompress(row[3])
+        if hashlib.sha1(blob).hexdigest() != row[2]:
+            return None
+        return json.loads(blob)
+
+    def put(self, db: Database, check_name: str, sql: str, probe: str, rows: list):
+        blob = json.dumps(rows, ensure_ascii=False).encode("utf-8")
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO check_results VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (self.db_id(db), check_name, self.sql_key(db, sql), probe,
+                 hashlib.sha1(blob).hexdigest(), max(len(rows) - 1, 0),
+                 zlib.compress(blob), datetime.now().isoformat(timespec="seconds")))
+
+    def close(self):
+        self._conn.close()
+
+
+def _sha1(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+# =============================================================================
+# CHECK HISTORY  (adaptive timeouts and scheduling)
+# =============================================================================
+
+class CheckHistory:
+    """
+    Seconds each check spent in sqlplus per database in earlier runs, kept
+    in the cache file (the last CHECK_HISTORY_RUNS successful runs only).
+    Gives each check a timeout and an expected duration for scheduling.
+    With `fixed_timeout` every check gets that timeout instead.
+    """
+
+    def __init__(self, path: str, fixed_timeout: float = None):
+        self.fixed_timeout = fixed_timeout
+        self._lock  = threading.Lock()
+        self._conn  = sqlite3.connect(path, check_same_thread=False)
+        self._known = {}
+        with self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS check_history (
+                    db_id       TEXT NOT NULL,
+                    check_name  TEXT NOT NULL,
+                    seconds     REAL NOT NULL,
+                    recorded_at TEXT NOT NULL
+                )""")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS check_history_key "
+                               "ON check_history (db_id, check_name)")
+
+    def load(self, dbs: dict):
+        """Read the recorded durations for these databases."""
+        ids = {ResultCache.db_id(db): side for side, db in dbs.items()}
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT db_id, check_name, seconds FROM check_history "
+                "ORDER BY recorded_at").fetchall()
+        self._known = {}
+        for db_id, check_name, seconds in rows:
+            if db_id in ids:
+                self._known.setdefault((ids[db_id], check_name), []).append(seconds)
+
+    def expected(self, side: str, check_name: str):
+        """Median recorded seconds, or None for a check never seen."""
+        runs = sorted(self._known.get((side, check_name), ()))
+        return runs[len(runs) // 2] if runs else None
+
+    def timeout(self, side: str, check_name: str) -> float:
+        if self.fixed_timeout:
+            return self.fixed_timeout
+        runs = self._known.get((side, check_name))
+        if not runs:
+            return SQLPLUS_TIMEOUT
+        return min(TIMEOUT_MAX, max(TIMEOUT_MIN, TIMEOUT_FACTOR * max(runs)))
+
+    def record(self, db: Database, check_name: str, seconds: float):
+        db_id = ResultCache.db_id(db)
+        with self._lock, self._conn:
+            self._conn.execute("INSERT INTO check_history VALUES (?, ?, ?, ?)",
+                               (db_id, check_name, seconds,
+                                datetime.now().isoformat(timespec="microseconds")))
+            self._conn.execute("""
+                DELETE FROM check_history
+                WHERE  db_id = ? AND check_name = ? AND rowid NOT IN (
+                       SELECT rowid FROM check_history WHERE db_id = ? AND check_name = ?
+                       ORDER BY recorded_at DESC LIMIT ?)""",
+                (db_id, check_name, db_id, check_name, CHECK_HISTORY_RUNS))
+
+    def close(self):
+        self._conn.close()
+
+
+# =============================================================================
+# ROW-COUNT ENGINE
+# =============================================================================
+
+def _quote_ident(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _quote_literal(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+def build_row_count_sql(tables: list) -> str:
+    """
+    One COUNT(*) statement for a batch of (owner, table_name, blocks).
+    A lone table above ROWCOUNT_PARALLEL_BLOCKS gets a PARALLEL hint.
+    """
+    parts = []
+    for owner, table, blocks in tables:
+        hint = ""
+        if len(tables) == 1 and blocks >= ROWCOUNT_PARALLEL_BLOCKS:
+            hint = f"/*+ PARALLEL(t, {ROWCOUNT_PARALLEL_DEGREE}) */ "
+        parts.append(f"SELECT {hint}{_quote_literal(table)} AS table_name, COUNT(*) AS row_count "
+                     f"FROM {_quote_ident(owner)}.{_quote_ident(table)} t")
+    return "\nUNION ALL\n".join(parts) + ";"
+
+
+def plan_row_count_batches(tables: list) -> list:
+    """
+    Split (owner, table_name, blocks) into batches: large tables alone (so
+    they get a PARALLEL hint and their own session), the rest packed
+    ROWCOUNT_BATCH_SIZE at a time. Largest work is scheduled first.
+    """
+    big   = [[t] for t in tables if t[2] >= ROWCOUNT_PARALLEL_BLOCKS]
+    small = [t for t in tables if t[2] < ROWCOUNT_PARALLEL_BLOCKS]
+    batches = big + [small[i:i + ROWCOUNT_BATCH_SIZE]
+                     for i in range(0, len(small), ROWCOUNT_BATCH_SIZE)]
+    batches.sort(key=lambda b: -sum(t[2] for t in b))
+    return batches
+
+
+def _sqlplus_error(rows: list) -> str:
+    """
+    The first ORA-/SP2- line of a result set, or None. sqlplus prints the
+    failing statement and "ERROR at line n:" before it, and a fetch can
+    fail after some rows, so it is rarely row 0.
+    """
+    for row in rows:
+        if len(row) == 1 and row[0].startswith(("ORA-", "SP2-")):
+            return row[0]
+    return None
+
+
+def _is_error_rows(rows: list) -> bool:
+    return _sqlplus_error(rows) is not None
+
+
+def _count_batch(db: Database, batch: list) -> list:
+    """[[table_name, row_count], ...] for one batch; a failing batch is
+    retried table by table so one bad table cannot hide the others."""
+    rows, err = db.run(build_row_count_sql(batch))
+    err = err or _sqlplus_error(rows)
+    if not err:
+        return rows[1:]
+    if len(batch) == 1:
+        return [[batch[0][1], err]]
+    return [row for t in batch for row in _count_batch(db, [t])]
+
+
+def run_row_counts(db: Database, sql: str, consume=list) -> tuple:
+    """
+    Row-count engine. `sql` lists (owner, table_name, blocks); the tables
+    are counted in concurrent batches (see plan_row_count_batches) and
+    (TABLE_NAME, ROW_COUNT) rows are streamed to `consume` as each batch
+    finishes. Same contract as stream_sqlplus(): (consume(rows), error).
+    """
+    listing, err = db.run(sql)
+    err = err or _sqlplus_error(listing)
+    if err:
+        return consume(iter(())), err
+
+    tables = []
+    for row in listing[1:]:
+        if len(row) >= 3:
+            owner, table, blocks = row[:3]
+            tables.append((owner, table, int(blocks) if blocks.isdigit() else 0))
+
+    def rows():
+        yield ["TABLE_NAME", "ROW_COUNT"]
+        if not tables:
+            return
+        with ThreadPoolExecutor(max_workers=db.max_jobs,
+                                thread_name_prefix=f"mv-{db.side}-count") as pool:
+            futures = [pool.submit(_count_batch, db, batch)
+                       for batch in plan_row_count_batches(tables)]
+            try:
+                for fut in as_completed(futures):
+                    yield from fut.result()
+            finally:
+                for fut in futures:
+                    fut.cancel()
+
+    try:
+        return consume(rows()), None
+    except Exception as e:
+        return consume(iter(())), str(e)
+
+
+CHECK_ENGINES = {
+    "row_counts": run_row_counts,
+}
+
+
+# =============================================================================
+# CHECKSUM ENGINE  (Level 3)
+# =============================================================================
+# Each row is reduced server-side to
+#   rh = SUM over columns of ORA_HASH(col, 4294967295, column#)
+#   kh = the same over the primary-key columns (rh when there is no PK)
+# and rows are grouped into ORA_HASH(kh, CHECKSUM_BUCKETS-1, level) buckets
+# carrying COUNT(*) and SUM(rh). Only bucket digests cross the wire; a bucket
+# that differs is split again one level deeper until it is small enough to
+# fetch (pk_value, rh) per row and name the differing rows.
+#
+# pk_value is the PK columns rendered with explicit formats (TM9 numbers,
+# full-precision dates/timestamps, UTC for zoned timestamps), never through
+# NUMWIDTH or NLS defaults, so distinct keys stay distinct. Tables without a
+# PK are keyed by row hash plus an occurrence number, so duplicate rows are
+# counted rather than merged.
+# Limit: ORA_HASH hashes the stored bytes, so character columns only agree
+# when both databases use the same character set (AL32UTF8 on RDS). Across a
+# charset conversion every non-ASCII value shows up as a difference.
+
+_HASH_MAX   = 4294967295
+_HASH_NULL  = 4294967296           # outside ORA_HASH's range, stands for NULL
+_SCALAR_TYPES = ("VARCHAR2", "NVARCHAR2", "CHAR", "NCHAR", "NUMBER", "FLOAT",
+                 "BINARY_FLOAT", "BINARY_DOUBLE", "DATE", "RAW")
+_LOB_TYPES    = ("CLOB", "NCLOB", "BLOB")
+
+
+def _column_hash_expr(column: str, data_type: str, seed: int):
+    """ORA_HASH term for one column, or None for types that cannot be hashed
+    (LONG, BFILE, object types). LOBs contribute their length only."""
+    col = _quote_ident(column)
+    if data_type in _LOB_TYPES:
+        col = f"DBMS_LOB.GETLENGTH({col})"
+    elif not (data_type in _SCALAR_TYPES or data_type.startswith(("TIMESTAMP", "INTERVAL"))):
+        return None
+    return f"NVL(ORA_HASH({col}, {_HASH_MAX}, {seed}), {_HASH_NULL})"
+
+
+def _column_text_expr(column: str, data_type: str) -> str:
+    """Exact, NLS-independent text for one PK column."""
+    col = _quote_ident(column)
+    if data_type in ("NUMBER", "FLOAT", "BINARY_FLOAT", "BINARY_DOUBLE"):
+        return f"TO_CHAR({col}, 'TM9')"
+    if data_type == "DATE":
+        return f"TO_CHAR({col}, 'YYYY-MM-DD HH24:MI:SS')"
+    if data_type.startswith("TIMESTAMP") and "TIME ZONE" in data_type:
+        return f"TO_CHAR(SYS_EXTRACT_UTC({col}), 'YYYY-MM-DD HH24:MI:SS.FF9')"
+    if data_type.startswith("TIMESTAMP"):
+        return f"TO_CHAR({col}, 'YYYY-MM-DD HH24:MI:SS.FF9')"
+    if data_type == "RAW":
+        return f"RAWTOHEX({col})"
+    if data_type.startswith("INTERVAL"):
+        return f"TO_CHAR({col})"
+    return col
+
+
+class ChecksumTable:
+    """Hash expressions for one table, built from the engine's column listing."""
+
+    def __init__(self, owner: str, table: str, columns: list):
+        # columns: [(column_name, data_type, pk_position), ...] in column_id order
+        self.owner = owner
+        self.table = table
+        terms = [_column_hash_expr(c, t, i) for i, (c, t, _) in enumerate(columns, 1)]
+        # One term per line: sqlplus rejects input lines over 2499 characters
+        self.row_hash = "\n  + ".join(t for t in terms if t) or "0"
+        pk = sorted((pos, c, t) for c, t, pos in columns if pos > 0)
+        pk_terms = [_column_hash_expr(c, t, pos) for pos, c, t in pk]
+        self.has_pk = bool(pk) and all(pk_terms)
+        if self.has_pk:
+            self.key_hash = "\n  + ".join(pk_terms)
+            self.pk_value = "\n  || ',' || ".join(_column_text_expr(c, t) for _, c, t in pk)
+        else:
+            self.key_hash = self.row_hash
+            self.pk_value = "NULL"
+
+    def _source(self, path: tuple) -> str:
+        where = " AND ".join(f"ORA_HASH(kh, {CHECKSUM_BUCKETS - 1}, {lvl}) = {b}"
+                             for lvl, b in enumerate(path))
+        return (f"(SELECT {self.pk_value} AS pk_value,\n  {self.key_hash} AS kh,\n  "
+                f"{self.row_hash} AS rh\nFROM {_quote_ident(self.owner)}.{_quote_ident(self.table)})"
+                + (f"\nWHERE {where}" if where else ""))
+
+    def bucket_sql(self, path: tuple) -> str:
+        """Bucket digests one level below `path` (a tuple of bucket numbers)."""
+        b = f"ORA_HASH(kh, {CHECKSUM_BUCKETS - 1}, {len(path)})"
+        return (f"SELECT TO_CHAR({b}) AS bucket, TO_CHAR(COUNT(*)) AS row_count, "
+                f"TO_CHAR(SUM(rh)) AS checksum\nFROM {self._source(path)}\nGROUP BY {b};")
+
+    def rows_sql(self, path: tuple) -> str:
+        """Per-row (pk_value, row hash) inside the bucket at `path`."""
+        if self.has_pk:
+            key = "pk_value"
+        else:   # n-th copy of identical rows: ROWHASH:<rh>#<n>
+            key = "'ROWHASH:' || TO_CHAR(rh) || '#' || TO_CHAR(ROW_NUMBER() OVER (PARTITION BY rh ORDER BY rh))"
+        return f"SELECT {key} AS pk_value, TO_CHAR(rh) AS row_hash\nFROM {self._source(path)};"
+
+
+def _query_pairs(db: Database, sql: str) -> tuple:
+    """Run a 2+ column query and return ({first col: rest of row}, error)."""
+    rows, err = db.run(sql)
+    err = err or _sqlplus_error(rows)
+    if err:
+        return {}, err
+    return {row[0]: row[1:] for row in rows[1:] if len(row) >= 2}, None
+
+
+def _checksum_table(dbs: dict, tbl: ChecksumTable) -> tuple:
+    """
+    Drill one table down to its differing rows.
+    Returns ({side: [[table, pk_value, row_count, checksum], ...]}, error).
+    """
+    out   = {"source": [], "target": []}
+    work  = [()]                       # bucket paths still to split
+    drilled = 0
+    while work:
+        path = work.pop(0)
+        digests = {}
+        for side in ("source", "target"):
+            digests[side], err = _query_pairs(dbs[side], tbl.bucket_sql(path))
+            if err:
+                return out, f"{tbl.table}: {err}"
+
+        if not path:                   # whole-table summary row
+            for side, buckets in digests.items():
+                count = sum(int(v[0]) for v in buckets.values())
+                total = sum(int(v[1] or 0) for v in buckets.values())
+                out[side].append([tbl.table, "*", str(count), str(total)])
+
+        for bucket in sorted(set(digests["source"]) | set(digests["target"]), key=int):
+            src, tgt = digests["source"].get(bucket), digests["target"].get(bucket)
+            if src == tgt:
+                continue
+            sub  = path + (int(bucket),)
+            size = max(int(src[0]) if src else 0, int(tgt[0]) if tgt else 0)
+            if size <= CHECKSUM_LEAF_ROWS or len(sub) >= CHECKSUM_MAX_LEVELS:
+                if drilled < CHECKSUM_MAX_DRILL:
+                    drilled += 1
+                    err = _diff_leaf(dbs, tbl, sub, out)
+                    if err:
+                        return out, err
+                    continue
+            elif drilled < CHECKSUM_MAX_DRILL:
+                drilled += 1
+                work.append(sub)
+                continue
+            # Drill budget used up: report the bucket itself
+            label = "BUCKET " + "/".join(str(b) for b in sub)
+            for side, digest in (("source", src), ("target", tgt)):
+                if digest:
+                    out[side].append([tbl.table, label] + list(digest))
+    return out, None
+
+
+def _diff_leaf(dbs: dict, tbl: ChecksumTable, path: tuple, out: dict):
+    hashes = {}
+    for side in ("source", "target"):
+        hashes[side], err = _query_pairs(dbs[side], tbl.rows_sql(path))
+        if err:
+            return f"{tbl.table}: {err}"
+    for side, other in (("source", "target"), ("target", "source")):
+        for pk, (row_hash,) in hashes[side].items():
+            if hashes[other].get(pk) != [row_hash]:
+                out[side].append([tbl.table, pk, "1", row_hash])
+    return None
+
+
+def run_checksums(dbs: dict, sql: str, consume=list) -> tuple:
+    """
+    Level 3 checksum engine. `sql` lists (owner, table, column, type,
+    pk_position) and runs on both databases; tables present on both sides
+    are hashed over their common columns, concurrently per table. Returns
+    ((consume(source rows), error), (consume(target rows), error)), rows
+    being (TABLE_NAME, PK_VALUE, ROW_COUNT, CHECKSUM): one "*" summary row
+    per table plus one row per differing row or undrilled bucket.
+    """
+    header  = ["TABLE_NAME", "PK_VALUE", "ROW_COUNT", "CHECKSUM"]
+    columns = {}
+    for side in ("source", "target"):
+        rows, err = dbs[side].run(sql)
+        err = err or _sqlplus_error(rows)
+        if err:
+            failed, other = (consume(iter(())), err), (consume(iter(())), None)
+            return (failed, other) if side == "source" else (other, failed)
+        listing = {}
+        for row in rows[1:]:
+            if len(row) >= 5:
+                owner, table, column, data_type, pk_pos = row[:5]
+                listing.setdefault((owner, table), []).append(
+                    (column, data_type, int(pk_pos) if pk_pos.isdigit() else 0))
+        columns[side] = listing
+
+    tables = []
+    for (owner, table), src_cols in columns["source"].items():
+        tgt_cols = {c: t for c, t, _ in columns["target"].get((owner, table), [])}
+        common = [col for col in src_cols if tgt_cols.get(col[0]) == col[1]]
+        if common:
+            tables.append(ChecksumTable(owner, table, common))
+
+    results = {"source": [header], "target": [header]}
+    errors  = []
+    workers = min(dbs["source"].max_jobs, dbs["target"].max_jobs)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mv-checksum") as pool:
+        futures = [(t, pool.submit(_checksum_table, dbs, t)) for t in tables]
+        for tbl, fut in futures:
+            try:
+                out, err = fut.result()
+            except Exception as e:       # one bad table must not abort the run
+                out, err = {"source": [], "target": []}, f"{tbl.table}: {e}"
+            if err:
+                errors.append(err)
+            for side in results:
+                results[side].extend(out[side])
+
+    err = "; ".join(errors) or None
+    return ((consume(iter(results["source"])), err),
+            (consume(iter(results["target"])), err))
+
+
+PAIRED_ENGINES = {
+    "checksums": run_checksums,
+}
+
+
+# =============================================================================
+# RESULT SNAPSHOTS
+# =============================================================================
+#
+# One file per check and side, "<check>.<side>.mvs":
+#
+#   magic  b"MVSNAP01"
+#   record struct "<cI" (tag, n) followed by a payload, where tag is
+#     b"S"  n bytes of UTF-8: the next string of the file's string table
+#     b"R"  n little-endian uint32 string ids: one row (the first is the header)
+#
+# Strings are defined inline the first time they are used, so files are
+# written and read in one pass. manifest.json describes the run and every
+# check (level, keys, SQL hash, per-side file / data rows / error).
+
+SNAPSHOT_MAGIC = b"MVSNAP01"
+_SNAP_RECORD   = struct.Struct("<cI")
+_SNAP_IDS      = "I" if array("I").itemsize == 4 else "L"
+
+
+class SnapshotFile:
+    """Writer for one .mvs file."""
+
+    def __init__(self, path: str):
+        self.path  = path
+        self.rows  = 0
+        self._fh   = open(path, "wb")
+        self._ids  = {}
+        self._next = 0
+        self._fh.write(SNAPSHOT_MAGIC)
+
+    def write_row(self, row: list):
+        ids, out, refs = self._ids, [], array(_SNAP_IDS)
+        for value in row:
+            i = ids.get(value)
+            if i is None:
+                i, self._next = self._next, self._next + 1
+                data = value.encode("utf-8")
+                out.append(_SNAP_RECORD.pack(b"S", len(data)))
+                out.append(data)
+                if len(ids) < SNAPSHOT_DICT_MAX:
+                    ids[value] = i
+            refs.append(i)
+        if sys.byteorder == "big":
+            refs.byteswap()
+        out.append(_SNAP_RECORD.pack(b"R", len(refs)))
+        out.append(refs.tobytes())
+        self._fh.write(b"".join(out))
+        self.rows += 1
+
+    def close(self):
+        self._fh.close()
+
+
+def read_snapshot(path: str):
+    """Yield the rows of a .mvs file (header first), as lists of str."""
+    with open(path, "rb") as fh:
+        if fh.read(len(SNAPSHOT_MAGIC)) != SNAPSHOT_MAGIC:
+            raise ValueError(f"{path}: not a validation snapshot")
+        strings = []
+        size    = _SNAP_RECORD.size
+        while True:
+            head = fh.read(size)
+            if len(head) < size:
+                return
+            tag, n = _SNAP_RECORD.unpack(head)
+            if tag == b"S":
+                strings.append(fh.read(n).decode("utf-8"))
+            elif tag == b"R":
+                refs = array(_SNAP_IDS)
+                refs.frombytes(fh.read(n * refs.itemsize))
+                if sys.byteorder == "big":
+                    refs.byteswap()
+                yield [strings[i] for i in refs]
+            else:
+                raise ValueError(f"{path}: corrupt record tag {tag!r}")
+
+
+class SnapshotWriter:
+    """
+    The snapshot directory of one run. Worker threads stream rows through
+    wrap(); the main thread adds each finished check with record() and
+    writes manifest.json with finish().
+    """
+
+    def __init__(self, directory: str, meta: dict = None):
+        self.directory = directory
+        self.meta      = dict(meta or {})
+        self.checks    = {}
+        self._files    = {}
+        self._lock     = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def wrap(self, check_name: str, side: str, rows):
+        """Pass rows through while writing them to <check>.<side>.mvs."""
+        name = f"{check_name}.{side}.mvs"
+        snap = SnapshotFile(os.path.join(self.directory, name))
+        try:
+            for row in rows:
+                snap.write_row(row)
+                yield row
+        finally:
+            snap.close()
+            with self._lock:
+                self._files[(check_name, side)] = {"file": name, "rows": max(snap.rows - 1, 0)}
+
+    def record(self, check_name: str, qry: dict, src: dict, tgt: dict):
+        entry = {k: qry.get(k) for k in ("level", "desc", "schema", "check", "keys", "engine")}
+        entry["sql_sha1"] = _sha1(qry["sql"])
+        with self._lock:
+            for side, res in (("source", src), ("target", tgt)):
+                entry[side] = dict(self._files.get((check_name, side), {"file": None, "rows": 0}),
+                                   error=res["error"], cached=res["cached"])
+        self.checks[check_name] = entry
+
+    def finish(self):
+        manifest = dict(self.meta, format=SNAPSHOT_MAGIC.decode(), checks=self.checks)
+        tmp = os.path.join(self.directory, "manifest.json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=1, ensure_ascii=False)
+        os.replace(tmp, os.path.join(self.directory, "manifest.json"))
 
 
 # =============================================================================
@@ -681,71 +2294,511 @@ def rows_to_dict_list(rows: list) -> tuple:
     return headers, data
 
 
-def compare_results(src_rows: list, tgt_rows: list) -> dict:
+class ResultSide:
     """
-    Returns comparison dict:
-      match, src_count, tgt_count, only_in_src, only_in_tgt, headers
+    One side's result set, built incrementally from a row stream (see
+    iter_sqlplus_rows).
+
+    Each row is reduced to a fixed-size digest of its (column, value) pairs
+    and filed into one of COMPARE_PARTITIONS hash partitions. Once more than
+    COMPARE_MEM_ROWS distinct rows are held, the partitions are spilled to
+    temp files, so memory stays bounded whatever the result size. Only the
+    first REPORT_MAX_ROWS rows are kept as dicts for the report.
     """
-    src_hdr, src_data = rows_to_dict_list(src_rows)
-    tgt_hdr, tgt_data = rows_to_dict_list(tgt_rows)
-
-    headers = src_hdr or tgt_hdr
 
-    # Convert each row dict to a frozenset of items for set comparison
-    def to_set(data):
-        return set(frozenset(sorted(d.items())) for d in data)
+    def __init__(self):
+        self.headers   = []
+        self.sample    = []        # first REPORT_MAX_ROWS row dicts
+        self.count     = 0
+        self._proto    = None      # blake2b pre-seeded with the column names
+        self._order    = []        # column positions sorted by column name
+        self._parts    = [dict() for _ in range(COMPARE_PARTITIONS)]
+        self._in_mem   = 0
+        self._spill_dir = None
+
+    @classmethod
+    def from_rows(cls, rows) -> "ResultSide":
+        side = cls()
+        side.feed(rows)
+        return side
+
+    def feed(self, rows):
+        rows = iter(rows)
+        for header in rows:
+            self._set_headers(header)
+            break
+        width   = len(self.headers)
+        order   = self._order
+        parts   = self._parts
+        nparts  = COMPARE_PARTITIONS
+        sample  = self.sample
+        new_digest = self._proto.copy if self._proto else None
+        for row in rows:
+            # Pad short rows
+            if len(row) != width:
+                row = (row + [""] * (width - len(row))) if len(row) < width else row[:width]
+            self.count += 1
+            if len(sample) < REPORT_MAX_ROWS:
+                sample.append(dict(zip(self.headers, row)))
+            h = new_digest()
+            h.update("\x1f".join([row[i] for i in order]).encode("utf-8", "surrogateescape"))
+            digest = h.digest()
+            part = parts[digest[0] % nparts]
+            if digest not in part:
+                part[digest] = row
+                self._in_mem += 1
+                if self._in_mem >= COMPARE_MEM_ROWS:
+                    self._spill()
+
+    def _set_headers(self, header: list):
+        # Digest columns in name order so a different column order on the
+        # other side still compares equal, as the old dict comparison did.
+        self.headers = header
+        self._order  = sorted(range(len(header)), key=lambda i: header[i])
+        self._proto  = hashlib.blake2b(digest_size=16)
+        self._proto.update("\x1e".join(header[i] for i in self._order).encode("utf-8"))
+
+    def _spill(self):
+        if self._spill_dir is None:
+            self._spill_dir = tempfile.mkdtemp(prefix="mv_cmp_")
+        for i, part in enumerate(self._parts):
+            if not part:
+                continue
+            with open(os.path.join(self._spill_dir, f"p{i:03d}.jsonl"), "a", encoding="utf-8") as f:
+                for digest, row in part.items():
+                    f.write(f"{digest.hex()}\t{json.dumps(row, ensure_ascii=False)}\n")
+            part.clear()
+        self._in_mem = 0
+
+    def partition(self, i: int) -> dict:
+        """
+        digest -> row for partition i, merging anything spilled to disk.
+        Spilled rows stay as their encoded line until row_of() is called,
+        so only rows that turn out to differ are ever decoded.
+        """
+        part = self._parts[i]
+        if self._spill_dir is not None:
+            path = os.path.join(self._spill_dir, f"p{i:03d}.jsonl")
+            if os.path.exists(path):
+                part = dict(part)
+                with open(path, encoding="utf-8") as f:
+                    for line in f:
+                        part.setdefault(bytes.fromhex(line[:32]), line)
+        return part
+
+    @staticmethod
+    def row_of(value) -> list:
+        return json.loads(value[33:]) if isinstance(value, str) else value
+
+    def close(self):
+        """Drop the in-memory partitions and any spill files."""
+        self._parts = [dict() for _ in range(COMPARE_PARTITIONS)]
+        self._in_mem = 0
+        if self._spill_dir is not None:
+            shutil.rmtree(self._spill_dir, ignore_errors=True)
+            self._spill_dir = None
+
+
+def compare_results(src_rows, tgt_rows, keys: list = None) -> dict:
+    """
+    Returns comparison dict:
+      match, src_count, tgt_count, only_in_src, only_in_tgt, changed,
+      key_cols, headers, src_data/tgt_data (first REPORT_MAX_ROWS rows of each side)
+    Each side may be a row list ([[header...],[row...]]), any row iterator,
+    or an already-built ResultSide. Rows are compared as sets of digests one
+    hash partition at a time; only differing rows are turned back into dicts.
+    With `keys`, differing rows are then paired up by key (see match_by_key).
+    """
+    src = src_rows if isinstance(src_rows, ResultSide) else ResultSide.from_rows(src_rows)
+    tgt = tgt_rows if isinstance(tgt_rows, ResultSide) else ResultSide.from_rows(tgt_rows)
 
-    src_set = to_set(src_data)
-    tgt_set = to_set(tgt_data)
+    headers = src.headers or tgt.headers
 
-    only_src = [dict(fs) for fs in (src_set - tgt_set)]
-    only_tgt = [dict(fs) for fs in (tgt_set - src_set)]
+    only_src, only_tgt = [], []
+    try:
+        for i in range(COMPARE_PARTITIONS):
+            src_part = src.partition(i)
+            tgt_part = tgt.partition(i)
+            only_src.extend(dict(zip(src.headers, ResultSide.row_of(row)))
+                            for digest, row in src_part.items() if digest not in tgt_part)
+            only_tgt.extend(dict(zip(tgt.headers, ResultSide.row_of(row)))
+                            for digest, row in tgt_part.items() if digest not in src_part)
+    finally:
+        src.close()
+        tgt.close()
+
+    key_cols = resolve_key_columns(keys, src.headers, tgt.headers)
+    changed  = []
+    if key_cols and only_src and only_tgt:
+        only_src, only_tgt, changed = match_by_key(key_cols, headers, only_src, only_tgt)
 
     return {
-        "match":       len(only_src) == 0 and len(only_tgt) == 0,
-        "src_count":   len(src_data),
-        "tgt_count":   len(tgt_data),
+        "match":       not (only_src or only_tgt or changed),
+        "src_count":   src.count,
+        "tgt_count":   tgt.count,
         "only_in_src": only_src,
         "only_in_tgt": only_tgt,
+        "changed":     changed,
+        "key_cols":    key_cols,
         "headers":     headers,
-        "src_data":    src_data,
-        "tgt_data":    tgt_data,
+        "src_data":    src.sample,
+        "tgt_data":    tgt.sample,
     }
 
 
+def resolve_key_columns(keys: list, src_headers: list, tgt_headers: list) -> list:
+    """
+    Map a check's declared key columns onto the actual (upper-case) sqlplus
+    headings. Returns [] unless every key column is present on both sides.
+    """
+    if not keys:
+        return []
+    src_by_name = {h.upper(): h for h in src_headers}
+    tgt_by_name = {h.upper(): h for h in tgt_headers}
+    cols = []
+    for k in keys:
+        col = src_by_name.get(k.upper())
+        if col is None or tgt_by_name.get(k.upper()) != col:
+            return []
+        cols.append(col)
+    return cols
+
+
+def match_by_key(key_cols: list, headers: list, only_src: list, only_tgt: list) -> tuple:
+    """
+    One-pass join of the differing rows on their key columns.
+    Returns (only_src, only_tgt, changed) where each changed entry is
+      {"key": {col: value, ...}, "cells": [(column, src_value, tgt_value), ...]}
+    holding just the cells that differ.
+    """
+    tgt_index = {}
+    for row in only_tgt:
+        tgt_index.setdefault(tuple(row.get(c, "") for c in key_cols), []).append(row)
+
+    columns = list(headers) + [c for row in only_tgt[:1] for c in row if c not in headers]
+    changed, unmatched_src = [], []
+    for src_row in only_src:
+        key = tuple(src_row.get(c, "") for c in key_cols)
+        candidates = tgt_index.get(key)
+        if not candidates:
+            unmatched_src.append(src_row)
+            continue
+        tgt_row = candidates.pop()
+        changed.append({
+            "key":   dict(zip(key_cols, key)),
+            "cells": [(c, src_row.get(c, ""), tgt_row.get(c, ""))
+                      for c in columns if src_row.get(c, "") != tgt_row.get(c, "")],
+        })
+
+    unmatched_tgt = [row for rows in tgt_index.values() for row in rows]
+    return unmatched_src, unmatched_tgt, changed
+
+
+def changed_cells_as_rows(cmp: dict, limit: int = None):
+    """Flatten cmp["changed"] into one dict per changed cell (key cols + Column/Source/Target)."""
+    n = 0
+    for change in cmp.get("changed", []):
+        for col, src_val, tgt_val in change["cells"]:
+            if limit is not None and n >= limit:
+                return
+            n += 1
+            yield dict(change["key"], Column=col, Source=src_val, Target=tgt_val)
+
+
 # =============================================================================
 # HTML REPORT GENERATOR  (pure stdlib — no jinja2)
 # =============================================================================
 
-def dict_list_to_html_table(headers: list, data: list, max_rows: int = 200) -> str:
+def dict_list_to_html_table(headers: list, data: list, max_rows: int = REPORT_MAX_ROWS,
+                            total: int = None, more: str = None) -> str:
+    """
+    `total` is the full row count when `data` is already only a sample;
+    `more` replaces the "see CSV" note shown under a truncated table.
+    """
     if not data:
         return "<span class='ok-text'>✅ No rows returned</span>"
 
+    total   = len(data) if total is None else total
     display = data[:max_rows]
     th_html = "".join(f"<th>{escape(str(h))}</th>" for h in headers)
-    rows_html = ""
-    for row in display:
-        cells = "".join(f"<td>{escape(str(row.get(h, '')))}</td>" for h in headers)
-        rows_html += f"<tr>{cells}</tr>"
+    rows_html = "".join(
+        "<tr>" + "".join(f"<td>{escape(str(row.get(h, '')))}</td>" for h in headers) + "</tr>"
+        for row in display)
 
     extra = ""
-    if len(data) > max_rows:
-        extra = (f"<p class='truncated'>Showing {max_rows} of {len(data)} rows. "
-                 f"See CSV report for full data.</p>")
+    if total > len(display):
+        extra = (f"<p class='truncated'>Showing {len(display)} of {total} rows. "
+                 f"{more or 'See CSV report for full data.'}</p>")
 
     return f"<div class='tbl-wrap'><table class='dt'><thead><tr>{th_html}</tr></thead><tbody>{rows_html}</tbody></table>{extra}</div>"
 
 
-def generate_html_report(all_results: dict) -> str:
-    passed = sum(1 for r in all_results.values() if r["cmp"]["match"])
-    failed = sum(1 for r in all_results.values() if not r["cmp"]["match"] and not r.get("error"))
-    errors = sum(1 for r in all_results.values() if r.get("error"))
-    total  = len(all_results)
-    pct    = round((passed / total) * 100, 1) if total else 0
+class DiffChunkWriter:
+    """
+    Full diff tables as sidecar files in `directory` (next to the report),
+    REPORT_CHUNK_ROWS rows each. Chunks are JSONP-style scripts calling
+    mvChunk({...}) rather than .json files, because browsers refuse fetch()
+    and XHR on file:// pages but still load <script src>.
+    """
 
-    # Build table rows
-    body_rows = ""
-    for name, res in all_results.items():
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.prefix    = os.path.basename(directory)
+        self.chunk     = max(REPORT_MAX_ROWS, REPORT_CHUNK_ROWS // REPORT_MAX_ROWS * REPORT_MAX_ROWS)
+        self._n        = 0
+
+    def write(self, headers: list, rows) -> dict:
+        """Write dict rows as chunks; returns the viewer's attributes."""
+        self._n += 1
+        diff_id = f"d{self._n}"
+        os.makedirs(self.directory, exist_ok=True)
+        total, page, buf = 0, 0, []
+        for row in rows:
+            buf.append([row.get(h, "") for h in headers])
+            total += 1
+            if len(buf) == self.chunk:
+                self._write_chunk(diff_id, page, buf)
+                page, buf = page + 1, []
+        if buf:
+            self._write_chunk(diff_id, page, buf)
+            page += 1
+        return {"id": diff_id, "src": f"{self.prefix}/{diff_id}", "pages": page,
+                "total": total, "chunk": self.chunk, "view": REPORT_MAX_ROWS,
+                "cols": json.dumps([str(h) for h in headers], ensure_ascii=False)}
+
+    def _write_chunk(self, diff_id: str, page: int, rows: list):
+        path = os.path.join(self.directory, f"{diff_id}_{page}.js")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("mvChunk(")
+            json.dump({"id": diff_id, "page": page, "rows": rows}, f,
+                      ensure_ascii=False, separators=(",", ":"))
+            f.write(");\n")
+
+
+def diff_viewer_html(attrs: dict) -> str:
+    """Collapsed pager over a DiffChunkWriter.write() result."""
+    data = " ".join(f"data-{k}='{escape(str(v))}'" for k, v in attrs.items())
+    return (f"<div class='pager' {data}>"
+            f"<button onclick='mvOpen(this)'>📄 Browse all {attrs['total']} rows</button>"
+            f"<div class='pg-ctl'><button onclick='mvPage(this,-1)'>◀</button> "
+            f"<span class='pg-info'></span> <button onclick='mvPage(this,1)'>▶</button> "
+            f"<input type='search' placeholder='Filter rows…' oninput='mvFilter(this)'></div>"
+            f"<div class='pg-body tbl-wrap'></div></div>")
+
+
+_REPORT_JS = """
+var MV = {rows: {}, wait: {}};
+function mvChunk(c) {
+  var k = c.id + ":" + c.page, cbs = MV.wait[k] || [];
+  MV.rows[k] = c.rows; delete MV.wait[k];
+  cbs.forEach(function (f) { f(c.rows); });
+}
+function mvLoad(el, page, cb) {
+  var k = el.dataset.id + ":" + page;
+  if (MV.rows[k]) return cb(MV.rows[k]);
+  if (MV.wait[k]) return MV.wait[k].push(cb);
+  MV.wait[k] = [cb];
+  var s = document.createElement("script");
+  s.charset = "utf-8";
+  s.src = el.dataset.src + "_" + page + ".js";
+  s.onerror = function () { el.querySelector(".pg-info").textContent = "Cannot load " + s.src; };
+  document.head.appendChild(s);
+}
+function mvAll(el, cb) {
+  var n = +el.dataset.pages, out = [], i = 0;
+  (function next() {
+    if (i >= n) return cb(out);
+    mvLoad(el, i, function (rows) { out = out.concat(rows); i++; next(); });
+  })();
+}
+function mvEsc(v) {
+  return String(v).replace(/[&<>"']/g, function (c) { return "&#" + c.charCodeAt(0) + ";"; });
+}
+function mvShow(el, page) {
+  var V = +el.dataset.view, C = +el.dataset.chunk, o = page * V;
+  var cols = JSON.parse(el.dataset.cols), q = el.querySelector("input").value.toLowerCase();
+  function draw(rows, total) {
+    var pages = Math.max(1, Math.ceil(total / V)), h = "";
+    rows.forEach(function (r) { h += "<tr><td>" + r.map(mvEsc).join("</td><td>") + "</td></tr>"; });
+    el.querySelector(".pg-body").innerHTML = "<table class='dt'><thead><tr><th>" +
+      cols.map(mvEsc).join("</th><th>") + "</th></tr></thead><tbody>" + h + "</tbody></table>";
+    el.querySelector(".pg-info").textContent = "Page " + (page + 1) + " of " + pages + " (" + total + " rows)";
+    el.dataset.page = page; el.dataset.last = pages - 1;
+  }
+  if (!q) return mvLoad(el, Math.floor(o / C), function (rows) {
+    draw(rows.slice(o % C, o % C + V), +el.dataset.total);
+  });
+  el.querySelector(".pg-info").textContent = "Filtering…";
+  mvAll(el, function (all) {
+    var hits = all.filter(function (r) { return r.join("\\u0001").toLowerCase().indexOf(q) >= 0; });
+    draw(hits.slice(o, o + V), hits.length);
+  });
+}
+function mvOpen(btn) {
+  var el = btn.parentNode; btn.style.display = "none";
+  el.querySelector(".pg-ctl").style.display = "block"; mvShow(el, 0);
+}
+function mvPage(btn, step) {
+  var el = btn.parentNode.parentNode, p = +el.dataset.page + step;
+  if (p >= 0 && p <= +el.dataset.last) mvShow(el, p);
+}
+function mvFilter(inp) {
+  var el = inp.parentNode.parentNode;
+  clearTimeout(el.mvTimer); el.mvTimer = setTimeout(function () { mvShow(el, 0); }, 300);
+}
+"""
+
+
+_REPORT_CSS = """
+*{box-sizing:border-box;margin:0;padding:0}
+body{font-family:'Segoe UI',Arial,sans-serif;background:#f0f2f5;color:#222;font-size:14px;
+      display:flex;flex-direction:column}
+.hdr{background:linear-gradient(135deg,#0d1b6e,#1a3a8f);color:#fff;padding:28px 40px}
+.hdr h1{font-size:1.6rem;margin-bottom:6px}
+.hdr .meta{opacity:.75;font-size:.9rem;line-height:1.8}
+.summary,.running{order:1}.content{order:2}.footer{order:3}
+.running{padding:14px 40px;background:#fff8e1;color:#8d6e00;border-bottom:1px solid #dde1e7}
+.summary{display:flex;flex-wrap:wrap;gap:16px;padding:20px 40px;background:#fff;
+          border-bottom:1px solid #dde1e7}
+.card{background:#f8f9fc;border-radius:8px;padding:14px 22px;min-width:130px;
+       text-align:center;border-top:4px solid #ccc}
+.card.c-ok{border-color:#2e7d32}.card.c-fail{border-color:#c62828}
+.card.c-err{border-color:#e65100}.card.c-all{border-color:#1565c0}
+.card .n{font-size:2rem;font-weight:700;line-height:1.1}
+.card .l{font-size:.7rem;text-transform:uppercase;letter-spacing:.8px;color:#666;margin-top:4px}
+.prog-wrap{flex:1;min-width:200px;padding:14px 22px;background:#f8f9fc;
+            border-radius:8px;border-top:4px solid currentColor}
+.prog-wrap .n{font-size:2rem;font-weight:700}
+.prog{height:8px;background:#e0e0e0;border-radius:4px;overflow:hidden;margin-top:8px}
+.prog-bar{height:100%;border-radius:4px;background:currentColor}
+.content{padding:24px 40px}
+.main-tbl{width:100%;border-collapse:collapse;background:#fff;border-radius:8px;
+           overflow:hidden;box-shadow:0 1px 4px rgba(0,0,0,.1)}
+.main-tbl th{background:#1a3a8f;color:#fff;padding:11px 14px;text-align:left;
+              font-size:.8rem;text-transform:uppercase;letter-spacing:.5px}
+.main-tbl td{padding:10px 14px;border-bottom:1px solid #eef0f4;vertical-align:top}
+.schema-hdr td{background:#e8eaf6;color:#1a3a8f;font-weight:700;letter-spacing:.5px}
+.row-ok{background:#fafffe}.row-fail{background:#fff9f9}.row-err{background:#fffaf5}
+.badge{display:inline-block;padding:3px 10px;border-radius:10px;font-size:.78rem;font-weight:700}
+.badge.ok{background:#e8f5e9;color:#2e7d32}.badge.fail{background:#ffebee;color:#c62828}
+.badge.err{background:#fff3e0;color:#e65100}
+.lvl{display:inline-block;padding:2px 7px;border-radius:4px;font-size:.72rem;font-weight:700}
+.l1{background:#e3f2fd;color:#1565c0}.l2{background:#f3e5f5;color:#6a1b9a}
+.l3{background:#e8f5e9;color:#2e7d32}
+.num{text-align:right;font-family:monospace;font-size:.85rem}
+.desc{color:#666;font-size:.8rem}
+details summary{cursor:pointer;color:#1565c0;font-size:.82rem;padding:4px 0}
+details summary:hover{text-decoration:underline}
+.det{background:#f5f7fa;padding:12px;border-radius:6px;margin-top:8px;overflow:auto}
+.det b{display:block;margin:8px 0 4px;font-size:.82rem;color:#333}
+.tbl-wrap{overflow-x:auto;margin-bottom:8px}
+table.dt{border-collapse:collapse;font-size:.78rem;min-width:400px}
+table.dt th{background:#455a64;color:#fff;padding:5px 10px;white-space:nowrap}
+table.dt td{padding:3px 10px;border-bottom:1px solid #e8eaf0;white-space:nowrap}
+table.dt tr:hover td{background:#f0f4ff}
+.ok-text{color:#2e7d32;font-style:italic;font-size:.82rem}
+.truncated{color:#888;font-size:.78rem;font-style:italic;margin-top:4px}
+.diff-hdr{font-weight:bold;color:#c62828;margin:10px 0 4px;font-size:.82rem}
+.err-msg{color:#c62828;font-size:.82rem;margin-bottom:8px}
+.footer{text-align:center;padding:20px;color:#aaa;font-size:.78rem}
+.pager{margin:4px 0 10px}.pager button{font-size:.78rem;padding:2px 8px;cursor:pointer}
+.pg-ctl{display:none;margin:6px 0;font-size:.78rem}.pg-ctl input{margin-left:10px;padding:2px 6px}
+"""
+
+
+class HtmlReportWriter:
+    """
+    Writes the HTML report to `fh` one check at a time, flushing after each,
+    so a report opened mid-run already shows every finished check. The
+    summary cards are only known at the end: they are written after the
+    results table and moved above it with CSS flex `order`. With a
+    `chunk_dir`, diffs longer than REPORT_MAX_ROWS are written there in
+    full and browsed with the embedded pager (see DiffChunkWriter).
+
+        writer = HtmlReportWriter(fh, schemas, chunk_dir)
+        writer.start()
+        writer.add(name, res)      # per check, as it completes
+        writer.finish()
+    """
+
+    def __init__(self, fh, schemas: list = None, chunk_dir: str = None):
+        self.fh       = fh
+        self.schemas  = schemas or []
+        self.chunks   = DiffChunkWriter(chunk_dir) if chunk_dir else None
+        self.counts   = {"total": 0, "passed": 0, "failed": 0, "errors": 0}
+        self._section = ""
+
+    def start(self):
+        self.fh.write(f"""<!DOCTYPE html>
+<html lang="en"><head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width,initial-scale=1">
+<title>Oracle Migration Validation — {RUN_TS}</title>
+<style>{_REPORT_CSS}</style>
+<script>{_REPORT_JS}</script>
+</head>
+<body>
+
+<div class="hdr">
+  <h1>🔍 Oracle Migration Validation Report</h1>
+  <div class="meta">
+    Schema: <b>{escape(', '.join(self.schemas) or SCHEMA_NAME)}</b> &nbsp;|&nbsp;
+    Source: <b>{DB_CONFIG['source']['host']}</b> &nbsp;|&nbsp;
+    Target: <b>{DB_CONFIG['target']['host']}</b> &nbsp;|&nbsp;
+    Generated: <b>{RUN_TS}</b>
+  </div>
+</div>
+
+<div class="running">⏳ Validation in progress — reload to see more checks.</div>
+
+<div class="content">
+  <table class="main-tbl">
+    <thead>
+      <tr>
+        <th style="width:50px">Level</th>
+        <th>Check Name</th>
+        <th style="width:130px">Status</th>
+        <th style="width:80px">Src Rows</th>
+        <th style="width:80px">Tgt Rows</th>
+        <th>Details</th>
+      </tr>
+    </thead>
+    <tbody>""")
+        self.fh.flush()
+
+    def add(self, name: str, res: dict):
+        """Write one check's row (and its schema heading, if it starts one)."""
+        out = []
+        if len(self.schemas) > 1 and res.get("schema") != self._section:
+            self._section = res.get("schema")
+            out.append(f"\n<tr class='schema-hdr'><td colspan='6'>"
+                       f"{'Schema ' + escape(self._section) if self._section else 'Database-wide checks'}</td></tr>")
+        out.append(self._render_row(name, res))
+        self.fh.write("".join(out))
+        self.fh.flush()
+
+        self.counts["total"]  += 1
+        self.counts["passed"] += bool(res["cmp"]["match"])
+        self.counts["failed"] += not res["cmp"]["match"] and not res.get("error")
+        self.counts["errors"] += bool(res.get("error"))
+
+    def _diff_table(self, headers: list, rows, total: int) -> str:
+        """Inline sample of a diff plus, when it is longer, the paged viewer."""
+        if self.chunks is None or total <= REPORT_MAX_ROWS:
+            return dict_list_to_html_table(headers, list(rows), total=total)
+        head = []
+
+        def keep_head(rows):
+            for row in rows:
+                if len(head) < REPORT_MAX_ROWS:
+                    head.append(row)
+                yield row
+
+        viewer = diff_viewer_html(self.chunks.write(headers, keep_head(rows)))
+        return dict_list_to_html_table(headers, head, total=total,
+                                       more="Browse the full list below.") + viewer
+
+    def _render_row(self, name: str, res: dict) -> str:
         cmp   = res["cmp"]
         level = res["level"]
         desc  = res["desc"]
@@ -759,22 +2812,33 @@ def generate_html_report(all_results: dict) -> str:
         else:
             badge = f"<span class='badge fail'>❌ MISMATCH</span>"
             row_cls = "row-fail"
+        if res.get("cached"):
+            badge += "<br><small class='desc'>cached result</small>"
 
         diff_section = ""
         if not cmp["match"] and not res.get("error"):
             if cmp["only_in_src"]:
                 diff_section += "<p class='diff-hdr'>⬅ Only in SOURCE (missing from Target):</p>"
-                diff_section += dict_list_to_html_table(cmp["headers"], cmp["only_in_src"])
+                diff_section += self._diff_table(cmp["headers"], cmp["only_in_src"],
+                                                 len(cmp["only_in_src"]))
             if cmp["only_in_tgt"]:
                 diff_section += "<p class='diff-hdr'>➡ Only in TARGET (extra / unexpected):</p>"
-                diff_section += dict_list_to_html_table(cmp["headers"], cmp["only_in_tgt"])
-
-        src_tbl = dict_list_to_html_table(cmp["headers"], cmp["src_data"])
-        tgt_tbl = dict_list_to_html_table(cmp["headers"], cmp["tgt_data"])
+                diff_section += self._diff_table(cmp["headers"], cmp["only_in_tgt"],
+                                                 len(cmp["only_in_tgt"]))
+            if cmp.get("changed"):
+                n_cells = sum(len(c["cells"]) for c in cmp["changed"])
+                diff_section += (f"<p class='diff-hdr'>≠ Changed values "
+                                 f"({len(cmp['changed'])} rows matched on {escape(', '.join(cmp['key_cols']))}):</p>")
+                diff_section += self._diff_table(
+                    cmp["key_cols"] + ["Column", "Source", "Target"],
+                    changed_cells_as_rows(cmp, None if self.chunks else REPORT_MAX_ROWS), n_cells)
+
+        src_tbl = dict_list_to_html_table(cmp["headers"], cmp["src_data"], total=cmp["src_count"])
+        tgt_tbl = dict_list_to_html_table(cmp["headers"], cmp["tgt_data"], total=cmp["tgt_count"])
 
         err_msg = f"<p class='err-msg'>{escape(res.get('err_msg', ''))}</p>" if res.get("error") else ""
 
-        body_rows += f"""
+        return f"""
 <tr class='{row_cls}'>
   <td><span class='lvl l{level}'>L{level}</span></td>
   <td>
@@ -797,122 +2861,93 @@ def generate_html_report(all_results: dict) -> str:
   </td>
 </tr>"""
 
-    # Progress bar color
-    bar_color = "#2e7d32" if pct >= 90 else ("#f57c00" if pct >= 70 else "#c62828")
+    def finish(self):
+        """Close the table and write the summary cards."""
+        total, passed, failed, errors = (self.counts[k] for k in
+                                         ("total", "passed", "failed", "errors"))
+        pct       = round((passed / total) * 100, 1) if total else 0
+        bar_color = "#2e7d32" if pct >= 90 else ("#f57c00" if pct >= 70 else "#c62828")
 
-    html = f"""<!DOCTYPE html>
-<html lang="en"><head>
-<meta charset="utf-8">
-<meta name="viewport" content="width=device-width,initial-scale=1">
-<title>Oracle Migration Validation — {RUN_TS}</title>
-<style>
-*{{box-sizing:border-box;margin:0;padding:0}}
-body{{font-family:'Segoe UI',Arial,sans-serif;background:#f0f2f5;color:#222;font-size:14px}}
-.hdr{{background:linear-gradient(135deg,#0d1b6e,#1a3a8f);color:#fff;padding:28px 40px}}
-.hdr h1{{font-size:1.6rem;margin-bottom:6px}}
-.hdr .meta{{opacity:.75;font-size:.9rem;line-height:1.8}}
-.summary{{display:flex;flex-wrap:wrap;gap:16px;padding:20px 40px;background:#fff;
-          border-bottom:1px solid #dde1e7}}
-.card{{background:#f8f9fc;border-radius:8px;padding:14px 22px;min-width:130px;
-       text-align:center;border-top:4px solid #ccc}}
-.card.c-ok{{border-color:#2e7d32}}.card.c-fail{{border-color:#c62828}}
-.card.c-err{{border-color:#e65100}}.card.c-all{{border-color:#1565c0}}
-.card .n{{font-size:2rem;font-weight:700;line-height:1.1}}
-.card .l{{font-size:.7rem;text-transform:uppercase;letter-spacing:.8px;color:#666;margin-top:4px}}
-.prog-wrap{{flex:1;min-width:200px;padding:14px 22px;background:#f8f9fc;
-            border-radius:8px;border-top:4px solid {bar_color}}}
-.prog-wrap .n{{font-size:2rem;font-weight:700;color:{bar_color}}}
-.prog{{height:8px;background:#e0e0e0;border-radius:4px;overflow:hidden;margin-top:8px}}
-.prog-bar{{height:100%;border-radius:4px;background:{bar_color};width:{pct}%}}
-.content{{padding:24px 40px}}
-.main-tbl{{width:100%;border-collapse:collapse;background:#fff;border-radius:8px;
-           overflow:hidden;box-shadow:0 1px 4px rgba(0,0,0,.1)}}
-.main-tbl th{{background:#1a3a8f;color:#fff;padding:11px 14px;text-align:left;
-              font-size:.8rem;text-transform:uppercase;letter-spacing:.5px}}
-.main-tbl td{{padding:10px 14px;border-bottom:1px solid #eef0f4;vertical-align:top}}
-.row-ok{{background:#fafffe}}.row-fail{{background:#fff9f9}}.row-err{{background:#fffaf5}}
-.badge{{display:inline-block;padding:3px 10px;border-radius:10px;font-size:.78rem;font-weight:700}}
-.badge.ok{{background:#e8f5e9;color:#2e7d32}}.badge.fail{{background:#ffebee;color:#c62828}}
-.badge.err{{background:#fff3e0;color:#e65100}}
-.lvl{{display:inline-block;padding:2px 7px;border-radius:4px;font-size:.72rem;font-weight:700}}
-.l1{{background:#e3f2fd;color:#1565c0}}.l2{{background:#f3e5f5;color:#6a1b9a}}
-.num{{text-align:right;font-family:monospace;font-size:.85rem}}
-.desc{{color:#666;font-size:.8rem}}
-details summary{{cursor:pointer;color:#1565c0;font-size:.82rem;padding:4px 0}}
-details summary:hover{{text-decoration:underline}}
-.det{{background:#f5f7fa;padding:12px;border-radius:6px;margin-top:8px;overflow:auto}}
-.det b{{display:block;margin:8px 0 4px;font-size:.82rem;color:#333}}
-.tbl-wrap{{overflow-x:auto;margin-bottom:8px}}
-table.dt{{border-collapse:collapse;font-size:.78rem;min-width:400px}}
-table.dt th{{background:#455a64;color:#fff;padding:5px 10px;white-space:nowrap}}
-table.dt td{{padding:3px 10px;border-bottom:1px solid #e8eaf0;white-space:nowrap}}
-table.dt tr:hover td{{background:#f0f4ff}}
-.ok-text{{color:#2e7d32;font-style:italic;font-size:.82rem}}
-.truncated{{color:#888;font-size:.78rem;font-style:italic;margin-top:4px}}
-.diff-hdr{{font-weight:bold;color:#c62828;margin:10px 0 4px;font-size:.82rem}}
-.err-msg{{color:#c62828;font-size:.82rem;margin-bottom:8px}}
-.footer{{text-align:center;padding:20px;color:#aaa;font-size:.78rem}}
-</style>
-</head>
-<body>
-
-<div class="hdr">
-  <h1>🔍 Oracle Migration Validation Report</h1>
-  <div class="meta">
-    Schema: <b>{SCHEMA_NAME}</b> &nbsp;|&nbsp;
-    Source: <b>{DB_CONFIG['source']['host']}</b> &nbsp;|&nbsp;
-    Target: <b>{DB_CONFIG['target']['host']}</b> &nbsp;|&nbsp;
-    Generated: <b>{RUN_TS}</b>
-  </div>
+        self.fh.write(f"""
+    </tbody>
+  </table>
 </div>
 
+<style>.running{{display:none}}</style>
 <div class="summary">
   <div class="card c-all"><div class="n">{total}</div><div class="l">Total Checks</div></div>
   <div class="card c-ok"><div class="n" style="color:#2e7d32">{passed}</div><div class="l">Passed</div></div>
   <div class="card c-fail"><div class="n" style="color:#c62828">{failed}</div><div class="l">Failed</div></div>
   <div class="card c-err"><div class="n" style="color:#e65100">{errors}</div><div class="l">Errors</div></div>
-  <div class="prog-wrap">
+  <div class="prog-wrap" style="color:{bar_color}">
     <div class="n">{pct}%</div>
     <div class="l">Pass Rate</div>
-    <div class="prog"><div class="prog-bar"></div></div>
+    <div class="prog"><div class="prog-bar" style="width:{pct}%"></div></div>
   </div>
 </div>
 
-<div class="content">
-  <table class="main-tbl">
-    <thead>
-      <tr>
-        <th style="width:50px">Level</th>
-        <th>Check Name</th>
-        <th style="width:130px">Status</th>
-        <th style="width:80px">Src Rows</th>
-        <th style="width:80px">Tgt Rows</th>
-        <th>Details</th>
-      </tr>
-    </thead>
-    <tbody>
-      {body_rows}
-    </tbody>
-  </table>
-</div>
-
 <div class="footer">
   Oracle Migration Validator &nbsp;|&nbsp; Zero-dependency pure Python &nbsp;|&nbsp; {RUN_TS}
 </div>
-</body></html>"""
+</body></html>""")
+        self.fh.flush()
+
 
-    return html
+def generate_html_report(all_results: dict) -> str:
+    """Whole report as one string (HtmlReportWriter over a StringIO)."""
+    buf     = StringIO()
+    schemas = list(dict.fromkeys(r["schema"] for r in all_results.values() if r.get("schema")))
+    writer  = HtmlReportWriter(buf, schemas)
+    writer.start()
+    for name, res in all_results.items():
+        writer.add(name, res)
+    writer.finish()
+    return buf.getvalue()
 
 
 # =============================================================================
 # CSV EXPORT  (stdlib csv module only)
 # =============================================================================
 
+_METRIC_COLUMNS = {"Calls": "calls", "Spawn_s": "spawn_s", "First_Byte_s": "first_byte_s",
+                   "Sqlplus_s": "sqlplus_s", "Bytes": "bytes", "Retries": "retries",
+                   "Retried_s": "retried_s"}
+
+
+def _metric_cells(metrics: dict) -> list:
+    cells = [metrics.get(side, {}).get(key, 0)
+             for side in ("source", "target") for key in _METRIC_COLUMNS.values()]
+    cells += [metrics.get("compare_s", 0), metrics.get("report_s", 0)]
+    return [round(v, 3) if isinstance(v, float) else v for v in cells]
+
+
+def export_metrics_json(all_results: dict, filepath: str, elapsed_s: float):
+    """
+    Per-check phase metrics for tooling: sqlplus calls, spawn / first-byte /
+    total sqlplus seconds, bytes and rows per side, compare and report time.
+    """
+    checks = {name: dict(res.get("metrics") or {}, level=res["level"], schema=res.get("schema"),
+                         error=bool(res.get("error")), cached=bool(res.get("cached")))
+              for name, res in all_results.items()}
+    with open(filepath, "w", encoding="utf-8") as f:
+        json.dump({"run_ts": RUN_TS, "elapsed_s": elapsed_s, "checks": checks}, f, indent=1)
+    print(f"  ⏱  Metrics JSON : {filepath}")
+
+    timed = sorted(((max(m.get(side, {}).get("sqlplus_s", 0) for side in ("source", "target")), name)
+                    for name, m in checks.items()), reverse=True)
+    timed = [(secs, name) for secs, name in timed[:3] if secs > 0]
+    if timed:
+        print("     Slowest     : " + ", ".join(f"{name} {secs:.1f}s" for secs, name in timed))
+
+
 def export_summary_csv(all_results: dict, filepath: str):
     with open(filepath, "w", newline="", encoding="utf-8") as f:
         w = csv.writer(f)
         w.writerow(["Check", "Level", "Description", "Status",
-                    "Src_Rows", "Tgt_Rows", "Only_In_Src", "Only_In_Tgt"])
+                    "Src_Rows", "Tgt_Rows", "Only_In_Src", "Only_In_Tgt", "Changed",
+                    "Schema"]
+                   + [f"{side}_{name}" for side in ("Src", "Tgt") for name in _METRIC_COLUMNS]
+                   + ["Compare_s", "Report_s"])
         for name, res in all_results.items():
             cmp = res["cmp"]
             status = ("ERROR"    if res.get("error")   else
@@ -920,93 +2955,635 @@ def export_summary_csv(all_results: dict, filepath: str):
             w.writerow([
                 name, res["level"], res["desc"], status,
                 cmp["src_count"], cmp["tgt_count"],
-                len(cmp["only_in_src"]), len(cmp["only_in_tgt"])
-            ])
+                len(cmp["only_in_src"]), len(cmp["only_in_tgt"]),
+                len(cmp.get("changed", [])), res.get("schema") or ""
+            ] + _metric_cells(res.get("metrics") or {}))
     print(f"  📄 Summary CSV  : {filepath}")
 
 
-def export_diff_csv(all_results: dict, filepath: str):
-    with open(filepath, "w", newline="", encoding="utf-8") as f:
-        w = csv.writer(f)
-        w.writerow(["Check", "Diff_Side", "Column", "Value"])
+class DiffCsvWriter:
+    """
+    Diff CSV written one check at a time, as each comparison finishes.
+    Rows are not streamed out of the comparator itself: compare_results()
+    returns a check's complete only_in_src / only_in_tgt / changed lists
+    (key pairing, the HTML report and --watch need them whole), so memory
+    is bounded by the largest single check's differences, not the run's.
+
+    long : Check, Diff_Side, Column, Value, Key, Target_Value -- one line per
+           cell; Key / Target_Value are only filled for CHANGED cells.
+    wide : per check, a header line (Check, Diff_Side, <columns>) followed by
+           one line per SOURCE_ONLY / TARGET_ONLY record, then a header line
+           (Check, Diff_Side, <key columns>, Column, Source_Value, Target_Value)
+           and one line per CHANGED record; further changed columns of the
+           same record follow as extra Column/Source/Target triples.
+
+    A path ending in .gz is written through gzip as it goes.
+    """
+
+    def __init__(self, filepath: str, fmt: str = DIFF_FORMAT):
+        self.filepath = filepath
+        self.fmt      = fmt
+        if filepath.endswith(".gz"):
+            self._fh = gzip.open(filepath, "wt", newline="", encoding="utf-8", compresslevel=6)
+        else:
+            self._fh = open(filepath, "w", newline="", encoding="utf-8")
+        self._w = csv.writer(self._fh)
+        if fmt == "long":
+            self._w.writerow(["Check", "Diff_Side", "Column", "Value", "Key", "Target_Value"])
+
+    def add(self, name: str, res: dict):
+        cmp = res["cmp"]
+        if cmp["match"] or res.get("error"):
+            return
+        if self.fmt == "wide":
+            self._add_wide(name, cmp)
+        else:
+            self._add_long(name, cmp)
+
+    def _add_long(self, name: str, cmp: dict):
+        w = self._w
+        for side, rows in (("SOURCE_ONLY", cmp["only_in_src"]), ("TARGET_ONLY", cmp["only_in_tgt"])):
+            w.writerows([name, side, col, val] for row in rows for col, val in row.items())
+        for change in cmp.get("changed", []):
+            key = ", ".join(f"{k}={v}" for k, v in change["key"].items())
+            w.writerows([name, "CHANGED", col, src_val, key, tgt_val]
+                        for col, src_val, tgt_val in change["cells"])
+
+    def _add_wide(self, name: str, cmp: dict):
+        w       = self._w
+        headers = cmp["headers"]
+        if cmp["only_in_src"] or cmp["only_in_tgt"]:
+            w.writerow(["Check", "Diff_Side"] + headers)
+            for side, rows in (("SOURCE_ONLY", cmp["only_in_src"]), ("TARGET_ONLY", cmp["only_in_tgt"])):
+                w.writerows([name, side] + [row.get(h, "") for h in headers] for row in rows)
+        if cmp.get("changed"):
+            keys = cmp["key_cols"]
+            w.writerow(["Check", "Diff_Side"] + keys + ["Column", "Source_Value", "Target_Value"])
+            w.writerows([name, "CHANGED"] + [change["key"].get(k, "") for k in keys]
+                        + [v for cell in change["cells"] for v in cell]
+                        for change in cmp["changed"])
+
+    def close(self):
+        self._fh.close()
+
+
+def export_diff_csv(all_results: dict, filepath: str, fmt: str = DIFF_FORMAT):
+    writer = DiffCsvWriter(filepath, fmt)
+    try:
         for name, res in all_results.items():
-            cmp = res["cmp"]
-            if not cmp["match"] and not res.get("error"):
-                for row in cmp["only_in_src"]:
-                    for col, val in row.items():
-                        w.writerow([name, "SOURCE_ONLY", col, val])
-                for row in cmp["only_in_tgt"]:
-                    for col, val in row.items():
-                        w.writerow([name, "TARGET_ONLY", col, val])
+            writer.add(name, res)
+    finally:
+        writer.close()
     print(f"  📄 Diff CSV     : {filepath}")
 
 
+# =============================================================================
+# WATCH MODE  (--watch)
+# =============================================================================
+
+class WatchState:
+    """
+    Latest outcome of every check across --watch cycles, plus the row-count
+    history of every table still (or recently) behind on the target, from
+    which load rates and ETAs are derived. Tables appear once a row-count
+    check reports them as differing; a table that stops differing is
+    caught up (target = source). ETAs follow the shrinking of the missing
+    count, so a source that keeps growing is accounted for.
+    """
+
+    def __init__(self):
+        self.checks   = {}     # check -> {"status", "src_rows", "tgt_rows", "diffs", "error", "since"}
+        self.tables   = {}     # SCHEMA.TABLE -> {"source", "target", "missing", "rows_per_min",
+                               #                  "catchup_per_min", "eta_min"}
+        self._samples = {}     # SCHEMA.TABLE -> deque[(time.time(), target rows, missing rows)]
+        self._owner   = {}     # SCHEMA.TABLE -> row-count check that reported it
+        self.reset_deltas()
+
+    def reset_deltas(self):
+        self.check_deltas = {}
+        self.table_deltas = {}
+
+    def update(self, name: str, qry: dict, src: dict, tgt: dict, now: float):
+        """Compare one check's fresh results and note what changed."""
+        cmp   = compare_results(src["result"], tgt["result"], keys=qry.get("keys"))
+        error = " | ".join(filter(None, [src["error"], tgt["error"]]))
+        entry = {
+            "status":   "ERROR" if error else "MATCH" if cmp["match"] else "MISMATCH",
+            "src_rows": cmp["src_count"],
+            "tgt_rows": cmp["tgt_count"],
+            "diffs":    len(cmp["only_in_src"]) + len(cmp["only_in_tgt"]) + len(cmp["changed"]),
+            "error":    error,
+        }
+        prev = self.checks.get(name)
+        if prev is None or any(prev[k] != v for k, v in entry.items()):
+            self.check_deltas[name] = entry
+            entry["since"] = datetime.fromtimestamp(now).isoformat(timespec="seconds")
+        else:
+            entry["since"] = prev["since"]
+        self.checks[name] = entry
+        if qry.get("engine") == "row_counts" and not error:
+            self._update_tables(name, qry.get("schema"), cmp, now)
+
+    def _update_tables(self, name: str, schema: str, cmp: dict, now: float):
+        behind = {}
+        for change in cmp["changed"]:
+            counts = {col.upper(): (s, t) for col, s, t in change["cells"]}
+            if "ROW_COUNT" in counts:
+                behind[next(iter(change["key"].values()))] = counts["ROW_COUNT"]
+        for row in cmp["only_in_src"]:           # table not on the target yet
+            row = {k.upper(): v for k, v in row.items()}
+            behind[row.get("TABLE_NAME", "")] = (row.get("ROW_COUNT", ""), "0")
+
+        seen = set()
+        for table, (src_val, tgt_val) in behind.items():
+            if not (src_val.isdigit() and tgt_val.isdigit()):
+                continue
+            label = f"{schema}.{table}" if schema else table
+            seen.add(label)
+            self._sample(name, label, int(src_val), int(tgt_val), now)
+        for label, owner in list(self._owner.items()):
+            if owner == name and label not in seen and self.tables[label]["missing"]:
+                self._sample(name, label, self.tables[label]["source"],
+                             self.tables[label]["source"], now)
+
+    def _sample(self, name: str, label: str, source: int, target: int, now: float):
+        samples = self._samples.setdefault(label, deque(maxlen=WATCH_RATE_WINDOW + 1))
+        prev    = self.tables.get(label)
+        missing = max(source - target, 0)
+        samples.append((now, target, missing))
+        self._owner[label] = name
+        (t0, n0, m0), (t1, n1, m1) = samples[0], samples[-1]
+        rate    = round((n1 - n0) / (t1 - t0) * 60, 1) if t1 > t0 else None
+        catchup = round((m0 - m1) / (t1 - t0) * 60, 1) if t1 > t0 else None
+        self.tables[label] = {
+            "source":          source,
+            "target":          target,
+            "missing":         missing,
+            "rows_per_min":    rate,
+            "catchup_per_min": catchup,
+            "eta_min":         round(missing / catchup, 1) if missing and catchup and catchup > 0 else None,
+        }
+        if prev is None or prev["target"] != target or prev["source"] != source:
+            self.table_deltas[label] = dict(self.tables[label],
+                                            delta=target - (prev["target"] if prev else 0))
+
+    def totals(self) -> dict:
+        """
+        Check counts by status, rows still missing, overall load rate and ETA.
+        The ETA is unknown while any table that is behind is not catching up;
+        otherwise it is the later of the slowest table's ETA and all missing
+        rows at the combined catch-up rate.
+        """
+        out = {status: sum(1 for c in self.checks.values() if c["status"] == status)
+               for status in ("MATCH", "MISMATCH", "ERROR")}
+        behind  = [t for t in self.tables.values() if t["missing"]]
+        missing = sum(t["missing"] for t in behind)
+        rate    = sum(t["rows_per_min"] for t in behind if t["rows_per_min"] and t["rows_per_min"] > 0)
+        eta     = None
+        if behind and all(t["eta_min"] is not None for t in behind):
+            catchup = sum(t["catchup_per_min"] for t in behind)
+            eta     = round(max(missing / catchup, max(t["eta_min"] for t in behind)), 1)
+        out.update(missing=missing, rows_per_min=round(rate, 1), eta_min=eta)
+        return out
+
+    @property
+    def converged(self) -> bool:
+        return bool(self.checks) and all(c["status"] == "MATCH" for c in self.checks.values())
+
+
+def _rerun_each_cycle(qry: dict) -> bool:
+    """Watch checks, and checks whose results move without DDL (never cached)."""
+    return bool(qry.get("watch")) or not qry.get("cache", True)
+
+
+def _fmt_eta(minutes) -> str:
+    if minutes is None:
+        return "—"
+    if minutes < 1:
+        return "< 1 min"
+    if minutes < 90:
+        return f"{minutes:.0f} min"
+    return f"{minutes / 60:.1f} h"
+
+
+def write_watch_dashboard(path: str, state: WatchState, cycle: int, interval: float,
+                          schemas: list):
+    """
+    Rewrite the live dashboard: a small self-refreshing page, written to a
+    temp file and swapped in with os.replace() so a browser never sees a
+    half-written page.
+    """
+    totals = state.totals()
+    tables = sorted(state.tables.items(), key=lambda kv: -kv[1]["missing"])
+    behind = [(label, t) for label, t in tables if t["missing"]]
+    rows   = []
+    for name, c in state.checks.items():
+        cls, badge = {"MATCH":    ("row-ok", "<span class='badge ok'>✅ MATCH</span>"),
+                      "MISMATCH": ("row-fail", "<span class='badge fail'>❌ MISMATCH</span>"),
+                      "ERROR":    ("row-err", "<span class='badge err'>⚠ ERROR</span>")}[c["status"]]
+        rows.append(f"<tr class='{cls}'><td><b>{escape(name)}</b>"
+                    f"{'<div class=err-msg>' + escape(c['error']) + '</div>' if c['error'] else ''}</td>"
+                    f"<td>{badge}</td><td class='num'>{c['src_rows']}</td>"
+                    f"<td class='num'>{c['tgt_rows']}</td><td class='num'>{c['diffs']}</td>"
+                    f"<td class='desc'>{c['since']}</td></tr>")
+    load = [f"<tr><td>{escape(label)}</td><td class='num'>{t['source']:,}</td>"
+            f"<td class='num'>{t['target']:,}</td><td class='num'>{t['missing']:,}</td>"
+            f"<td class='num'>{'' if t['rows_per_min'] is None else format(round(t['rows_per_min']), ',')}</td>"
+            f"<td class='num'>{_fmt_eta(t['eta_min'])}</td></tr>" for label, t in behind]
+    load_html = (f"""<table class="main-tbl" style="margin-bottom:24px">
+    <thead><tr><th>Table</th><th>Source Rows</th><th>Target Rows</th><th>Missing</th>
+      <th>Rows / min</th><th>ETA</th></tr></thead>
+    <tbody>{''.join(load)}</tbody>
+  </table>""" if load else "<p class='ok-text' style='margin-bottom:24px'>No table is behind on row counts.</p>")
+
+    page = f"""<!DOCTYPE html>
+<html lang="en"><head>
+<meta charset="utf-8">
+<meta http-equiv="refresh" content="{max(int(interval), 5)}">
+<meta name="viewport" content="width=device-width,initial-scale=1">
+<title>Migration Watch — cycle {cycle}</title>
+<style>{_REPORT_CSS}</style>
+</head>
+<body>
+
+<div class="hdr">
+  <h1>👀 Oracle Migration Watch</h1>
+  <div class="meta">
+    Schema: <b>{escape(', '.join(schemas))}</b> &nbsp;|&nbsp;
+    Source: <b>{DB_CONFIG['source']['host']}</b> &nbsp;|&nbsp;
+    Target: <b>{DB_CONFIG['target']['host']}</b> &nbsp;|&nbsp;
+    Cycle <b>{cycle}</b> at <b>{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</b>,
+    every {interval:g}s
+  </div>
+</div>
+
+<div class="summary">
+  <div class="card c-ok"><div class="n">{totals['MATCH']}</div><div class="l">Matching</div></div>
+  <div class="card c-fail"><div class="n">{totals['MISMATCH']}</div><div class="l">Mismatched</div></div>
+  <div class="card c-err"><div class="n">{totals['ERROR']}</div><div class="l">Errors</div></div>
+  <div class="card c-all"><div class="n">{totals['missing']:,}</div><div class="l">Rows missing</div></div>
+  <div class="card c-all"><div class="n">{round(totals['rows_per_min']):,}</div><div class="l">Rows / min</div></div>
+  <div class="card c-all"><div class="n">{_fmt_eta(totals['eta_min'])}</div><div class="l">ETA</div></div>
+</div>
+
+<div class="content">
+  {load_html}
+  <table class="main-tbl">
+    <thead><tr><th>Check Name</th><th style="width:130px">Status</th><th>Src Rows</th>
+      <th>Tgt Rows</th><th>Diffs</th><th>Since</th></tr></thead>
+    <tbody>{''.join(rows)}</tbody>
+  </table>
+</div>
+
+<div class="footer">Generated by migration_validator_stdlib.py --watch</div>
+</body></html>"""
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(page)
+    os.replace(tmp, path)
+
+
+def watch_validation(interval: float, level: int = 0, jobs: int = DEFAULT_JOBS,
+                     source_jobs: int = None, target_jobs: int = None,
+                     schemas: list = None, schema_like: str = None,
+                     output_format: str = OUTPUT_FORMAT, timeout: float = None):
+    """
+    --watch: revalidate every `interval` seconds while the target is loading,
+    over one set of long-lived sqlplus sessions. The first cycle runs the
+    whole plan; later cycles rerun the "watch" and uncacheable ("cache":
+    False, e.g. sequences, segments, statistics) checks plus every check
+    whose schema's freshness probe (CACHE_PROBE_SQL, DDL only) changed on
+    either side. Each
+    cycle appends what changed to watch_<ts>.jsonl and rewrites the
+    watch_<ts>.html dashboard. Stops on Ctrl-C or once every check matches.
+    """
+    os.makedirs(REPORT_DIR, exist_ok=True)
+    series_path = f"{REPORT_DIR}/watch_{RUN_TS}.jsonl"
+    dash_path   = f"{REPORT_DIR}/watch_{RUN_TS}.html"
+    dbs     = open_databases(jobs, source_jobs, target_jobs, session_pool=True,
+                             output_format=resolve_output_format(output_format))
+    history = CheckHistory(os.path.join(REPORT_DIR, CACHE_FILE), fixed_timeout=timeout)
+    history.load(dbs)
+    state   = WatchState()
+    try:
+        schemas = resolve_schemas(dbs["source"], schemas, schema_like)
+        plan    = build_check_plan(schemas, level)
+        print("=" * 68)
+        print(f"  Oracle Migration Validator  |  WATCH every {interval:g}s")
+        print(f"  Schema : {', '.join(schemas)}")
+        print(f"  Source : {DB_CONFIG['source']['host']}  Target : {DB_CONFIG['target']['host']}")
+        print(f"  Series : {series_path}")
+        print(f"  Live   : {dash_path}")
+        print("=" * 68)
+        print(f"\n  Watching {len(plan)} checks "
+              f"({sum(1 for q in plan.values() if _rerun_each_cycle(q))} every cycle). Ctrl-C to stop.\n")
+
+        probes, cycle = {}, 0
+        while True:
+            cycle  += 1
+            started = time.monotonic()
+            fresh   = {(side, schema): ResultCache.probe(db, schema)
+                       for side, db in dbs.items() for schema in schemas}
+            changed = {schema for (side, schema), token in fresh.items()
+                       if token is None or token != probes.get((side, schema))}
+            probes  = fresh
+            selected = {name: qry for name, qry in plan.items()
+                        if cycle == 1 or _rerun_each_cycle(qry) or qry.get("schema") in changed}
+
+            state.reset_deltas()
+            for name, qry, src, tgt in execute_checks(selected, dbs, history=history):
+                state.update(name, qry, src, tgt, time.time())
+            totals = state.totals()
+            with open(series_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({
+                    "cycle":     cycle,
+                    "ts":        datetime.now().isoformat(timespec="seconds"),
+                    "elapsed_s": round(time.monotonic() - started, 3),
+                    "ran":       list(selected),
+                    "totals":    totals,
+                    "checks":    state.check_deltas,
+                    "tables":    state.table_deltas,
+                }, ensure_ascii=False) + "\n")
+            write_watch_dashboard(dash_path, state, cycle, interval, schemas)
+
+            print(f"  cycle {cycle:<4} {datetime.now().strftime('%H:%M:%S')}  "
+                  f"ran {len(selected):<3}  ✅ {totals['MATCH']}  ❌ {totals['MISMATCH']}  "
+                  f"⚠ {totals['ERROR']}  missing {totals['missing']:,} rows"
+                  f"  @ {round(totals['rows_per_min']):,}/min  ETA {_fmt_eta(totals['eta_min'])}")
+            for name, c in state.check_deltas.items():
+                if cycle > 1:
+                    print(f"      {name:<50} → {c['status']}  "
+                          f"src={c['src_rows']} tgt={c['tgt_rows']} diffs={c['diffs']}")
+            if state.converged:
+                print("\n  ✅ Every check matches — watch finished.")
+                break
+            time.sleep(max(0.0, interval - (time.monotonic() - started)))
+    except KeyboardInterrupt:
+        print("\n  Watch stopped.")
+    finally:
+        for db in dbs.values():
+            db.close()
+        history.close()
+    print(f"  📈 Time series  : {series_path}")
+    print(f"  🌐 Dashboard    : {dash_path}")
+
+
 # =============================================================================
 # MAIN
 # =============================================================================
 
-def run_validation(level: int = 0):
+_SCHEMA_RE = re.compile(r"^[A-Za-z][A-Za-z0-9_$#]*$")
 
-    print("=" * 68)
-    print(f"  Oracle Migration Validator  |  Schema : {SCHEMA_NAME}")
-    print(f"  Source : {DB_CONFIG['source']['host']}:{DB_CONFIG['source']['port']}/{DB_CONFIG['source']['service']}")
-    print(f"  Target : {DB_CONFIG['target']['host']}:{DB_CONFIG['target']['port']}/{DB_CONFIG['target']['service']}")
-    print(f"  sqlplus: {SQLPLUS_BIN}")
-    print("=" * 68)
 
-    # Filter by level
+def resolve_schemas(db: Database, names: list = None, like: str = None) -> list:
+    """
+    Upper-cased schema list from explicit names plus any source users
+    matching the LIKE pattern; SCHEMA_NAME when neither is given.
+    """
+    schemas = [n.strip().upper() for n in (names or []) if n.strip()]
+    if like:
+        rows, err = db.run(f"SELECT username FROM dba_users WHERE username LIKE "
+                           f"{_quote_literal(like.upper())} ORDER BY username;")
+        err = err or _sqlplus_error(rows)
+        if err:
+            raise SystemExit(f"Could not resolve --schema-like {like!r}: {err}")
+        schemas += [row[0] for row in rows[1:] if row and not _SEPARATOR_LINE.match(row[0])]
+    schemas = list(dict.fromkeys(schemas)) or [SCHEMA_NAME]
+    bad = [s for s in schemas if not _SCHEMA_RE.match(s)]
+    if bad:
+        raise SystemExit(f"Invalid schema name(s): {', '.join(bad)}")
+    return schemas
+
+
+def render_query(name: str, qry: dict, schema: str) -> dict:
+    """Copy of a QUERIES entry with its {schema} templates filled in."""
+    rendered = dict(qry)
+    rendered["check"]  = name
+    rendered["schema"] = None if qry.get("scope") == "database" else schema
+    rendered["sql"]    = qry["sql"].format(schema=schema)
+    rendered["desc"]   = qry["desc"].format(schema=schema)
+    return rendered
+
+
+def build_check_plan(schemas: list, level: int = 0) -> dict:
+    """
+    Ordered {result_key: rendered query} for one run. With one schema the
+    keys are the plain check names in catalog order; with several, the
+    database-wide checks come first and every schema check is keyed
+    "<SCHEMA>.<check>", grouped by schema.
+    """
     selected = {
         k: v for k, v in QUERIES.items()
-        if level == 0 or v["level"] == level
+        if (level == 0 and v["level"] in (1, 2)) or v["level"] == level
     }
+    if len(schemas) == 1:
+        return {name: render_query(name, qry, schemas[0]) for name, qry in selected.items()}
+
+    plan = {name: render_query(name, qry, schemas[0])
+            for name, qry in selected.items() if qry.get("scope") == "database"}
+    for schema in schemas:
+        for name, qry in selected.items():
+            if qry.get("scope") != "database":
+                plan[f"{schema}.{name}"] = render_query(name, qry, schema)
+    return plan
+
+
+def run_validation(level: int = 0, jobs: int = DEFAULT_JOBS,
+                   source_jobs: int = None, target_jobs: int = None,
+                   session_pool: bool = False, use_cache: bool = True,
+                   refresh_cache: bool = False, schemas: list = None,
+                   schema_like: str = None, batch: bool = False,
+                   output_format: str = OUTPUT_FORMAT, diff_format: str = DIFF_FORMAT,
+                   gzip_diff: bool = DIFF_GZIP, snapshot: bool = SNAPSHOT,
+                   timeout: float = None):
+
+    os.makedirs(REPORT_DIR, exist_ok=True)
+    dbs   = open_databases(jobs, source_jobs, target_jobs, session_pool,
+                           resolve_output_format(output_format))
+    cache = (ResultCache(os.path.join(REPORT_DIR, CACHE_FILE), refresh=refresh_cache)
+             if use_cache else None)
+    history = CheckHistory(os.path.join(REPORT_DIR, CACHE_FILE), fixed_timeout=timeout)
+    history.load(dbs)
+    try:
+        schemas = resolve_schemas(dbs["source"], schemas, schema_like)
+        snap    = None
+        if snapshot:
+            snap = SnapshotWriter(f"{REPORT_DIR}/snapshot_{RUN_TS}", {
+                "run_ts":  RUN_TS,
+                "level":   level,
+                "schemas": schemas,
+                "output_format": dbs["source"].fmt,
+                "source":  {k: DB_CONFIG["source"][k] for k in ("host", "port", "service")},
+                "target":  {k: DB_CONFIG["target"][k] for k in ("host", "port", "service")},
+            })
+        _run_validation(build_check_plan(schemas, level), schemas, level, dbs, cache, batch,
+                        diff_format, gzip_diff, snap, history)
+    finally:
+        for db in dbs.values():
+            db.close()
+        if cache:
+            cache.close()
+        history.close()
+
+
+def _run_validation(selected: dict, schemas: list, level: int, dbs: dict,
+                    cache: "ResultCache" = None, batch: bool = False,
+                    diff_format: str = DIFF_FORMAT, gzip_diff: bool = DIFF_GZIP,
+                    snapshot: SnapshotWriter = None, history: CheckHistory = None):
+
+    print("=" * 68)
+    print(f"  Oracle Migration Validator  |  Schema : {', '.join(schemas)}")
+    print(f"  Source : {DB_CONFIG['source']['host']}:{DB_CONFIG['source']['port']}/{DB_CONFIG['source']['service']}")
+    print(f"  Target : {DB_CONFIG['target']['host']}:{DB_CONFIG['target']['port']}/{DB_CONFIG['target']['service']}")
+    version = sqlplus_version()
+    print(f"  sqlplus: {SQLPLUS_BIN}"
+          f"{'  (' + '.'.join(map(str, version)) + ')' if version else ''}"
+          f"  output {dbs['source'].fmt}")
+    print(f"  Jobs   : source {dbs['source'].max_jobs}, target {dbs['target'].max_jobs}"
+          f"{'  (session pool)' if dbs['source'].pool else ''}"
+          f"{'  (batched L1)' if batch else ''}")
+    if history is not None:
+        known = sum(1 for name in selected if history.expected("source", name) is not None)
+        print(f"  Timeout: " + (f"{history.fixed_timeout:g}s per call" if history.fixed_timeout else
+                                f"adaptive ({known}/{len(selected)} checks with history, "
+                                f"else {SQLPLUS_TIMEOUT}s)"))
+    print("=" * 68)
 
     print(f"\n  Running {len(selected)} checks (Level {'1+2' if level == 0 else level})...\n")
 
-    all_results = {}
+    report_checks(execute_checks(selected, dbs, cache, batch, snapshot, history), schemas,
+                  diff_format, gzip_diff, snapshot)
 
-    for check_name, qry in selected.items():
-        label = f"[L{qry['level']}] {check_name}"
-        sys.stdout.write(f"  {label:<55}")
-        sys.stdout.flush()
 
-        src_rows, src_err = run_sqlplus(DB_CONFIG["source"], qry["sql"])
-        tgt_rows, tgt_err = run_sqlplus(DB_CONFIG["target"], qry["sql"])
+def replay_checks(run_dir: str):
+    """
+    execute_checks() stand-in reading a snapshot directory instead of the
+    databases: yields (check_name, qry, src, tgt) in the recorded order.
+    Key columns come from the current QUERIES, so comparison rules can be
+    tuned and replayed; checks no longer in QUERIES keep the recorded ones.
+    """
+    with open(os.path.join(run_dir, "manifest.json"), encoding="utf-8") as f:
+        checks = json.load(f)["checks"]
+    for name, entry in checks.items():
+        qry = {k: entry.get(k) for k in ("level", "desc", "schema", "check")}
+        qry["keys"] = QUERIES.get(entry.get("check"), {}).get("keys", entry.get("keys"))
+        sides = []
+        for side in ("source", "target"):
+            meta = entry[side]
+            rows = read_snapshot(os.path.join(run_dir, meta["file"])) if meta.get("file") else iter(())
+            sides.append({"result": ResultSide.from_rows(rows), "error": meta.get("error"),
+                          "cached": meta.get("cached", False)})
+        yield (name, qry) + tuple(sides)
+
+
+def replay_run(run_dir: str, diff_format: str = DIFF_FORMAT, gzip_diff: bool = DIFF_GZIP):
+    """--replay: compare and report a saved snapshot without touching any database."""
+    if os.path.isfile(os.path.join(run_dir, "manifest.json")):
+        snap_dir = run_dir
+    else:       # a REPORT_DIR holding snapshot_<ts>/ directories: take the newest
+        found = sorted(d for d in os.listdir(run_dir) if d.startswith("snapshot_"))
+        if not found:
+            raise SystemExit(f"No snapshot manifest.json in {run_dir}")
+        snap_dir = os.path.join(run_dir, found[-1])
+    with open(os.path.join(snap_dir, "manifest.json"), encoding="utf-8") as f:
+        manifest = json.load(f)
 
-        has_error = bool(src_err or tgt_err)
-        err_msg   = " | ".join(filter(None, [src_err, tgt_err]))
+    os.makedirs(REPORT_DIR, exist_ok=True)
+    schemas = manifest.get("schemas") or [SCHEMA_NAME]
+    print("=" * 68)
+    print(f"  Oracle Migration Validator  |  REPLAY of run {manifest.get('run_ts')}")
+    print(f"  Snapshot: {snap_dir}")
+    print(f"  Schema : {', '.join(schemas)}")
+    print(f"  Source : {manifest['source']['host']}  Target : {manifest['target']['host']}")
+    print("=" * 68)
+    print(f"\n  Replaying {len(manifest['checks'])} checks (no database access)...\n")
 
-        cmp = compare_results(src_rows, tgt_rows)
+    report_checks(replay_checks(snap_dir), schemas, diff_format, gzip_diff)
 
-        all_results[check_name] = {
-            "level":   qry["level"],
-            "desc":    qry["desc"],
-            "cmp":     cmp,
-            "error":   has_error,
-            "err_msg": err_msg,
-        }
 
-        if has_error:
-            print(f"⚠  ERROR  — {err_msg}")
-        elif cmp["match"]:
-            print(f"✅ MATCH  ({cmp['src_count']} rows)")
-        else:
-            print(f"❌ MISMATCH  "
-                  f"src={cmp['src_count']} tgt={cmp['tgt_count']}  "
-                  f"diff_src={len(cmp['only_in_src'])} diff_tgt={len(cmp['only_in_tgt'])}")
+def report_checks(checks, schemas: list, diff_format: str = DIFF_FORMAT,
+                  gzip_diff: bool = DIFF_GZIP, snapshot: SnapshotWriter = None):
+    """
+    Compare and report a stream of (check_name, qry, src, tgt) from
+    execute_checks() or replay_checks(): console lines, the HTML report and
+    diff CSV as each check arrives, then the summary CSV and summary box.
+    """
+    all_results = {}
+    section     = ""
+    started     = time.monotonic()
 
-    # Save reports
-    os.makedirs(REPORT_DIR, exist_ok=True)
     html_path    = f"{REPORT_DIR}/migration_report_{RUN_TS}.html"
     summary_csv  = f"{REPORT_DIR}/migration_summary_{RUN_TS}.csv"
-    diff_csv     = f"{REPORT_DIR}/migration_diff_{RUN_TS}.csv"
+    metrics_json = f"{REPORT_DIR}/migration_metrics_{RUN_TS}.json"
+    diff_csv     = f"{REPORT_DIR}/migration_diff_{RUN_TS}.csv{'.gz' if gzip_diff else ''}"
+
+    # The HTML report and diff CSV are written as checks finish; the summary at the end
+    print(f"  🌐 HTML Report  : {html_path}  (updated as checks finish)\n")
+    diffs = DiffCsvWriter(diff_csv, diff_format)
+    with open(html_path, "w", encoding="utf-8") as html_fh:
+        html = HtmlReportWriter(html_fh, schemas, chunk_dir=html_path[:-len(".html")] + "_files")
+        html.start()
+        try:
+            for check_name, qry, src, tgt in checks:
+                if len(schemas) > 1 and qry["schema"] != section:
+                    section = qry["schema"]
+                    print(f"\n  ── {'Schema ' + section if section else 'Database-wide'} ──")
+                label = f"[L{qry['level']}] {check_name}"
+                sys.stdout.write(f"  {label:<55}")
+                sys.stdout.flush()
+
+                has_error = bool(src["error"] or tgt["error"])
+                err_msg   = " | ".join(filter(None, [src["error"], tgt["error"]]))
+                cached    = src["cached"] and tgt["cached"]
+
+                t0  = time.monotonic()
+                cmp = compare_results(src["result"], tgt["result"], keys=qry.get("keys"))
+                t1  = time.monotonic()
+
+                res = all_results[check_name] = {
+                    "level":   qry["level"],
+                    "desc":    qry["desc"],
+                    "schema":  qry["schema"],
+                    "check":   qry["check"],
+                    "cmp":     cmp,
+                    "error":   has_error,
+                    "err_msg": err_msg,
+                    "cached":  cached,
+                }
+                html.add(check_name, res)
+                diffs.add(check_name, res)
+                if snapshot is not None:
+                    snapshot.record(check_name, qry, src, tgt)
+                res["metrics"] = {
+                    "source":    dict(src.get("metrics") or {}, rows=cmp["src_count"]),
+                    "target":    dict(tgt.get("metrics") or {}, rows=cmp["tgt_count"]),
+                    "compare_s": t1 - t0,
+                    "report_s":  time.monotonic() - t1,
+                }
+
+                if has_error:
+                    print(f"⚠  ERROR  — {err_msg}")
+                elif cmp["match"]:
+                    print(f"✅ MATCH  ({cmp['src_count']} rows{', cached' if cached else ''})")
+                else:
+                    print(f"❌ MISMATCH  "
+                          f"src={cmp['src_count']} tgt={cmp['tgt_count']}  "
+                          f"diff_src={len(cmp['only_in_src'])} diff_tgt={len(cmp['only_in_tgt'])} "
+                          f"changed={len(cmp['changed'])}")
+        finally:
+            html.finish()
+            diffs.close()
+            if snapshot is not None:
+                snapshot.finish()
 
     print(f"\n  Saving reports...")
-    with open(html_path, "w", encoding="utf-8") as f:
-        f.write(generate_html_report(all_results))
     print(f"  🌐 HTML Report  : {html_path}")
 
     export_summary_csv(all_results, summary_csv)
-    export_diff_csv(all_results, diff_csv)
+    print(f"  📄 Diff CSV     : {diff_csv}")
+    export_metrics_json(all_results, metrics_json, time.monotonic() - started)
+    if snapshot is not None:
+        print(f"  💾 Snapshot     : {snapshot.directory}")
 
     # Final summary
     passed = sum(1 for r in all_results.values() if r["cmp"]["match"])
@@ -1033,8 +3610,104 @@ if __name__ == "__main__":
         description="Oracle Migration Validator — Zero external dependencies"
     )
     parser.add_argument(
-        "--level", type=int, choices=[0, 1, 2], default=0,
-        help="0=All checks (default), 1=Level1 only, 2=Level2 only"
+        "--level", type=int, choices=[0, 1, 2, 3], default=0,
+        help="0=Level1+2 (default), 1=Level1 only, 2=Level2 only, "
+             "3=Level3 table-content checksums (reads every table)"
+    )
+    parser.add_argument(
+        "--jobs", type=int, default=DEFAULT_JOBS, metavar="N",
+        help=f"Max concurrent sqlplus calls across both databases (default {DEFAULT_JOBS})"
+    )
+    parser.add_argument(
+        "--source-jobs", type=int, default=None, metavar="N",
+        help="Max concurrent sqlplus calls against the source (default: --jobs)"
+    )
+    parser.add_argument(
+        "--target-jobs", type=int, default=None, metavar="N",
+        help="Max concurrent sqlplus calls against the target (default: --jobs)"
+    )
+    parser.add_argument(
+        "--session-pool", action="store_true",
+        help="Keep long-lived sqlplus sessions per database instead of one process per query"
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help=f"Do not read or write the result cache ({REPORT_DIR}/{CACHE_FILE})"
+    )
+    parser.add_argument(
+        "--refresh-cache", action="store_true",
+        help="Re-run every check, then update the result cache"
+    )
+    parser.add_argument(
+        "--schema", default=None, metavar="A,B,...",
+        help=f"Comma-separated schemas to validate (default {SCHEMA_NAME})"
+    )
+    parser.add_argument(
+        "--schema-like", default=None, metavar="PATTERN",
+        help="Also validate every source user matching this SQL LIKE pattern, e.g. 'APP%%'"
+    )
+    parser.add_argument(
+        "--batch", action="store_true",
+        help="Run all plain Level 1 checks as a single sqlplus script per database"
+    )
+    parser.add_argument(
+        "--output-format", choices=["auto", "colsep", "csv"], default=OUTPUT_FORMAT,
+        help="sqlplus output: csv = SET MARKUP CSV (12.2+ client), colsep = padded "
+             "COL_SEP text, auto = csv when the client supports it (default)"
+    )
+    parser.add_argument(
+        "--diff-format", choices=["long", "wide"], default=DIFF_FORMAT,
+        help="Diff CSV layout: long = one line per differing value (default), "
+             "wide = one line per differing record"
+    )
+    parser.add_argument(
+        "--gzip-diff", action="store_true", default=DIFF_GZIP,
+        help="Write the diff CSV gzip-compressed (.csv.gz)"
+    )
+    parser.add_argument(
+        "--no-snapshot", action="store_true",
+        help="Do not write the binary snapshot of every check's raw rows"
+    )
+    parser.add_argument(
+        "--replay", default=None, metavar="RUN_DIR",
+        help="Compare and report a saved snapshot directory (or the newest one under "
+             "a report directory) without connecting to any database"
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=None, metavar="SECONDS",
+        help="Fixed timeout per sqlplus call instead of one learned from earlier runs"
+    )
+    parser.add_argument(
+        "--watch", type=float, default=None, metavar="SECONDS",
+        help="Keep sessions open and revalidate every SECONDS while the target loads: "
+             "cheap checks every cycle, others when their schema changes"
     )
     args = parser.parse_args()
-    run_validation(level=args.level)
+    if args.replay:
+        replay_run(args.replay, diff_format=args.diff_format, gzip_diff=args.gzip_diff)
+        sys.exit(0)
+    if args.jobs < 1 or any(n is not None and n < 1 for n in (args.source_jobs, args.target_jobs)):
+        parser.error("--jobs, --source-jobs and --target-jobs must be >= 1")
+    if args.timeout is not None and args.timeout <= 0:
+        parser.error("--timeout must be > 0")
+    if args.watch is not None:
+        if args.watch <= 0:
+            parser.error("--watch must be > 0")
+        watch_validation(args.watch, level=args.level, jobs=args.jobs,
+                         source_jobs=args.source_jobs, target_jobs=args.target_jobs,
+                         schemas=args.schema.split(",") if args.schema else None,
+                         schema_like=args.schema_like, output_format=args.output_format,
+                         timeout=args.timeout)
+        sys.exit(0)
+    run_validation(level=args.level, jobs=args.jobs,
+                   source_jobs=args.source_jobs, target_jobs=args.target_jobs,
+                   session_pool=args.session_pool, use_cache=not args.no_cache,
+                   refresh_cache=args.refresh_cache,
+                   schemas=args.schema.split(",") if args.schema else None,
+                   schema_like=args.schema_like,
+                   batch=args.batch,
+                   output_format=args.output_format,
+                   diff_format=args.diff_format,
+                   gzip_diff=args.gzip_diff,
+                   snapshot=not args.no_snapshot,
+                   timeout=args.timeout)
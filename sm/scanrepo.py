@@ -10,7 +10,7 @@ Outputs (to --out dir):
   - modules.csv        : module coordinates, packaging, paths
   - deps.csv           : internal dependency edges
   - graph.dot          : Graphviz DOT file (dependency graph)
-  - code_overlap.csv   : packages/classes overlapping across modules (source scan)
+  - code_overlap.csv   : packages/classes/test classes/resources overlapping across modules (source scan)
   - proposal.md        : suggested new repo model and split plan
 """
 
@@ -18,8 +18,14 @@ from __future__ import annotations
 
 import argparse
 import csv
+import hashlib
+import json
+import os
+import re
+import sqlite3
 import sys
-from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
 from typing import Dict, List, Optional, Set, Tuple
 import xml.etree.ElementTree as ET
@@ -58,6 +64,236 @@ def safe_relpath(path: Path, base: Path) -> str:
         return str(path)
 
 
+# -----------------------------
+# Filesystem walk (pruned)
+# -----------------------------
+# Directories never descended into, wherever they appear: VCS metadata, IDE
+# and tool caches, JS dependencies and Maven build output.
+ALWAYS_IGNORED = {".git", ".svn", ".hg", ".idea", ".gradle", "node_modules", "bower_components", "target"}
+
+# An ignore rule: (directory it applies under, relative to the repo root with
+# "/" separators, "" for the root; compiled pattern; negated; directories only;
+# anchored = matched against the path below that directory, not the name).
+IgnoreRule = Tuple[str, "re.Pattern[str]", bool, bool, bool]
+
+
+def glob_to_regex(glob: str) -> str:
+    """
+    Regex for one .gitignore glob: "*" and "?" stop at "/", "[...]" is a
+    character class, a leading "**/" matches in any directory, a trailing
+    "/**" everything inside and "/**/" zero or more directories.
+    """
+    out: List[str] = []
+    i, n = 0, len(glob)
+    while i < n:
+        if glob.startswith("**/", i) and (i == 0 or glob[i - 1] == "/"):
+            out.append("(?:.*/)?")
+            i += 3
+        elif glob.startswith("**", i) and i + 2 == n and (i == 0 or glob[i - 1] == "/"):
+            out.append(".*")
+            i += 2
+        elif glob[i] == "*":
+            out.append("[^/]*")
+            i += 1
+        elif glob[i] == "?":
+            out.append("[^/]")
+            i += 1
+        elif glob[i] == "[" and "]" in glob[i + 2:]:
+            j = glob.index("]", i + 2)
+            body = glob[i + 1:j]
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            out.append("[" + body.replace("\\", "\\\\") + "]")
+            i = j + 1
+        elif glob[i] == "\\" and i + 1 < n:
+            out.append(re.escape(glob[i + 1]))
+            i += 2
+        else:
+            out.append(re.escape(glob[i]))
+            i += 1
+    return "".join(out) + r"\Z"
+
+
+def compile_ignore_patterns(lines: List[str], base: str = "") -> List[IgnoreRule]:
+    """
+    Compile .gitignore-style lines: comments, "!" negation, trailing "/" for
+    directories only, and patterns with a "/" anchored to `base`. Globs
+    follow gitignore rules (see glob_to_regex).
+    """
+    rules: List[IgnoreRule] = []
+    for line in lines:
+        line = line.rstrip("\n").rstrip()
+        if not line or line.startswith("#"):
+            continue
+        negate = line.startswith("!")
+        if negate:
+            line = line[1:]
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        anchored = "/" in line
+        line = line.lstrip("/")
+        if not line:
+            continue
+        rules.append((base, re.compile(glob_to_regex(line)), negate, dir_only, anchored))
+    return rules
+
+
+def is_ignored(rules: List[IgnoreRule], rel: str, name: str, is_dir: bool) -> bool:
+    """Last matching rule wins, as in git."""
+    ignored = False
+    for base, pattern, negate, dir_only, anchored in rules:
+        if dir_only and not is_dir:
+            continue
+        target = (rel[len(base) + 1:] if base else rel) if anchored else name
+        if pattern.match(target):
+            ignored = not negate
+    return ignored
+
+
+def list_dir(path: str) -> List[Tuple[str, bool]]:
+    """Sorted (name, is_dir) entries of one directory; symlinked directories are left out."""
+    out: List[Tuple[str, bool]] = []
+    with os.scandir(path) as it:
+        for e in it:
+            try:
+                if e.is_dir(follow_symlinks=False):
+                    out.append((e.name, True))
+                elif e.is_file():
+                    out.append((e.name, False))
+            except OSError:
+                continue
+    out.sort()
+    return out
+
+
+def walk_repo(root: Path, ignore: List[str] = (), gitignore: bool = True,
+              cache: Optional["AnalysisCache"] = None):
+    """
+    os.scandir() walk of `root` that prunes ALWAYS_IGNORED directories, the
+    `ignore` globs and (unless disabled) every .gitignore it meets before
+    descending. Symlinked directories are not followed. Yields
+    (directory path, path relative to root with "/" separators, file names)
+    depth-first in sorted order. With a cache, directories whose mtime is
+    unchanged since the last run are not listed again.
+    """
+    stack = [(str(root), "", compile_ignore_patterns(list(ignore)))]
+    while stack:
+        path, rel, rules = stack.pop()
+        try:
+            entries = cache.listing(path) if cache is not None else list_dir(path)
+        except OSError:
+            continue
+        if gitignore and (".gitignore", False) in entries:
+            try:
+                with open(os.path.join(path, ".gitignore"), encoding="utf-8", errors="replace") as f:
+                    rules = rules + compile_ignore_patterns(f.readlines(), rel)
+            except OSError:
+                pass
+
+        files: List[str] = []
+        subdirs = []
+        for name, is_dir in entries:
+            child = f"{rel}/{name}" if rel else name
+            if is_dir:
+                if name not in ALWAYS_IGNORED and not (rules and is_ignored(rules, child, name, True)):
+                    subdirs.append((os.path.join(path, name), child, rules))
+            elif not (rules and is_ignored(rules, child, name, False)):
+                files.append(name)
+        yield path, rel, files
+        stack.extend(reversed(subdirs))
+
+
+class StringTable:
+    """Each distinct string stored once; index records hold its id."""
+
+    def __init__(self) -> None:
+        self.strings: List[str] = []
+        self._ids: Dict[str, int] = {}
+
+    def id(self, s: str) -> int:
+        i = self._ids.get(s)
+        if i is None:
+            i = self._ids[s] = len(self.strings)
+            self.strings.append(s)
+        return i
+
+    def __getitem__(self, i: int) -> str:
+        return self.strings[i]
+
+
+# Source roots indexed per module: directory below the module -> kind.
+SOURCE_ROOTS = {
+    "/src/main/java/": "main",
+    "/src/test/java/": "test",
+    "/src/main/resources/": "resources",
+}
+
+
+@dataclass
+class SourceIndex:
+    """
+    Every source file under the SOURCE_ROOTS of every module, as
+    {(module_dir, kind): {package id: [name ids]}} over one StringTable.
+    Java packages are dotted and names are class names (file stem);
+    resources keep their "/" directory as the package and the full file name.
+    """
+    strings: StringTable = field(default_factory=StringTable)
+    roots: Dict[Tuple[Path, str], Dict[int, List[int]]] = field(default_factory=dict)
+
+    def add(self, module_dir: Path, kind: str, package: str, names: List[str]) -> None:
+        ids = self.strings.id
+        self.roots.setdefault((module_dir, kind), {}).setdefault(ids(package), []).extend(ids(n) for n in names)
+
+    def packages(self, module_dir: Path, kind: str) -> Dict[int, List[int]]:
+        return self.roots.get((module_dir, kind), {})
+
+
+def _source_root(rel: str) -> Optional[Tuple[str, str, str]]:
+    """(module dir relative to the repo, kind, package) for a directory inside a SOURCE_ROOTS tree."""
+    slashed = f"/{rel}/"
+    best = None
+    for marker, kind in SOURCE_ROOTS.items():
+        cut = slashed.rfind(marker)
+        if cut >= 0 and (best is None or cut > best[0]):
+            best = (cut, marker, kind)
+    if best is None:
+        return None
+    cut, marker, kind = best
+    package = slashed[cut + len(marker):-1]
+    return rel[:cut], kind, package if kind == "resources" else package.replace("/", ".")
+
+
+@dataclass
+class RepoScan:
+    """Everything the analysis needs from the filesystem, from one walk_repo() pass."""
+    root: Path
+    pom_paths: List[Path] = field(default_factory=list)
+    sources: SourceIndex = field(default_factory=SourceIndex)
+
+
+def scan_repo(root: Path, ignore: List[str] = (), gitignore: bool = True,
+              cache: Optional["AnalysisCache"] = None) -> RepoScan:
+    """
+    One walk: POM paths plus the SourceIndex. Package and module are worked
+    out once per directory, never per file.
+    """
+    scan = RepoScan(root=root)
+    for path, rel, files in walk_repo(root, ignore, gitignore, cache):
+        if "pom.xml" in files:
+            scan.pom_paths.append(Path(path) / "pom.xml")
+        if not files:
+            continue
+        where = _source_root(rel)
+        if where is None:
+            continue
+        module_rel, kind, package = where
+        if kind != "resources":
+            files = [name[:-5] for name in files if name.endswith(".java")]
+        if files:
+            scan.sources.add(root / module_rel if module_rel else root, kind, package, files)
+    return scan
+
+
 # -----------------------------
 # Data models
 # -----------------------------
@@ -88,6 +324,8 @@ class PomInfo:
     parent_relative_path: Optional[str] = None
     modules: List[str] = field(default_factory=list)
     dependencies: List[Dep] = field(default_factory=list)
+    properties: Dict[str, str] = field(default_factory=dict)
+    managed_dependencies: List[Dep] = field(default_factory=list)   # <dependencyManagement>
 
     # ✅ IMPORTANT FIX:
     # Make PomInfo hashable so it can be used as a dict key / in sets (graph building).
@@ -107,9 +345,157 @@ class PomInfo:
         return f"{g}:{self.artifact_id}:{v}"
 
 
+# -----------------------------
+# Incremental analysis cache
+# -----------------------------
+CACHE_FILE = "scan_cache.sqlite"
+CACHE_VERSION = 2   # bump whenever PomInfo/Dep or the listing format change
+
+
+def pom_to_record(pom: PomInfo) -> str:
+    d = asdict(pom)
+    d["pom_path"] = str(pom.pom_path)
+    d["module_dir"] = str(pom.module_dir)
+    return json.dumps(d, separators=(",", ":"))
+
+
+def pom_from_record(record: str) -> PomInfo:
+    d = json.loads(record)
+    d["pom_path"] = Path(d["pom_path"])
+    d["module_dir"] = Path(d["module_dir"])
+    d["dependencies"] = [Dep(**x) for x in d["dependencies"]]
+    d["managed_dependencies"] = [Dep(**x) for x in d["managed_dependencies"]]
+    return PomInfo(**d)
+
+
+def _sha1_file(path: Path) -> str:
+    h = hashlib.sha1()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class AnalysisCache:
+    """
+    SQLite file in the --out directory remembering between runs:
+      - every parsed pom.xml (as raw PomInfo, before parent inheritance),
+        reused while its mtime and size match, or its SHA-1 when they do not;
+      - every directory listing of the walk, reused while the directory's
+        mtime matches (adding, removing or renaming a file changes it).
+    Entries for paths not seen during a run are dropped by save().
+    """
+
+    def __init__(self, path: Path):
+        self.conn = sqlite3.connect(str(path))
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS poms (path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER,
+                                             sha1 TEXT, record TEXT, error TEXT);
+            CREATE TABLE IF NOT EXISTS dirs (path TEXT PRIMARY KEY, mtime_ns INTEGER, entries TEXT);
+        """)
+        version = self.conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        if version is None or version[0] != str(CACHE_VERSION):
+            with self.conn:
+                self.conn.execute("DELETE FROM poms")
+                self.conn.execute("DELETE FROM dirs")
+                self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (str(CACHE_VERSION),))
+        self._poms = {r[0]: r[1:] for r in self.conn.execute("SELECT * FROM poms")}
+        self._dirs = {r[0]: r[1:] for r in self.conn.execute("SELECT * FROM dirs")}
+        self._seen: Set[str] = set()
+        self._dirty_poms: Dict[str, tuple] = {}
+        self._dirty_dirs: Dict[str, tuple] = {}
+        self.stats = {"pom_hits": 0, "poms": 0, "dir_hits": 0, "dirs": 0}
+
+    def listing(self, path: str) -> List[Tuple[str, bool]]:
+        """list_dir(path), from the cache while the directory's mtime is unchanged."""
+        mtime = os.stat(path).st_mtime_ns
+        self._seen.add(path)
+        self.stats["dirs"] += 1
+        cached = self._dirs.get(path)
+        if cached is not None and cached[0] == mtime:
+            self.stats["dir_hits"] += 1
+            return [(name, bool(is_dir)) for name, is_dir in json.loads(cached[1])]
+        entries = list_dir(path)
+        self._dirty_dirs[path] = (mtime, json.dumps(entries, separators=(",", ":")))
+        return entries
+
+    def lookup_pom(self, path: Path, st: os.stat_result) -> Optional[Tuple[Optional[PomInfo], Optional[str]]]:
+        """
+        (PomInfo or None, parse error) from an earlier run, or None if the
+        file changed. `st` is the file's stat, taken by the caller.
+        """
+        key = str(path)
+        self._seen.add(key)
+        self.stats["poms"] += 1
+        cached = self._poms.get(key)
+        if cached is None:
+            return None
+        mtime, size, sha1, record, error = cached
+        if (st.st_mtime_ns, st.st_size) != (mtime, size):
+            try:
+                if st.st_size != size or _sha1_file(path) != sha1:
+                    return None
+            except OSError:
+                return None
+            self._dirty_poms[key] = (st.st_mtime_ns, size, sha1, record, error)   # touched only
+        self.stats["pom_hits"] += 1
+        return (pom_from_record(record) if record else None), error
+
+    @staticmethod
+    def fingerprint(path: Path, st: os.stat_result) -> Optional[Tuple[int, int, str]]:
+        """(mtime, size, SHA-1) to store a parse under; taken BEFORE parsing, so
+        an edit made while the parse runs is caught on the next run."""
+        try:
+            return st.st_mtime_ns, st.st_size, _sha1_file(path)
+        except OSError:
+            return None
+
+    def store_pom(self, path: Path, stamp: Tuple[int, int, str],
+                  info: Optional[PomInfo], error: Optional[str]) -> None:
+        self._seen.add(str(path))
+        self._dirty_poms[str(path)] = stamp + (pom_to_record(info) if info is not None else None, error)
+
+    def save(self) -> None:
+        with self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO poms VALUES (?, ?, ?, ?, ?, ?)",
+                                  [(k,) + v for k, v in self._dirty_poms.items()])
+            self.conn.executemany("INSERT OR REPLACE INTO dirs VALUES (?, ?, ?)",
+                                  [(k,) + v for k, v in self._dirty_dirs.items()])
+            for table, known in (("poms", self._poms), ("dirs", self._dirs)):
+                gone = [(k,) for k in known if k not in self._seen]
+                self.conn.executemany(f"DELETE FROM {table} WHERE path = ?", gone)
+        self.conn.close()
+
+
 # -----------------------------
 # POM parsing
 # -----------------------------
+def parse_deps(deps_elem: Optional[ET.Element]) -> List[Dep]:
+    """<dependency> children of a <dependencies> element, values as written (uninterpolated)."""
+    deps: List[Dep] = []
+    if deps_elem is None:
+        return deps
+    for d in find_children(deps_elem, "dependency"):
+        dg = text_of(find_child(d, "groupId")) or ""
+        da = text_of(find_child(d, "artifactId")) or ""
+        dv = text_of(find_child(d, "version"))
+        ds = text_of(find_child(d, "scope"))
+        dt = text_of(find_child(d, "type"))
+        dop = text_of(find_child(d, "optional"))
+        deps.append(
+            Dep(
+                group_id=dg,
+                artifact_id=da,
+                version=dv,
+                scope=ds,
+                dep_type=dt,
+                optional=(dop.lower() == "true") if dop else None,
+            )
+        )
+    return deps
+
+
 def parse_pom(pom_path: Path) -> PomInfo:
     tree = ET.parse(pom_path)
     root = tree.getroot()
@@ -135,26 +521,17 @@ def parse_pom(pom_path: Path) -> PomInfo:
             if mt:
                 modules.append(mt)
 
-    deps: List[Dep] = []
-    deps_elem = find_child(root, "dependencies")
-    if deps_elem is not None:
-        for d in find_children(deps_elem, "dependency"):
-            dg = text_of(find_child(d, "groupId")) or ""
-            da = text_of(find_child(d, "artifactId")) or ""
-            dv = text_of(find_child(d, "version"))
-            ds = text_of(find_child(d, "scope"))
-            dt = text_of(find_child(d, "type"))
-            dop = text_of(find_child(d, "optional"))
-            deps.append(
-                Dep(
-                    group_id=dg,
-                    artifact_id=da,
-                    version=dv,
-                    scope=ds,
-                    dep_type=dt,
-                    optional=(dop.lower() == "true") if dop else None,
-                )
-            )
+    deps = parse_deps(find_child(root, "dependencies"))
+
+    dm = find_child(root, "dependencyManagement")
+    managed = parse_deps(find_child(dm, "dependencies")) if dm is not None else []
+
+    props: Dict[str, str] = {}
+    props_elem = find_child(root, "properties")
+    if props_elem is not None:
+        for pe in list(props_elem):
+            if isinstance(pe.tag, str):
+                props[strip_ns(pe.tag)] = text_of(pe) or ""
 
     return PomInfo(
         pom_path=pom_path.resolve(),
@@ -169,9 +546,67 @@ def parse_pom(pom_path: Path) -> PomInfo:
         parent_relative_path=prel,
         modules=modules,
         dependencies=deps,
+        properties=props,
+        managed_dependencies=managed,
     )
 
 
+def _parse_pom_task(pom_path: Path) -> Tuple[Path, Optional[PomInfo], Optional[str]]:
+    """Worker-side wrapper: never raises, so one bad POM cannot abort the pool."""
+    try:
+        return pom_path, parse_pom(pom_path), None
+    except Exception as e:
+        return pom_path, None, str(e)
+
+
+def parse_poms(pom_paths: List[Path], workers: int = 1,
+               cache: Optional[AnalysisCache] = None) -> Tuple[List[PomInfo], List[str]]:
+    """
+    Parse every POM, across a process pool when workers > 1. With a cache,
+    only POMs that changed since the last run are parsed.
+    Returns (parsed POMs, warnings), both in pom_paths order whatever the
+    order the workers finish in.
+    """
+    results: Dict[Path, Tuple[Path, Optional[PomInfo], Optional[str]]] = {}
+    stamps: Dict[Path, Tuple[int, int, str]] = {}
+    todo: List[Path] = []
+    for path in pom_paths:
+        if cache is not None:
+            try:
+                st = path.stat()
+            except OSError:
+                todo.append(path)   # vanished since the walk: let the parse report it
+                continue
+            hit = cache.lookup_pom(path, st)
+            if hit is not None:
+                results[path] = (path,) + hit
+                continue
+            stamp = cache.fingerprint(path, st)
+            if stamp is not None:
+                stamps[path] = stamp
+        todo.append(path)
+
+    if workers > 1 and len(todo) > 1:
+        chunksize = max(1, len(todo) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parsed = list(pool.map(_parse_pom_task, todo, chunksize=chunksize))
+    else:
+        parsed = [_parse_pom_task(p) for p in todo]
+    for path, info, err in parsed:
+        results[path] = (path, info, err)
+        if cache is not None and path in stamps:
+            cache.store_pom(path, stamps[path], info, err)
+
+    poms: List[PomInfo] = []
+    warnings: List[str] = []
+    for path, info, err in (results[p] for p in pom_paths):
+        if info is not None:
+            poms.append(info)
+        else:
+            warnings.append(f"[WARN] Failed to parse {path}: {err}")
+    return poms, warnings
+
+
 def resolve_parent_pom_path(pom: PomInfo) -> Optional[Path]:
     if not pom.parent_artifact_id:
         return None
@@ -180,57 +615,139 @@ def resolve_parent_pom_path(pom: PomInfo) -> Optional[Path]:
     return candidate if candidate.exists() and candidate.is_file() else None
 
 
-def finalize_coords(poms_by_path: Dict[Path, PomInfo]) -> None:
-    """
-    Fill missing groupId/version from parent where possible (best-effort).
-    """
-    changed = True
-    while changed:
-        changed = False
-        for pom in list(poms_by_path.values()):
-            parent_path = resolve_parent_pom_path(pom)
-            if parent_path and parent_path in poms_by_path:
-                parent = poms_by_path[parent_path]
-                if pom.group_id is None and parent.group_id:
-                    pom.group_id = parent.group_id
-                    changed = True
-                if pom.version is None and parent.version:
-                    pom.version = parent.version
-                    changed = True
-            else:
-                if pom.group_id is None and pom.parent_group_id:
-                    pom.group_id = pom.parent_group_id
-                    changed = True
-                if pom.version is None and pom.parent_version:
-                    pom.version = pom.parent_version
-                    changed = True
-
-
 # -----------------------------
-# Source overlap analysis (optional)
+# Effective POM resolution
 # -----------------------------
-def list_java_files(module_dir: Path) -> List[Path]:
-    src = module_dir / "src" / "main" / "java"
-    if not src.exists():
-        return []
-    return [p for p in src.rglob("*.java") if p.is_file()]
+PROPERTY_REF = re.compile(r"\$\{([^}]+)\}")
 
 
-def infer_package_from_path(java_file: Path, module_dir: Path) -> Optional[str]:
-    base = module_dir / "src" / "main" / "java"
-    try:
-        rel = java_file.relative_to(base)
-    except Exception:
-        return None
-    if rel.parts[:-1]:
-        return ".".join(rel.parts[:-1])
-    return None
+def interpolate(value: Optional[str], props: Dict[str, str]) -> Optional[str]:
+    """
+    Expand ${name} references from props, recursively since properties may
+    refer to each other. Unknown names and reference cycles are left as written.
+    """
+    if not value or "${" not in value:
+        return value
+
+    def expand(text: str, active: Tuple[str, ...]) -> str:
+        def sub(m: re.Match) -> str:
+            name = m.group(1)
+            if name not in props or name in active:
+                return m.group(0)
+            return expand(props[name], active + (name,))
+        return PROPERTY_REF.sub(sub, text)
+
+    return expand(value, ())
+
+
+def interpolate_dep(d: Dep, props: Dict[str, str]) -> Dep:
+    return Dep(
+        group_id=interpolate(d.group_id, props) or "",
+        artifact_id=interpolate(d.artifact_id, props) or "",
+        version=interpolate(d.version, props),
+        scope=interpolate(d.scope, props),
+        dep_type=interpolate(d.dep_type, props),
+        optional=d.optional,
+    )
 
 
-def infer_class_fqcn(java_file: Path, module_dir: Path) -> Optional[str]:
-    pkg = infer_package_from_path(java_file, module_dir)
-    cls = java_file.stem
-    return f"{pkg}.{cls}" if pkg else cls
+@dataclass
+class EffectiveModel:
+    """What a resolved POM passes on to its children and importers."""
+    properties: Dict[str, str]
+    managed_raw: List[Dep]                 # inherited + own <dependencyManagement>, uninterpolated
+    managed: Dict[Tuple[str, str], Dep]    # interpolated in this POM's context, BOM imports applied
+
+
+def resolve_effective_poms(poms_by_path: Dict[Path, PomInfo]) -> None:
+    """
+    Rewrite every parsed POM in place into its effective model (best-effort):
+      - groupId/version inherited from the parent, or from the <parent>
+        coordinates when the parent POM is not in the repo;
+      - ${...} interpolated from project.* coordinates and <properties>,
+        the parent chain's included (so ${revision} and friends resolve);
+      - dependency versions/scopes completed from <dependencyManagement>,
+        inherited and imported (scope import, type pom) from BOMs in the repo.
+    Each POM is resolved once, after its parent and imported BOMs (memoized
+    depth-first, i.e. topological order), so the pass is linear in the number
+    of POMs. As in Maven, inherited managed entries are interpolated with the
+    inheriting POM's properties, while a BOM contributes its own effective
+    entries. Parent/import cycles are cut where they close.
+    """
+    by_ga: Dict[Tuple[str, str], PomInfo] = {}
+    for pom in poms_by_path.values():
+        by_ga.setdefault((pom.group_id or pom.parent_group_id or "", pom.artifact_id), pom)
+
+    models: Dict[Path, Optional[EffectiveModel]] = {}   # None while being resolved
+
+    def parent_of(pom: PomInfo) -> Optional[PomInfo]:
+        parent_path = resolve_parent_pom_path(pom)
+        if parent_path and parent_path in poms_by_path:
+            parent = poms_by_path[parent_path]
+        elif pom.parent_artifact_id:
+            parent = by_ga.get((pom.parent_group_id or "", pom.parent_artifact_id))
+        else:
+            parent = None
+        return parent if parent is not pom else None
+
+    def resolve(pom: PomInfo) -> Optional[EffectiveModel]:
+        if pom.pom_path in models:
+            return models[pom.pom_path]
+        models[pom.pom_path] = None
+
+        parent = parent_of(pom)
+        base = resolve(parent) if parent is not None else None
+
+        props = dict(base.properties) if base else {}
+        props.update(pom.properties)
+        gid = pom.group_id or (parent.group_id if parent else None) or pom.parent_group_id
+        ver = pom.version or (parent.version if parent else None) or pom.parent_version
+        for key, value in (("groupId", gid), ("artifactId", pom.artifact_id),
+                           ("version", ver), ("packaging", pom.packaging)):
+            if value is not None:
+                props[f"project.{key}"] = props[f"pom.{key}"] = value
+        for key, value in (("groupId", pom.parent_group_id), ("artifactId", pom.parent_artifact_id),
+                           ("version", pom.parent_version)):
+            if value is not None:
+                props[f"project.parent.{key}"] = value
+
+        pom.group_id = interpolate(gid, props)
+        pom.version = interpolate(ver, props)
+        pom.parent_group_id = interpolate(pom.parent_group_id, props)
+        pom.parent_version = interpolate(pom.parent_version, props)
+
+        managed_raw = (base.managed_raw if base else []) + pom.managed_dependencies
+        managed: Dict[Tuple[str, str], Dep] = {}
+        imports: List[Dep] = []
+        for d in managed_raw:
+            d = interpolate_dep(d, props)
+            if d.scope == "import" and d.dep_type == "pom":
+                imports.append(d)
+            else:
+                managed[d.ga()] = d
+        for d in imports:
+            bom = by_ga.get(d.ga())
+            imported = resolve(bom) if bom is not None else None
+            if imported:
+                for ga, md in imported.managed.items():
+                    managed.setdefault(ga, md)
+
+        deps: List[Dep] = []
+        for d in pom.dependencies:
+            d = interpolate_dep(d, props)
+            md = managed.get(d.ga())
+            if md is not None:
+                d.version = d.version or md.version
+                d.scope = d.scope or md.scope
+            deps.append(d)
+        pom.dependencies = deps
+
+        model = EffectiveModel(props, managed_raw, managed)
+        models[pom.pom_path] = model
+        return model
+
+    for pom in poms_by_path.values():
+        resolve(pom)
 
 
 # -----------------------------
@@ -466,33 +983,46 @@ def write_graph_dot(path: Path, poms: List[PomInfo], edges: List[Tuple[PomInfo,
     path.write_text("\n".join(lines), encoding="utf-8")
 
 
-def compute_code_overlap(poms: List[PomInfo]) -> List[Tuple[str, str, int, str]]:
-    pkg_map: Dict[str, Dict[str, int]] = {}  # package -> {artifactId: file_count}
-    cls_map: Dict[str, Set[str]] = {}        # fqcn -> {artifactId}
+def compute_code_overlap(poms: List[PomInfo], scan: Optional[RepoScan] = None) -> List[Tuple[str, str, int, str]]:
+    """
+    Packages and classes (src/main/java), test classes (src/test/java) and
+    resources (src/main/resources) present in 2+ modules. Without a scan,
+    the modules' common parent directory is walked once.
+    """
+    if scan is None:
+        scan = scan_repo(Path(os.path.commonpath([str(p.module_dir) for p in poms])))
+    strings = scan.sources.strings
+
+    pkg_map: Dict[int, Dict[str, int]] = {}            # package id -> {artifactId: file_count}
+    name_maps: Dict[str, Dict[Tuple[int, int], Set[str]]] = {
+        "class": {}, "test-class": {}, "resource": {},  # (package id, name id) -> {artifactId}
+    }
+    kinds = {"main": "class", "test": "test-class", "resources": "resource"}
+    empty = strings.id("")
 
     for p in poms:
-        files = list_java_files(p.module_dir)
-        if not files:
-            continue
-        for jf in files:
-            pkg = infer_package_from_path(jf, p.module_dir)
-            if pkg:
-                pkg_map.setdefault(pkg, {}).setdefault(p.artifact_id, 0)
-                pkg_map[pkg][p.artifact_id] += 1
-            fqcn = infer_class_fqcn(jf, p.module_dir)
-            if fqcn:
-                cls_map.setdefault(fqcn, set()).add(p.artifact_id)
+        for kind, label in kinds.items():
+            names_map = name_maps[label]
+            for pkg, names in scan.sources.packages(p.module_dir, kind).items():
+                if kind == "main" and pkg != empty:
+                    per_mod = pkg_map.setdefault(pkg, {})
+                    per_mod[p.artifact_id] = per_mod.get(p.artifact_id, 0) + len(names)
+                for name in names:
+                    names_map.setdefault((pkg, name), set()).add(p.artifact_id)
 
     rows: List[Tuple[str, str, int, str]] = []
 
     for pkg, per_mod in pkg_map.items():
         if len(per_mod) >= 2:
             mods = ", ".join([f"{m}({c})" for m, c in sorted(per_mod.items())])
-            rows.append(("package", pkg, len(per_mod), mods))
+            rows.append(("package", strings[pkg], len(per_mod), mods))
 
-    for cls, mods in cls_map.items():
-        if len(mods) >= 2:
-            rows.append(("class", cls, len(mods), ", ".join(sorted(mods))))
+    for label, names_map in name_maps.items():
+        sep = "/" if label == "resource" else "."
+        for (pkg, name), mods in names_map.items():
+            if len(mods) >= 2:
+                full = f"{strings[pkg]}{sep}{strings[name]}" if pkg != empty else strings[name]
+                rows.append((label, full, len(mods), ", ".join(sorted(mods))))
 
     rows.sort(key=lambda r: (-r[2], r[0], r[1]))
     return rows
@@ -509,25 +1039,33 @@ def write_code_overlap_csv(path: Path, rows: List[Tuple[str, str, int, str]]) ->
 # -----------------------------
 # Main analysis
 # -----------------------------
-def analyze(repo: Path, out_dir: Path, scan_sources: bool = True) -> None:
-    pom_paths = [p for p in repo.rglob("pom.xml") if p.is_file()]
-    pom_paths = [p for p in pom_paths if "target" not in p.parts]
-
-    if not pom_paths:
-        raise SystemExit(f"No pom.xml found under {repo}")
-
-    poms_by_path: Dict[Path, PomInfo] = {}
-    for p in pom_paths:
-        try:
-            info = parse_pom(p)
-            poms_by_path[info.pom_path] = info
-        except Exception as e:
-            print(f"[WARN] Failed to parse {p}: {e}", file=sys.stderr)
+def analyze(repo: Path, out_dir: Path, scan_sources: bool = True, workers: int = 1,
+            ignore: List[str] = (), gitignore: bool = True, use_cache: bool = True) -> None:
+    out_dir.mkdir(parents=True, exist_ok=True)
+    cache = AnalysisCache(out_dir / CACHE_FILE) if use_cache else None
+    try:
+        scan = scan_repo(repo, ignore, gitignore, cache)
+        pom_paths = sorted(scan.pom_paths)
+
+        if not pom_paths:
+            raise SystemExit(f"No pom.xml found under {repo}")
+
+        parsed, warnings = parse_poms(pom_paths, workers, cache)
+    finally:
+        if cache is not None:
+            cache.save()
+    if cache is not None:
+        st = cache.stats
+        print(f"Cache: reused {st['pom_hits']}/{st['poms']} parsed pom.xml, "
+              f"{st['dir_hits']}/{st['dirs']} directory listings ({out_dir / CACHE_FILE})")
+    for w in warnings:
+        print(w, file=sys.stderr)
+    poms_by_path: Dict[Path, PomInfo] = {info.pom_path: info for info in parsed}
 
     if not poms_by_path:
         raise SystemExit("No valid pom.xml files could be parsed.")
 
-    finalize_coords(poms_by_path)
+    resolve_effective_poms(poms_by_path)
     poms = list(poms_by_path.values())
 
     idx = build_internal_index(poms)
@@ -541,14 +1079,12 @@ def analyze(repo: Path, out_dir: Path, scan_sources: bool = True) -> None:
                     continue
                 edges.append((p, target))
 
-    out_dir.mkdir(parents=True, exist_ok=True)
-
     write_modules_csv(out_dir / "modules.csv", poms, repo)
     write_deps_csv(out_dir / "deps.csv", edges, repo)
     write_graph_dot(out_dir / "graph.dot", poms, edges)
 
     if scan_sources:
-        overlap_rows = compute_code_overlap(poms)
+        overlap_rows = compute_code_overlap(poms, scan)
         write_code_overlap_csv(out_dir / "code_overlap.csv", overlap_rows)
 
     proposal = propose_split(poms, edges)
@@ -559,13 +1095,23 @@ def main() -> None:
     ap = argparse.ArgumentParser()
     ap.add_argument("--repo", default=".", help="Path to monorepo root")
     ap.add_argument("--out", default="./monorepo-analysis", help="Output directory for reports")
-    ap.add_argument("--no-source-scan", action="store_true", help="Disable src/main/java overlap scan")
+    ap.add_argument("--no-source-scan", action="store_true", help="Disable src/main/java, src/test/java and src/main/resources overlap scan")
+    ap.add_argument("--workers", type=int, default=1, metavar="N",
+                    help=f"Parse pom.xml files in N processes (this machine has {os.cpu_count()} CPUs)")
+    ap.add_argument("--ignore", action="append", default=[], metavar="GLOB",
+                    help="Skip files/directories matching this .gitignore-style glob (repeatable)")
+    ap.add_argument("--no-gitignore", action="store_true", help="Do not apply .gitignore files while walking")
+    ap.add_argument("--no-cache", action="store_true",
+                    help=f"Do not read or update the incremental cache (--out/{CACHE_FILE})")
     args = ap.parse_args()
+    if args.workers < 1:
+        ap.error("--workers must be >= 1")
 
     repo = Path(args.repo).resolve()
     out_dir = Path(args.out).resolve()
 
-    analyze(repo, out_dir, scan_sources=(not args.no_source_scan))
+    analyze(repo, out_dir, scan_sources=(not args.no_source_scan), workers=args.workers,
+            ignore=args.ignore, gitignore=(not args.no_gitignore), use_cache=(not args.no_cache))
 
     print(f"Done. Reports written to: {out_dir}")
     print(f"- proposal: {out_dir / 'proposal.md'}")
@@ -579,37 +1125,3 @@ def main() -> None:
 if __name__ == "__main__":
     main()
 
-
-=========
-
-python3 - <<'PY'
-import csv
-from collections import defaultdict
-
-deps = defaultdict(list)
-mods = set()
-
-with open("monorepo-analysis/deps.csv", newline="", encoding="utf-8") as f:
-    r = csv.DictReader(f)
-    for row in r:
-        deps[row["from"]].append(row["to"])
-        mods.add(row["from"]); mods.add(row["to"])
-
-def show(root, indent=0, seen=None):
-    if seen is None: seen=set()
-    print("  "*indent + root)
-    if root in seen: 
-        print("  "*(indent+1) + "(cycle)")
-        return
-    seen.add(root)
-    for child in sorted(deps.get(root, [])):
-        show(child, indent+1, seen.copy())
-
-# likely roots = those never appearing as "to"
-all_to = {t for fr in deps for t in deps[fr]}
-roots = sorted(mods - all_to)
-
-for rt in roots[:20]:
-    show(rt)
-    print()
-PY